@@ -1,9 +1,11 @@
 """Excel file processing utilities."""
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import pandas as pd
 from openpyxl import Workbook
 
+from datapurity_core.io_utils import sniff_csv_format, detect_encoding, SNIFF_SAMPLE_BYTES
+
 
 def read_excel(file_path: str) -> pd.DataFrame:
     """
@@ -18,17 +20,15 @@ def read_excel(file_path: str) -> pd.DataFrame:
     raise NotImplementedError("Excel reading not yet implemented")
 
 
-def read_csv(file_path: str, encoding: str = "utf-8") -> pd.DataFrame:
+def read_csv(file_path: str, encoding: Optional[str] = None) -> pd.DataFrame:
     """
     Read CSV file into pandas DataFrame.
 
-    TODO: Implement the following:
-    - Detect delimiter (comma, semicolon, tab)
-    - Detect encoding if not specified
-    - Read CSV into DataFrame
-    - Return DataFrame
+    Encoding (unless specified) and delimiter are sniffed from the first
+    few KB, then the file is parsed once.
     """
-    raise NotImplementedError("CSV reading not yet implemented")
+    detected_encoding, delimiter = sniff_csv_format(file_path)
+    return pd.read_csv(file_path, encoding=encoding or detected_encoding, sep=delimiter)
 
 
 def write_excel(data: List[Dict[str, Any]], file_path: str, sheet_name: str = "Sheet1") -> None:
@@ -61,9 +61,9 @@ def detect_file_encoding(file_path: str) -> str:
     """
     Detect the encoding of a file.
 
-    TODO: Implement the following:
-    - Read file in binary mode
-    - Use chardet to detect encoding
-    - Return encoding string
+    Looks for a BOM, then checks the leading bytes for valid UTF-8,
+    falling back to Windows-1256 (Arabic).
     """
-    raise NotImplementedError("Encoding detection not yet implemented")
+    with open(file_path, "rb") as f:
+        sample = f.read(SNIFF_SAMPLE_BYTES)
+    return detect_encoding(sample)
@@ -27,10 +27,41 @@ Example:
 __version__ = "1.0.0"
 __author__ = "DataPurity Team"
 
-from datapurity_core.config import get_settings
-from datapurity_core.models import ContactRaw, ContactCleaned, CleaningStats
-from datapurity_core.cleaning import clean_contacts_df
-from datapurity_core.io_utils import load_contacts_file, save_contacts_file
+from typing import TYPE_CHECKING
+
+# Public name → defining module. Submodules pull in pandas, pydantic and
+# friends, so they are imported on first attribute access (PEP 562) rather
+# than at package import; `import datapurity_core` stays cheap.
+_LAZY_EXPORTS = {
+    "get_settings": "datapurity_core.config",
+    "ContactRaw": "datapurity_core.models",
+    "ContactCleaned": "datapurity_core.models",
+    "CleaningStats": "datapurity_core.models",
+    "clean_contacts_df": "datapurity_core.cleaning",
+    "load_contacts_file": "datapurity_core.io_utils",
+    "save_contacts_file": "datapurity_core.io_utils",
+}
+
+if TYPE_CHECKING:
+    from datapurity_core.config import get_settings
+    from datapurity_core.models import ContactRaw, ContactCleaned, CleaningStats
+    from datapurity_core.cleaning import clean_contacts_df
+    from datapurity_core.io_utils import load_contacts_file, save_contacts_file
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    import importlib
+    value = getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + list(_LAZY_EXPORTS))
+
 
 __all__ = [
     "get_settings",
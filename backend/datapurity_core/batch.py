@@ -0,0 +1,369 @@
+"""
+Batch Processing for DataPurity Core
+====================================
+
+Functions for cleaning many files concurrently in a pool of warm worker
+processes and summarizing the results.
+"""
+
+import csv
+import glob
+import logging
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from datapurity_core.config import Settings
+from datapurity_core.models import CleaningStats, FileResult
+from datapurity_core import cleaning, io_utils
+
+logger = logging.getLogger(__name__)
+
+
+# Data formats picked up from an input directory (compressed variants included)
+BATCH_INPUT_SUFFIXES = (
+    io_utils.EXCEL_SUFFIXES + [".csv"] + io_utils.PARQUET_SUFFIXES + io_utils.ARROW_SUFFIXES
+)
+
+
+def warm_worker() -> None:
+    """
+    Load expensive per-process state once, when a worker process starts.
+    
+    Loads phonenumbers region metadata (by parsing a sample number), the
+    rapidfuzz extension and the pipeline's regexes, so the first file a
+    worker handles does not pay for them.
+    """
+    cleaning.normalize_phone("0501234567", "SA")
+    cleaning.normalize_email("warmup@datapurity.io", [])
+    
+    from rapidfuzz import fuzz
+    fuzz.ratio("warm", "worm")
+
+
+def clean_file(
+    input_path: str,
+    output_path: str,
+    settings: Settings,
+    cache_dir: str | None = None,
+    cache_max_mb: int | None = None,
+    max_rows: int | None = None,
+    on_row_limit: str = "error",
+    csv_engine: str = "pandas"
+) -> CleaningStats:
+    """
+    Load, clean and save a single file.
+    
+    The output is written to a temporary file next to it and renamed into
+    place, so a worker killed mid-write never leaves a partial output.
+    
+    Args:
+        input_path: Path to input file
+        output_path: Path to output file
+        settings: Configuration settings
+        cache_dir: Result cache directory; a file cleaned before with the
+            same settings is restored from it instead of re-cleaned
+        cache_max_mb: Result cache size bound (default: cache.DEFAULT_CACHE_MAX_MB)
+        max_rows: Row limit per file (see io_utils.load_contacts_file)
+        on_row_limit: "error" or "truncate"
+        csv_engine: CSV reader, "pandas" or "pyarrow" (see io_utils.load_contacts_file)
+        
+    Returns:
+        CleaningStats for the file
+    """
+    cache = key = None
+    if cache_dir is not None:
+        from datapurity_core.cache import DEFAULT_CACHE_MAX_MB, ResultCache
+        
+        cache = ResultCache(cache_dir, cache_max_mb or DEFAULT_CACHE_MAX_MB)
+        # Reader options change what is loaded, so they are part of the key
+        key = cache.key_for(
+            input_path, settings, csv_engine=csv_engine,
+            max_rows=max_rows, on_row_limit=on_row_limit if max_rows else None
+        )
+        stats = cache.restore(key, [output_path])
+        if stats is not None:
+            return stats
+    
+    df = io_utils.load_contacts_file(input_path, csv_engine=csv_engine, max_rows=max_rows, on_row_limit=on_row_limit)
+    df_cleaned, stats = cleaning.clean_contacts_df(df, settings)
+    
+    output = Path(output_path)
+    partial = output.with_name(f".partial-{os.getpid()}-{output.name}")
+    try:
+        io_utils.save_contacts_file(df_cleaned, str(partial))
+        os.replace(partial, output)
+    finally:
+        partial.unlink(missing_ok=True)
+    
+    if cache is not None:
+        cache.store(key, [output_path], stats, input_path=input_path)
+    
+    return stats
+
+
+def _clean_file_task(
+    input_path: str,
+    output_path: str,
+    settings: Settings,
+    cache_dir: str | None = None,
+    cache_max_mb: int | None = None,
+    max_rows: int | None = None,
+    on_row_limit: str = "error"
+) -> FileResult:
+    """Clean one file in a worker, capturing timing and errors."""
+    started = time.perf_counter()
+    result = FileResult(input_path=input_path, output_path=output_path)
+    
+    try:
+        result.stats = clean_file(
+            input_path, output_path, settings,
+            cache_dir, cache_max_mb, max_rows, on_row_limit
+        )
+    except Exception as e:
+        logger.error(f"Failed to clean {input_path}: {e}")
+        result.status = "error"
+        result.error = f"{type(e).__name__}: {e}"
+    
+    result.seconds = round(time.perf_counter() - started, 3)
+    
+    return result
+
+
+def is_supported_input(path: Path) -> bool:
+    """Return True if the file is a (possibly compressed) supported input format."""
+    if path.name.startswith((".", "~$")):
+        return False
+    suffix, compression = io_utils.split_compression_suffix(str(path))
+    return compression == "zip" or suffix in BATCH_INPUT_SUFFIXES
+
+
+def discover_inputs(source: str) -> list[Path]:
+    """
+    Resolve a directory or glob pattern to a sorted list of input files.
+    
+    Args:
+        source: Directory (non-recursive) or glob pattern (`**` allowed)
+        
+    Returns:
+        Sorted list of supported input files
+        
+    Example:
+        >>> discover_inputs("incoming/*.csv.gz")
+        [PosixPath('incoming/a.csv.gz'), PosixPath('incoming/b.csv.gz')]
+    """
+    path = Path(source)
+    
+    if path.is_dir():
+        candidates = path.iterdir()
+    else:
+        candidates = (Path(p) for p in glob.glob(source, recursive=True))
+    
+    return sorted(p for p in candidates if p.is_file() and is_supported_input(p))
+
+
+def output_path_for(
+    input_path: Path,
+    output_dir: str,
+    output_format: str | None = None,
+    input_root: Path | None = None
+) -> Path:
+    """
+    Build the output path for an input file in batch mode.
+    
+    Args:
+        input_path: Input file
+        output_dir: Output directory
+        output_format: Output suffix without dot (default: input's data format,
+            or csv for archives)
+        input_root: Directory the inputs were found under; the input's
+            subdirectory below it is kept under output_dir
+        
+    Returns:
+        Output path, e.g. out/contacts_cleaned.csv for in/contacts.csv.gz
+    """
+    suffix, compression = io_utils.split_compression_suffix(str(input_path))
+    
+    name = input_path.name
+    if compression is not None:
+        name = name[: -len(input_path.suffix)]
+    stem = name[: -len(suffix)] if suffix else name
+    
+    extension = f".{output_format.lstrip('.')}" if output_format else (suffix or ".csv")
+    
+    subdir = Path()
+    if input_root is not None:
+        subdir = Path(os.path.abspath(input_path.parent)).relative_to(os.path.abspath(input_root))
+    
+    return Path(output_dir) / subdir / f"{stem}_cleaned{extension}"
+
+
+def output_paths_for(
+    inputs: list[Path],
+    output_dir: str,
+    output_format: str | None = None
+) -> dict[Path, Path]:
+    """
+    Build a distinct output path for every input of a batch.
+    
+    Subdirectories below the inputs' common directory are kept, so
+    in/2024/a.csv and in/2025/a.csv do not collide. Inputs that still share
+    an output (a.csv and a.xlsx with one output format, or a.csv and
+    a.csv.gz) are named after their full file name instead, e.g.
+    a_xlsx_cleaned.csv.
+    
+    Args:
+        inputs: Input files
+        output_dir: Output directory
+        output_format: Output suffix without dot (default: same as input)
+        
+    Returns:
+        Dict of {input: output path}
+        
+    Raises:
+        ValueError: If two inputs would still write the same output file
+    """
+    if not inputs:
+        return {}
+    
+    input_root = Path(os.path.commonpath([os.path.abspath(p.parent) for p in inputs]))
+    outputs = {p: output_path_for(p, output_dir, output_format, input_root) for p in inputs}
+    
+    claims = Counter(outputs.values())
+    for input_path, output_path in outputs.items():
+        if claims[output_path] > 1:
+            unique_name = input_path.name.replace(".", "_")
+            outputs[input_path] = output_path.with_name(f"{unique_name}_cleaned{output_path.suffix}")
+    
+    owners: dict[Path, Path] = {}
+    for input_path, output_path in outputs.items():
+        owner = owners.setdefault(output_path, input_path)
+        if owner != input_path:
+            raise ValueError(f"{owner} and {input_path} would both be written to {output_path}")
+    
+    return outputs
+
+
+def run_batch(
+    inputs: list[Path],
+    output_dir: str,
+    settings: Settings,
+    max_workers: int | None = None,
+    output_format: str | None = None,
+    cache_dir: str | None = None,
+    cache_max_mb: int | None = None,
+    max_rows: int | None = None,
+    on_row_limit: str = "error"
+) -> list[FileResult]:
+    """
+    Clean many files concurrently in a pool of warm worker processes.
+    
+    Workers are started once and reused, so interpreter startup and
+    phonenumbers metadata loading are paid per worker rather than per file.
+    
+    Args:
+        inputs: Input files
+        output_dir: Directory for cleaned files
+        settings: Configuration settings
+        max_workers: Worker processes (default: CPU count)
+        output_format: Output suffix without dot (default: same as input)
+        cache_dir: Result cache directory shared by all workers (see clean_file)
+        cache_max_mb: Result cache size bound
+        max_rows: Row limit per file; files over it fail (or are truncated)
+            without being read in full
+        on_row_limit: "error" or "truncate"
+        
+    Returns:
+        FileResult per input, in input order
+    
+    Raises:
+        ValueError: If two inputs would write the same output (see output_paths_for)
+    """
+    outputs = output_paths_for(inputs, output_dir, output_format)
+    for output_path in set(outputs.values()):
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(inputs)))
+    logger.info(f"Cleaning {len(inputs)} files with {workers} workers")
+    
+    results: dict[Path, FileResult] = {}
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_worker) as executor:
+        futures = {
+            executor.submit(
+                _clean_file_task,
+                str(input_path),
+                str(outputs[input_path]),
+                settings,
+                cache_dir,
+                cache_max_mb,
+                max_rows,
+                on_row_limit
+            ): input_path
+            for input_path in inputs
+        }
+        
+        for done, future in enumerate(as_completed(futures), start=1):
+            input_path = futures[future]
+            result = future.result()
+            results[input_path] = result
+            logger.info(f"[{done}/{len(inputs)}] {input_path.name}: {result.status} in {result.seconds:.2f}s")
+    
+    return [results[input_path] for input_path in inputs]
+
+
+# Scalar CleaningStats fields (optional ones included, e.g. row_limit), and
+# the columns of the batch/watch summary CSV
+STAT_FIELDS = [
+    name for name, field in CleaningStats.model_fields.items()
+    if field.annotation in (int, float, int | None, float | None)
+]
+SUMMARY_FIELDS = ["input_path", "output_path", "status", "seconds", "error"] + STAT_FIELDS
+
+
+def _summary_row(result: FileResult) -> dict:
+    row = result.model_dump(exclude={"stats"})
+    if result.stats is not None:
+        row.update(result.stats.model_dump(include=set(STAT_FIELDS)))
+    return row
+
+
+def write_batch_summary(results: list[FileResult], summary_path: str) -> None:
+    """
+    Write a CSV with one row per file: status, timing and CleaningStats fields.
+    
+    Args:
+        results: Batch results
+        summary_path: Path to summary CSV
+    """
+    Path(summary_path).parent.mkdir(parents=True, exist_ok=True)
+    
+    with open(summary_path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        
+        for result in results:
+            writer.writerow(_summary_row(result))
+    
+    logger.info(f"Wrote batch summary to {summary_path}")
+
+
+def append_batch_summary(result: FileResult, summary_path: str) -> None:
+    """
+    Append one file's row to a summary CSV, writing the header if it is new.
+    
+    Args:
+        result: Result of one file
+        summary_path: Path to summary CSV
+    """
+    path = Path(summary_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    is_new = not path.exists() or path.stat().st_size == 0
+    
+    with open(path, "a", encoding="utf-8-sig" if is_new else "utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        if is_new:
+            writer.writeheader()
+        writer.writerow(_summary_row(result))
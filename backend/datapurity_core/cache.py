@@ -0,0 +1,287 @@
+"""
+Result Cache for DataPurity Core
+================================
+
+Content-addressed cache of whole-file cleaning results. An entry is keyed on
+the SHA-256 of the input bytes, a digest of the settings that affect the
+output and the engine fingerprint (version plus a hash of the package
+sources, so any code change invalidates old results), and holds the cleaned output file(s) plus the
+CleaningStats. Re-running the same file with the same settings copies the
+stored artifact instead of running the pipeline.
+
+Entries live in one directory each under the cache directory; the cache is
+kept under a size bound by evicting least recently used entries.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+
+from datapurity_core import __version__
+from datapurity_core.config import Settings
+from datapurity_core.models import CleaningStats
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CACHE_MAX_MB = 1024
+
+# Settings that change how a run executes but not its result. The memory
+# budget can change the execution mode, which callers pass to key_for.
+EXECUTION_ONLY_SETTINGS = {"LOG_LEVEL", "MAX_MEMORY_MB"}
+
+ENTRY_FILE = "entry.json"
+HASH_BLOCK_BYTES = 1024 * 1024
+
+
+def hash_file(path: str) -> str:
+    """Return the SHA-256 hex digest of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def engine_fingerprint() -> str:
+    """
+    Return a digest of the engine: its version and the bytes of every module.
+    
+    Unlike the static __version__, this changes with any edit to the
+    package sources, so cached results of older code are never reused.
+    """
+    package_dir = Path(__file__).resolve().parent
+    digest = hashlib.sha256(__version__.encode("utf-8"))
+    for source in sorted(package_dir.rglob("*.py")):
+        digest.update(source.relative_to(package_dir).as_posix().encode("utf-8"))
+        digest.update(source.read_bytes())
+    return f"{__version__}+{digest.hexdigest()[:16]}"
+
+
+def settings_digest(settings: Settings) -> str:
+    """Return a digest of the settings that affect cleaning output."""
+    relevant = settings.model_dump(exclude=EXECUTION_ONLY_SETTINGS)
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _artifact_name(output_path: str) -> str:
+    """Name an output file is stored under: one artifact per output format."""
+    return "cleaned" + Path(output_path).suffix.lower()
+
+
+class ResultCache:
+    """
+    Size-bounded, content-addressed cache of cleaned files and their stats.
+    
+    Example:
+        >>> cache = ResultCache(".datapurity_cache", max_mb=2048)
+        >>> key = cache.key_for("contacts.xlsx", settings)
+        >>> stats = cache.restore(key, ["clean.xlsx"])
+        >>> if stats is None:
+        ...     df, stats = clean_contacts_df(load_contacts_file("contacts.xlsx"), settings)
+        ...     save_contacts_file(df, "clean.xlsx")
+        ...     cache.store(key, ["clean.xlsx"], stats)
+    """
+    
+    def __init__(self, cache_dir: str, max_mb: int = DEFAULT_CACHE_MAX_MB):
+        """
+        Args:
+            cache_dir: Directory holding the entries (created if needed)
+            max_mb: Total size bound; least recently used entries are evicted
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_mb * 1024 * 1024
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    def key_for(self, input_path: str, settings: Settings, **options) -> str:
+        """
+        Build the cache key of cleaning `input_path` with `settings`.
+        
+        Args:
+            input_path: Input file
+            settings: Configuration settings
+            **options: Other inputs that change the result (e.g. sheet
+                name, execution mode)
+        
+        Returns:
+            Hex key
+        """
+        parts = {
+            "input": hash_file(input_path),
+            "settings": settings_digest(settings),
+            "version": engine_fingerprint(),
+            "options": {name: value for name, value in sorted(options.items()) if value is not None},
+        }
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+    
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key
+    
+    def _read_entry(self, key: str) -> dict | None:
+        try:
+            return json.loads((self._entry_path(key) / ENTRY_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+    
+    def restore(self, key: str, output_paths: list[str]) -> CleaningStats | None:
+        """
+        Copy a cached result to `output_paths`.
+        
+        Args:
+            key: Cache key (see key_for)
+            output_paths: Output files wanted; each format must be cached
+        
+        Returns:
+            Stored CleaningStats on a hit, None on a miss
+        """
+        entry = self._read_entry(key)
+        entry_path = self._entry_path(key)
+        
+        if entry is None or not all(_artifact_name(p) in entry["artifacts"] for p in output_paths):
+            return None
+        
+        for output_path in output_paths:
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(entry_path / _artifact_name(output_path), output_path)
+        
+        # Mark as recently used
+        os.utime(entry_path / ENTRY_FILE)
+        logger.info(f"Result cache hit {key[:12]}: restored {', '.join(output_paths)}")
+        
+        return CleaningStats.model_validate(entry["stats"])
+    
+    def store(self, key: str, output_paths: list[str], stats: CleaningStats, input_path: str | None = None) -> None:
+        """
+        Add cleaned output files and their stats to the cache.
+        
+        Formats already cached under `key` are kept, so one entry can serve
+        several output formats.
+        
+        Args:
+            key: Cache key (see key_for)
+            output_paths: Cleaned output files
+            stats: Their cleaning statistics
+            input_path: Input file, recorded for invalidate_input
+        """
+        entry_path = self._entry_path(key)
+        staging = self.cache_dir / f".{key}.{os.getpid()}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        
+        if entry_path.is_dir():
+            shutil.copytree(entry_path, staging)
+        else:
+            staging.mkdir()
+        
+        entry = self._read_entry(key) or {"artifacts": [], "input_path": None}
+        for output_path in output_paths:
+            name = _artifact_name(output_path)
+            shutil.copyfile(output_path, staging / name)
+            if name not in entry["artifacts"]:
+                entry["artifacts"].append(name)
+        
+        entry.update(
+            stats=stats.model_dump(),
+            version=engine_fingerprint(),
+            input_path=str(Path(input_path).resolve()) if input_path else entry["input_path"],
+            stored_at=time.time(),
+        )
+        (staging / ENTRY_FILE).write_text(json.dumps(entry, indent=2), encoding="utf-8")
+        
+        # Swap the finished entry in; readers never see a partial one
+        shutil.rmtree(entry_path, ignore_errors=True)
+        try:
+            os.replace(staging, entry_path)
+        except OSError:
+            # Another process stored the same key first; its entry is equivalent
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+        logger.info(f"Stored result {key[:12]} in cache ({', '.join(entry['artifacts'])})")
+        
+        self.evict()
+    
+    def entries(self) -> list[tuple[Path, int, float]]:
+        """Return (entry dir, size in bytes, last use time) of every entry."""
+        entries = []
+        for entry_path in self.cache_dir.iterdir():
+            entry_file = entry_path / ENTRY_FILE
+            if entry_path.name.startswith("."):
+                continue
+            try:
+                size = sum(f.stat().st_size for f in entry_path.iterdir())
+                entries.append((entry_path, size, entry_file.stat().st_mtime))
+            except OSError:
+                # Incomplete, or removed by another process meanwhile
+                continue
+        return entries
+    
+    def size_bytes(self) -> int:
+        """Total size of all entries."""
+        return sum(size for _, size, _ in self.entries())
+    
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache fits its bound.
+        
+        Returns:
+            Number of entries removed
+        """
+        entries = sorted(self.entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        
+        for entry_path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_path, ignore_errors=True)
+            total -= size
+            removed += 1
+        
+        if removed:
+            logger.info(f"Evicted {removed} cached results ({total / 1024 / 1024:.1f} MB left)")
+        
+        return removed
+    
+    def invalidate(self, key: str) -> bool:
+        """
+        Remove one entry.
+        
+        Returns:
+            True if the entry existed
+        """
+        entry_path = self._entry_path(key)
+        existed = entry_path.is_dir()
+        shutil.rmtree(entry_path, ignore_errors=True)
+        return existed
+    
+    def invalidate_input(self, input_path: str) -> int:
+        """
+        Remove every entry stored for an input file, whatever its settings.
+        
+        Returns:
+            Number of entries removed
+        """
+        resolved = str(Path(input_path).resolve())
+        removed = 0
+        for entry_path, _, _ in self.entries():
+            entry = self._read_entry(entry_path.name)
+            if entry is not None and entry.get("input_path") == resolved:
+                removed += self.invalidate(entry_path.name)
+        return removed
+    
+    def clear(self) -> int:
+        """
+        Remove every entry.
+        
+        Returns:
+            Number of entries removed
+        """
+        entries = self.entries()
+        for entry_path, _, _ in entries:
+            shutil.rmtree(entry_path, ignore_errors=True)
+        return len(entries)
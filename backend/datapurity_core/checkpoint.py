@@ -0,0 +1,583 @@
+"""
+Checkpointed Cleaning for DataPurity Core
+=========================================
+
+Resumable cleaning of very large inputs. Rows are processed in fixed ranges;
+after each range the cleaned segment, the new phone/email/name dedup state
+and the progress offset are persisted to a work directory, so a killed run
+can continue from the last completed range instead of starting over.
+
+The same range-by-range pipeline also cleans inputs that do not fit in
+memory at all, streaming them from disk (clean_file_streaming).
+
+Duplicate marking carries state across ranges and gives the same
+`is_duplicate` decisions as the in-memory pipeline:
+- a row is a phone (email) duplicate if any earlier row had the same phone
+  (email), including rows that were themselves dropped
+- a row is a fuzzy duplicate if its name's matching key (see
+  deduplication.name_match_keys) matches that of an earlier retained row
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+from pathlib import Path
+from collections.abc import Iterator
+import numpy as np
+import pandas as pd
+
+from datapurity_core.config import Settings
+from datapurity_core.models import CleaningStats
+from datapurity_core import cleaning, io_utils, stats
+from datapurity_core import deduplication
+from datapurity_core.cache import settings_digest
+from datapurity_core.deduplication import name_match_keys
+from datapurity_core.profiling import NULL_PROFILER
+
+logger = logging.getLogger(__name__)
+
+
+# Bumped when the on-disk layout changes; older checkpoints are not resumed
+CHECKPOINT_VERSION = 1
+
+STATE_FILE = "state.json"
+SEGMENT_PATTERN = "segment_{:06d}.pkl"
+
+
+class DedupState:
+    """
+    Duplicate-detection state carried from one row range to the next.
+    
+    Attributes:
+        phones: Normalized phone → global row of its first occurrence
+        emails: Normalized email → global row of its first occurrence
+        names: Matching keys of retained rows eligible for fuzzy matching, in order
+        name_rows: Global rows of `names`
+        groups: Anchor row → duplicate group id, numbered in discovery order
+    """
+    
+    def __init__(self):
+        self.phones: dict[str, int] = {}
+        self.emails: dict[str, int] = {}
+        self.names: list[str] = []
+        self.name_rows: list[int] = []
+        self.groups: dict[int, int] = {}
+        self._name_lengths = np.zeros(0, dtype=np.int64)
+    
+    @staticmethod
+    def empty_delta() -> dict:
+        return {"phones": {}, "emails": {}, "names": [], "name_rows": [], "groups": {}}
+    
+    def apply(self, delta: dict) -> None:
+        """Replay the state changes recorded for one range."""
+        self.phones.update(delta["phones"])
+        self.emails.update(delta["emails"])
+        self.names.extend(delta["names"])
+        self.name_rows.extend(delta["name_rows"])
+        self.groups.update(delta["groups"])
+    
+    def name_lengths(self) -> np.ndarray:
+        """Return the lengths of `names`, extended as names are added."""
+        known = len(self._name_lengths)
+        if known < len(self.names):
+            added = np.fromiter(map(len, self.names[known:]), dtype=np.int64, count=len(self.names) - known)
+            self._name_lengths = np.concatenate([self._name_lengths, added])
+        return self._name_lengths
+    
+    def group_for(self, anchor: int, delta: dict) -> int:
+        """Return the group id of an anchor row, assigning one if needed."""
+        if anchor not in self.groups:
+            self.groups[anchor] = len(self.groups)
+            delta["groups"][anchor] = self.groups[anchor]
+        return self.groups[anchor]
+
+
+def _match_range_names(keys: list[str], state: DedupState, threshold: float) -> list[tuple[int, float] | None]:
+    """
+    Find the fuzzy anchor of each name key of a range.
+    
+    A key matches the first retained name of earlier ranges over the
+    threshold; keys without one are matched greedily among themselves, as
+    mark_duplicates does. Both comparisons are length-blocked cdist runs
+    (see deduplication.length_blocked_cdist), not one scan per row.
+    
+    Args:
+        keys: Matching keys of the range's fuzzy candidates, in row order
+        state: Dedup state of all earlier ranges
+        threshold: Minimum fuzz.ratio similarity
+    
+    Returns:
+        Per key, None if it is retained, otherwise (anchor, similarity):
+        a non-negative anchor is a position in state.names, a negative
+        anchor -(k + 1) the earlier key k of this range
+    """
+    first_match = np.full(len(keys), -1, dtype=np.int64)
+    first_score = np.zeros(len(keys))
+    
+    if state.names:
+        no_match = np.iinfo(np.int64).max
+        blocks = deduplication.length_blocked_cdist(
+            keys, state.names, threshold, choice_lengths=state.name_lengths()
+        )
+        for query_positions, choice_positions, matrix in blocks:
+            hits = matrix >= threshold
+            # State names are in row order: the lowest position is the first match
+            best = np.where(hits, choice_positions[None, :], no_match).argmin(axis=1)
+            rows = np.arange(len(query_positions))
+            matched = hits[rows, best]
+            first_match[query_positions[matched]] = choice_positions[best[matched]]
+            first_score[query_positions[matched]] = matrix[rows, best][matched]
+    
+    matches: list[tuple[int, float] | None] = [
+        (int(position), float(score)) if position >= 0 else None
+        for position, score in zip(first_match, first_score)
+    ]
+    
+    rest = np.flatnonzero(first_match < 0)
+    rest_keys = [keys[k] for k in rest]
+    pairs = deduplication.fuzzy_candidate_pairs(rest_keys, threshold, max_pairs=deduplication.MAX_FUZZY_PAIRS)
+    if pairs is None:
+        pairs = deduplication.fuzzy_duplicate_pairs(rest_keys, threshold)
+    
+    # Greedy replay in (i, j) order: the first earlier retained key wins
+    for i, j, similarity in zip(*(part.tolist() for part in pairs)):
+        if matches[rest[i]] is not None or matches[rest[j]] is not None:
+            continue
+        matches[rest[j]] = (-(int(rest[i]) + 1), similarity)
+    
+    return matches
+
+
+def mark_range_duplicates(df: pd.DataFrame, state: DedupState, settings: Settings) -> tuple[pd.DataFrame, dict]:
+    """
+    Mark duplicates in one row range against all earlier ranges.
+    
+    Adds the is_duplicate, duplicate_group_id and duplicate_reason columns
+    (as mark_duplicates does) and updates `state` in place.
+    
+    Args:
+        df: Normalized row range, indexed by global row number
+        state: Dedup state of all earlier ranges
+        settings: Configuration settings
+    
+    Returns:
+        Tuple of (marked_df, delta) where delta records the state changes
+    """
+    delta = DedupState.empty_delta()
+    anchors: list[int | None] = []
+    reasons: list[str] = []
+    candidates: list[int] = []
+    
+    fuzzy = settings.ENABLE_FUZZY_DEDUP
+    min_len = settings.MIN_VALID_NAME_LEN
+    rows = df.index.tolist()
+    
+    for position, (row, name, phone, email) in enumerate(zip(rows, df["name"], df["phone"], df["email"])):
+        anchor = None
+        reason = ""
+        
+        if not pd.isna(phone):
+            if phone in state.phones:
+                anchor, reason = state.phones[phone], f"phone:{phone}"
+            else:
+                state.phones[phone] = delta["phones"][phone] = row
+        
+        if not pd.isna(email):
+            if email not in state.emails:
+                state.emails[email] = delta["emails"][email] = row
+            elif anchor is None:
+                anchor, reason = state.emails[email], f"email:{email}"
+        
+        if anchor is None and fuzzy and isinstance(name, str) and len(name) >= min_len:
+            candidates.append(position)
+        
+        anchors.append(anchor)
+        reasons.append(reason)
+    
+    if candidates:
+        # Compare matching keys, as mark_duplicates does; the names are left as written
+        keys = name_match_keys(df["name"].iloc[candidates].astype("object")).tolist()
+        matches = _match_range_names(keys, state, settings.FUZZY_NAME_THRESHOLD)
+        
+        for position, key, match in zip(candidates, keys, matches):
+            if match is None:
+                state.names.append(key)
+                state.name_rows.append(rows[position])
+                delta["names"].append(key)
+                delta["name_rows"].append(rows[position])
+                continue
+            
+            anchor, similarity = match
+            anchors[position] = state.name_rows[anchor] if anchor >= 0 else rows[candidates[-anchor - 1]]
+            reasons[position] = f"fuzzy_name:{similarity}%"
+    
+    # Group ids in row order, so they are numbered in discovery order
+    group_ids = [None if anchor is None else state.group_for(anchor, delta) for anchor in anchors]
+    
+    df["is_duplicate"] = [anchor is not None for anchor in anchors]
+    df["duplicate_group_id"] = pd.Series(group_ids, index=df.index, dtype=object)
+    df["duplicate_reason"] = reasons
+    
+    return df, delta
+
+
+def _fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of the input rows and columns."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(c) for c in df.columns]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write a file so that a crash leaves either the old or the new version."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint_state(work_dir: str) -> dict | None:
+    """
+    Read the progress manifest of a work directory.
+    
+    Args:
+        work_dir: Checkpoint directory
+    
+    Returns:
+        Manifest dict, or None if there is no checkpoint
+    """
+    path = Path(work_dir) / STATE_FILE
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def clear_checkpoint(work_dir: str) -> None:
+    """
+    Delete the checkpoint files in a work directory (and the directory if empty).
+    
+    Args:
+        work_dir: Checkpoint directory
+    """
+    path = Path(work_dir)
+    if not path.is_dir():
+        return
+    
+    for file in [path / STATE_FILE, path / f"{STATE_FILE}.tmp", *path.glob("segment_*.pkl*")]:
+        file.unlink(missing_ok=True)
+    
+    if not any(path.iterdir()):
+        path.rmdir()
+
+
+def clean_checkpointed(
+    df: pd.DataFrame,
+    settings: Settings,
+    work_dir: str,
+    chunk_size: int = io_utils.DEFAULT_CHUNK_SIZE,
+    resume: bool = False,
+    profiler=None
+) -> tuple[pd.DataFrame, CleaningStats]:
+    """
+    Clean contacts in row ranges, checkpointing each range to `work_dir`.
+    
+    The result depends only on the input, the settings and `chunk_size`, so
+    a resumed run produces exactly the same DataFrame (and output file) as an
+    uninterrupted one. Duplicate decisions match clean_contacts_df; group ids
+    are numbered per anchor row in discovery order.
+    
+    Args:
+        df: Input DataFrame with raw contacts
+        settings: Configuration settings
+        work_dir: Directory for segments and the progress manifest
+        chunk_size: Rows per range
+        resume: Continue from the last completed range; without it, any
+            existing checkpoint in `work_dir` is discarded
+        profiler: Optional profiling.PipelineProfiler
+    
+    Returns:
+        Tuple of (cleaned_df, stats)
+    
+    Raises:
+        ValueError: If resuming a checkpoint made for a different input,
+            settings or chunk size
+    
+    Example:
+        >>> cleaned_df, stats = clean_checkpointed(df, settings, "big.checkpoint", resume=True)
+    """
+    profiler = profiler or NULL_PROFILER
+    work_path = Path(work_dir)
+    total_rows = len(df)
+    
+    if total_rows == 0:
+        return cleaning.clean_contacts_df(df, settings, profiler=profiler)
+    
+    manifest = {
+        "version": CHECKPOINT_VERSION,
+        "fingerprint": _fingerprint(df),
+        "settings": settings_digest(settings),
+        "chunk_size": chunk_size,
+        "total_rows": total_rows,
+        "offset": 0,
+        "segments": 0,
+    }
+    
+    state = DedupState()
+    previous = load_checkpoint_state(work_dir)
+    
+    if resume and previous is not None:
+        for key in ("version", "fingerprint", "settings", "chunk_size", "total_rows"):
+            if previous.get(key) != manifest[key]:
+                raise ValueError(
+                    f"Checkpoint in {work_dir} does not match this run ({key} differs); "
+                    f"rerun without --resume to start over"
+                )
+        
+        for index in range(previous["segments"]):
+            state.apply(_load_segment(work_path, index)["delta"])
+        manifest.update(offset=previous["offset"], segments=previous["segments"])
+        logger.info(f"Resuming from row {manifest['offset']} of {total_rows} ({manifest['segments']} segments done)")
+    else:
+        if resume:
+            logger.info(f"No checkpoint in {work_dir}; starting from the beginning")
+        clear_checkpoint(work_dir)
+    
+    work_path.mkdir(parents=True, exist_ok=True)
+    
+    # Column mapping looks at the whole input, so it runs once up front
+    profiler.step("normalize_column_names")
+    df = cleaning.ensure_columns(
+        io_utils.normalize_column_names(df, default_country_code=settings.DEFAULT_COUNTRY_CODE)
+    )
+    
+    while manifest["offset"] < total_rows:
+        start = manifest["offset"]
+        stop = min(start + chunk_size, total_rows)
+        logger.info(f"Cleaning rows {start}-{stop - 1} of {total_rows}")
+        
+        chunk = df.iloc[start:stop].copy()
+        chunk.index = pd.RangeIndex(start, stop)
+        
+        _write_segment(work_path, manifest["segments"], chunk, state, settings, profiler)
+        
+        manifest.update(offset=stop, segments=manifest["segments"] + 1)
+        _atomic_write(work_path / STATE_FILE, json.dumps(manifest, indent=2).encode("utf-8"))
+    
+    return _finalize(work_path, manifest, state, settings, profiler)
+
+
+def _write_segment(
+    work_path: Path,
+    index: int,
+    chunk: pd.DataFrame,
+    state: DedupState,
+    settings: Settings,
+    profiler
+) -> None:
+    """Clean one row range (indexed by global row) and persist it as a segment."""
+    chunk = cleaning.normalize_contact_fields(chunk, settings, profiler)
+    
+    profiler.step("mark_duplicates")
+    chunk, delta = mark_range_duplicates(chunk, state, settings)
+    
+    profiler.step("drop_hard_duplicates")
+    after_drop = chunk[~chunk["is_duplicate"]].copy()
+    final = cleaning.score_and_filter(after_drop, settings, profiler)
+    
+    accumulator = stats.StatsAccumulator()
+    accumulator.observe_input(len(chunk))
+    accumulator.observe_deduplicated(len(after_drop))
+    accumulator.observe_final(final)
+    
+    profiler.step("write_segment")
+    payload = {
+        "frame": final,
+        "delta": delta,
+        "stats": accumulator.to_dict(),
+    }
+    _atomic_write(
+        work_path / SEGMENT_PATTERN.format(index),
+        pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+    )
+
+
+def _load_segment(work_path: Path, index: int) -> dict:
+    with open(work_path / SEGMENT_PATTERN.format(index), "rb") as f:
+        return pickle.load(f)
+
+
+def _finalize(
+    work_path: Path,
+    manifest: dict,
+    state: DedupState,
+    settings: Settings,
+    profiler
+) -> tuple[pd.DataFrame, CleaningStats]:
+    """Assemble the segments into the cleaned DataFrame and its stats."""
+    profiler.step("assemble_segments")
+    
+    frames = []
+    accumulator = stats.StatsAccumulator()
+    for index in range(manifest["segments"]):
+        segment = _load_segment(work_path, index)
+        frames.append(segment["frame"])
+        accumulator.merge(stats.StatsAccumulator.from_dict(segment["stats"]))
+    
+    df = pd.concat(frames)
+    
+    # Anchors get their group id when a later range finds their duplicate
+    df["duplicate_group_id"] = pd.Series(
+        [state.groups.get(row) for row in df.index], index=df.index, dtype=object
+    )
+    
+    df = df.reset_index(drop=True)
+    df["id"] = df.index
+    
+    profiler.step("build_stats")
+    cleaning_stats = accumulator.to_stats()
+    stats.log_stats(cleaning_stats)
+    
+    if settings.COMPACT_DTYPES:
+        profiler.step("compact_dtypes")
+        df = cleaning.compact_dtypes(df, settings)
+    
+    profiler.finish()
+    
+    logger.info(
+        f"Checkpointed cleaning completed: {cleaning_stats.rows_final} rows "
+        f"(from {cleaning_stats.rows_original})"
+    )
+    
+    return df, cleaning_stats
+
+
+def iter_input_ranges(
+    input_path: str,
+    chunk_size: int,
+    sheet_name: str | None = None,
+    profiler=None,
+    default_country_code: str = io_utils.DEFAULT_INFER_COUNTRY
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream an input file as row ranges with canonical columns.
+    
+    Column names are mapped from the first chunk and applied to all chunks,
+    and each chunk is indexed by global row number.
+    
+    Args:
+        input_path: Path to input file
+        chunk_size: Rows per range
+        sheet_name: Excel sheet to read (default: first sheet)
+        profiler: Optional profiling.PipelineProfiler
+        default_country_code: ISO country code used to validate inferred phones
+    
+    Yields:
+        Raw row ranges with all required columns
+    """
+    profiler = profiler or NULL_PROFILER
+    rename_map = None
+    offset = 0
+    
+    profiler.step("load_input")
+    for chunk in io_utils.iter_contacts_file(input_path, chunk_size=chunk_size, sheet_name=sheet_name):
+        if rename_map is None:
+            profiler.step("normalize_column_names")
+            rename_map = {
+                col: canonical_name
+                for col, (canonical_name, _) in io_utils.infer_column_mapping(chunk, default_country_code=default_country_code).items()
+            }
+            logger.info(f"Column mapping for all chunks: {rename_map}")
+        
+        chunk = cleaning.ensure_columns(chunk.rename(columns=rename_map))
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        
+        yield chunk
+        profiler.step("load_input")
+
+
+def clean_file_streaming(
+    input_path: str,
+    output_paths: list[str],
+    settings: Settings,
+    chunk_size: int = io_utils.DEFAULT_CHUNK_SIZE,
+    sheet_name: str | None = None,
+    stats_path: str | None = None,
+    work_dir: str | None = None,
+    profiler=None
+) -> CleaningStats:
+    """
+    Clean a file that does not fit in memory, streaming it range by range.
+    
+    The input is read in chunks of `chunk_size` rows; each chunk is cleaned
+    against the dedup state of all earlier chunks and spilled to a segment
+    in `work_dir`. A second pass streams the segments, with their final
+    duplicate group ids, to the output files. Only one range plus the dedup
+    index is in memory at a time. Rows and duplicate decisions are the same
+    as clean_contacts_df; columns keep their plain dtypes (no compaction).
+    
+    Column names are mapped from the first chunk (see iter_input_ranges).
+    
+    Args:
+        input_path: Path to input file
+        output_paths: Output files (.csv, .xlsx, .parquet, .jsonl, .vcf)
+        settings: Configuration settings
+        chunk_size: Rows per range
+        sheet_name: Excel sheet to read (default: first sheet)
+        stats_path: Optional JSON stats file
+        work_dir: Directory for segments (default: a temporary directory)
+        profiler: Optional profiling.PipelineProfiler
+    
+    Returns:
+        CleaningStats
+    
+    Example:
+        >>> stats = clean_file_streaming("huge.csv.gz", ["clean.parquet"], settings, chunk_size=100_000)
+    """
+    import tempfile
+    from datapurity_core.writers import MultiFormatWriter
+    
+    profiler = profiler or NULL_PROFILER
+    
+    with tempfile.TemporaryDirectory(prefix="datapurity_stream_", dir=work_dir) as tmp_dir:
+        work_path = Path(tmp_dir)
+        state = DedupState()
+        segments = 0
+        
+        for chunk in iter_input_ranges(input_path, chunk_size, sheet_name, profiler, settings.DEFAULT_COUNTRY_CODE):
+            logger.info(f"Cleaning rows {chunk.index[0]}-{chunk.index[-1]}")
+            _write_segment(work_path, segments, chunk, state, settings, profiler)
+            segments += 1
+        
+        profiler.step("save_output")
+        accumulator = stats.StatsAccumulator()
+        rows_written = 0
+        
+        with MultiFormatWriter(output_paths, stats_path=stats_path) as writer:
+            for index in range(segments):
+                segment = _load_segment(work_path, index)
+                accumulator.merge(stats.StatsAccumulator.from_dict(segment["stats"]))
+                
+                frame = segment["frame"]
+                frame["duplicate_group_id"] = pd.Series(
+                    [state.groups.get(row) for row in frame.index], index=frame.index, dtype=object
+                )
+                frame = frame.reset_index(drop=True)
+                frame["id"] = frame.index + rows_written
+                rows_written += len(frame)
+                writer.write(frame)
+            
+            cleaning_stats = accumulator.to_stats()
+            writer.stats = cleaning_stats
+    
+    stats.log_stats(cleaning_stats)
+    profiler.finish()
+    
+    logger.info(f"Streaming cleaning completed: {cleaning_stats.rows_final} rows (from {cleaning_stats.rows_original})")
+    
+    return cleaning_stats
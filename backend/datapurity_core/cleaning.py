@@ -9,12 +9,13 @@ import re
 import logging
 from typing import Any
 import pandas as pd
-import phonenumbers
-from phonenumbers import NumberParseException
 
 from datapurity_core.config import Settings
 from datapurity_core.models import CleaningStats
-from datapurity_core import deduplication, scoring, stats, io_utils
+from datapurity_core import deduplication, scoring, stats, io_utils, planner
+from datapurity_core.profiling import NULL_PROFILER
+from datapurity_core.step_cache import NULL_STEP_CACHE
+from datapurity_core.provenance import EMPTY
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +26,12 @@ BAD_NAME_PATTERNS = [
     "غير معروف", "بدون", "لا يوجد", "مجهول", "تست", "تجربة"
 ]
 
+# Low-cardinality text columns eligible for categorical storage
+CATEGORICAL_COLUMNS = ["company", "job_title", "city"]
+
+# Boolean flag columns produced by the pipeline
+FLAG_COLUMNS = ["phone_valid", "email_valid", "is_duplicate"]
+
 
 def clean_text(value: Any) -> str:
     """
@@ -138,6 +145,8 @@ def normalize_phone(phone: str, default_country_code: str) -> tuple[str | None,
         >>> normalize_phone("invalid", "SA")
         (None, False)
     """
+    import phonenumbers  # Imported on first use to keep package import fast
+    
     phone = clean_text(phone)
     
     if not phone:
@@ -157,7 +166,7 @@ def normalize_phone(phone: str, default_country_code: str) -> tuple[str | None,
         else:
             return (None, False)
             
-    except NumberParseException:
+    except phonenumbers.NumberParseException:
         # Fallback for Saudi numbers
         if default_country_code == "SA":
             digits = extract_digits(phone)
@@ -265,99 +274,156 @@ def ensure_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def clean_contacts_df(df: pd.DataFrame, settings: Settings) -> tuple[pd.DataFrame, CleaningStats]:
+def compact_dtypes(df: pd.DataFrame, settings: Settings) -> pd.DataFrame:
     """
-    Main cleaning pipeline for contact DataFrame.
+    Downcast cleaned output columns to compact dtypes.
     
-    Steps:
-    1. Normalize column names
-    2. Ensure required columns exist
-    3. Clean all text fields
-    4. Normalize names
-    5. Normalize phone numbers
-    6. Normalize emails
-    7. Mark duplicates
-    8. Remove hard duplicates
-    9. Compute quality scores
-    10. Remove empty rows
-    11. Generate statistics
+    Conversions:
+    - quality_score: int8 (scores are 0-100)
+    - duplicate_group_id: nullable Int32
+    - phone_valid / email_valid / is_duplicate: bool
+    - company / job_title / city: category, when the column's
+      unique-to-rows ratio is at or below CATEGORY_MAX_UNIQUE_RATIO
     
     Args:
-        df: Input DataFrame with raw contacts
+        df: Cleaned DataFrame
         settings: Configuration settings
         
     Returns:
-        Tuple of (cleaned_df, stats)
+        DataFrame with compact dtypes
         
     Example:
-        >>> from datapurity_core.config import get_settings
-        >>> settings = get_settings()
-        >>> df = pd.DataFrame({"الاسم": ["أحمد"], "الجوال": ["0501234567"]})
-        >>> cleaned_df, stats = clean_contacts_df(df, settings)
+        >>> df = pd.DataFrame({"quality_score": [80, 95], "city": ["Riyadh", "Riyadh"]})
+        >>> compact_dtypes(df, settings).dtypes["quality_score"]
+        dtype('int8')
     """
-    logger.info("=" * 60)
-    logger.info("Starting contact cleaning pipeline")
-    logger.info(f"Input rows: {len(df)}")
+    if "quality_score" in df.columns:
+        df["quality_score"] = df["quality_score"].astype("int8")
     
-    # Store original for stats
-    df_original = df.copy()
-    rows_original = len(df)
+    if "duplicate_group_id" in df.columns:
+        df["duplicate_group_id"] = pd.to_numeric(
+            df["duplicate_group_id"], errors="coerce"
+        ).astype("Int32")
     
-    # Step 1: Normalize column names
-    logger.info("Step 1: Normalizing column names")
-    df = io_utils.normalize_column_names(df)
+    for col in FLAG_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].fillna(False).astype(bool)
     
-    # Step 2: Ensure required columns
-    logger.info("Step 2: Ensuring required columns")
-    df = ensure_columns(df)
+    rows = len(df)
+    if rows > 0:
+        for col in CATEGORICAL_COLUMNS:
+            if col not in df.columns:
+                continue
+            unique_ratio = df[col].nunique(dropna=False) / rows
+            if unique_ratio <= settings.CATEGORY_MAX_UNIQUE_RATIO:
+                df[col] = df[col].astype("category")
+    
+    return df
+
+
+def normalize_contact_fields(df: pd.DataFrame, settings: Settings, profiler=None, step_cache=None) -> pd.DataFrame:
+    """
+    Clean text fields and normalize names, phones and emails (pipeline steps 3-6).
+    
+    Row-wise: each row's result depends only on the row itself, so the
+    steps can run on any row range independently.
+    
+    Args:
+        df: DataFrame with canonical columns (see ensure_columns)
+        settings: Configuration settings
+        profiler: Optional profiling.PipelineProfiler
+        step_cache: Optional step_cache.StepCache; each step's output is
+            reused when its input column(s) and the settings it reads match
+        
+    Returns:
+        DataFrame with normalized fields plus phone_valid/email_valid flags
+    """
+    profiler = profiler or NULL_PROFILER
+    step_cache = step_cache or NULL_STEP_CACHE
     
     # Step 3: Clean all text columns
+    profiler.step("clean_text")
     logger.info("Step 3: Cleaning text fields")
     text_columns = ["name", "phone", "email", "company", "job_title", "city", "notes"]
+    text_columns = [col for col in text_columns if col in df.columns]
+    cleaned = step_cache.cached(
+        "clean_text", df[text_columns], {},
+        lambda: pd.DataFrame({col: df[col].apply(clean_text) for col in text_columns}, index=df.index)
+    )
     for col in text_columns:
-        if col in df.columns:
-            df[col] = df[col].apply(clean_text)
+        df[col] = cleaned[col].set_axis(df.index)
     
     # Step 4: Normalize names
+    profiler.step("normalize_names")
     logger.info("Step 4: Normalizing names")
-    df["name"] = df["name"].apply(normalize_name)
+    names = step_cache.cached("normalize_names", df["name"], {}, lambda: df["name"].apply(normalize_name))
+    df["name"] = names.set_axis(df.index)
     
     # Step 5: Normalize phone numbers
+    profiler.step("normalize_phones")
     logger.info("Step 5: Normalizing phone numbers")
-    phone_results = df["phone"].apply(
-        lambda x: normalize_phone(x, settings.DEFAULT_COUNTRY_CODE)
+    
+    def normalize_phones() -> pd.DataFrame:
+        phone_results = df["phone"].apply(
+            lambda x: normalize_phone(x, settings.DEFAULT_COUNTRY_CODE)
+        )
+        return pd.DataFrame({
+            "phone": phone_results.apply(lambda x: x[0]),
+            "phone_valid": phone_results.apply(lambda x: x[1]),
+        })
+    
+    phones = step_cache.cached(
+        "normalize_phones", df["phone"], {"DEFAULT_COUNTRY_CODE": settings.DEFAULT_COUNTRY_CODE}, normalize_phones
     )
-    df["phone"] = phone_results.apply(lambda x: x[0])
-    df["phone_valid"] = phone_results.apply(lambda x: x[1])
+    df["phone"] = phones["phone"].set_axis(df.index)
+    df["phone_valid"] = phones["phone_valid"].set_axis(df.index)
     
     invalid_phones = (~df["phone_valid"]).sum()
     logger.info(f"  - Invalid phones: {invalid_phones}")
     
     # Step 6: Normalize emails
+    profiler.step("normalize_emails")
     logger.info("Step 6: Normalizing emails")
-    email_results = df["email"].apply(
-        lambda x: normalize_email(x, settings.BAD_EMAIL_DOMAINS)
+    
+    def normalize_emails() -> pd.DataFrame:
+        email_results = df["email"].apply(
+            lambda x: normalize_email(x, settings.BAD_EMAIL_DOMAINS)
+        )
+        return pd.DataFrame({
+            "email": email_results.apply(lambda x: x[0]),
+            "email_valid": email_results.apply(lambda x: x[1]),
+        })
+    
+    emails = step_cache.cached(
+        "normalize_emails", df["email"], {"BAD_EMAIL_DOMAINS": settings.BAD_EMAIL_DOMAINS}, normalize_emails
     )
-    df["email"] = email_results.apply(lambda x: x[0])
-    df["email_valid"] = email_results.apply(lambda x: x[1])
+    df["email"] = emails["email"].set_axis(df.index)
+    df["email_valid"] = emails["email_valid"].set_axis(df.index)
     
     invalid_emails = (~df["email_valid"]).sum()
     logger.info(f"  - Invalid emails: {invalid_emails}")
     
-    # Step 7: Mark duplicates
-    logger.info("Step 7: Marking duplicates")
-    df = deduplication.mark_duplicates(df, settings)
+    return df
+
+
+def score_and_filter(df: pd.DataFrame, settings: Settings, profiler=None) -> pd.DataFrame:
+    """
+    Compute quality scores and drop empty rows (pipeline steps 9-10).
     
-    # Step 8: Remove hard duplicates
-    logger.info("Step 8: Removing hard duplicates")
-    df_after_drop = deduplication.drop_hard_duplicates(df)
-    rows_after_drop = len(df_after_drop)
-    duplicates_removed = len(df) - rows_after_drop
-    logger.info(f"  - Removed {duplicates_removed} hard duplicates")
+    A row is empty if it has no phone, no email and no good name.
     
-    df = df_after_drop
+    Args:
+        df: Deduplicated DataFrame
+        settings: Configuration settings
+        profiler: Optional profiling.PipelineProfiler
+        
+    Returns:
+        Scored DataFrame without empty rows (index not reset)
+    """
+    profiler = profiler or NULL_PROFILER
     
     # Step 9: Compute quality scores
+    profiler.step("quality_scores")
     logger.info("Step 9: Computing quality scores")
     df["quality_score"] = df.apply(
         lambda row: scoring.compute_quality_score(row, settings),
@@ -368,20 +434,170 @@ def clean_contacts_df(df: pd.DataFrame, settings: Settings) -> tuple[pd.DataFram
     logger.info(f"  - Average quality score: {avg_score:.1f}")
     
     # Step 10: Remove empty rows
+    profiler.step("remove_empty_rows")
     logger.info("Step 10: Removing empty/invalid rows")
     
     # A row is empty if:
     # - No phone
     # - No email
     # - AND name is not good
-    rows_before_empty_removal = len(df)
-    
     df = df[
         (df["phone"].notna()) | 
         (df["email"].notna()) | 
         (df["name"].apply(lambda n: is_good_name(n, settings.MIN_VALID_NAME_LEN)))
     ]
     
+    return df
+
+
+def clean_contacts_df(
+    df: pd.DataFrame,
+    settings: Settings,
+    profiler=None,
+    checkpoint_dir: str | None = None,
+    chunk_size: int = io_utils.DEFAULT_CHUNK_SIZE,
+    resume: bool = False,
+    step_cache=None,
+    max_rows: int | None = None,
+    on_row_limit: str = "error",
+    provenance=None
+) -> tuple[pd.DataFrame, CleaningStats]:
+    """
+    Main cleaning pipeline for contact DataFrame.
+    
+    Steps:
+    1. Normalize column names
+    2. Ensure required columns exist
+    3. Clean all text fields
+    4. Normalize names
+    5. Normalize phone numbers
+    6. Normalize emails
+    7. Mark duplicates
+    8. Remove hard duplicates
+    9. Compute quality scores
+    10. Remove empty rows
+    11. Generate statistics
+    12. Compact output dtypes (if enabled)
+    
+    When Settings.MAX_MEMORY_MB is set and the estimated peak memory of the
+    in-memory pipeline exceeds it, the rows are cleaned in ranges sized to
+    the budget, checkpointed to a temporary directory (see planner).
+    
+    Args:
+        df: Input DataFrame with raw contacts (a pyarrow Table is converted
+            to an Arrow-backed DataFrame)
+        settings: Configuration settings
+        profiler: Optional profiling.PipelineProfiler; each step is timed
+            under its own name
+        checkpoint_dir: If set, process the rows in ranges of `chunk_size`
+            and checkpoint each range to this work directory (see
+            checkpoint.clean_checkpointed)
+        chunk_size: Rows per range in checkpointed mode
+        resume: Continue from the last completed range in `checkpoint_dir`
+        step_cache: Optional step_cache.StepCache; normalization steps and
+            the fuzzy pair list are reused across runs whose inputs and
+            relevant settings match (in-memory runs only)
+        max_rows: Row limit (e.g. a plan's records per file)
+        on_row_limit: "error" to raise io_utils.RowLimitExceededError, or
+            "truncate" to clean only the first max_rows rows. Truncation,
+            here or by load_contacts_file, is reported in the stats
+        provenance: Optional provenance.RowProvenance; filled with each
+            source row's fate and each output row's source row (in-memory
+            runs only)
+        
+    Returns:
+        Tuple of (cleaned_df, stats)
+        
+    Raises:
+        RowLimitExceededError: If df has more than max_rows rows and
+            on_row_limit is "error"
+        
+    Example:
+        >>> from datapurity_core.config import get_settings
+        >>> settings = get_settings()
+        >>> df = pd.DataFrame({"الاسم": ["أحمد"], "الجوال": ["0501234567"]})
+        >>> cleaned_df, stats = clean_contacts_df(df, settings)
+    """
+    if not isinstance(df, pd.DataFrame) and hasattr(df, "to_pandas"):
+        df = df.to_pandas(types_mapper=pd.ArrowDtype)
+    
+    if max_rows is not None:
+        df = io_utils.limit_rows(df, max_rows, on_row_limit)
+    row_limit = df.attrs.get("row_limit")
+    rows_over_limit = df.attrs.get("rows_over_limit")
+    
+    if checkpoint_dir is not None:
+        from datapurity_core.checkpoint import clean_checkpointed
+        if provenance is not None:
+            logger.warning("Row provenance is only tracked by the in-memory pipeline")
+        df, cleaning_stats = clean_checkpointed(
+            df, settings, checkpoint_dir,
+            chunk_size=chunk_size, resume=resume, profiler=profiler
+        )
+        return df, cleaning_stats.model_copy(update={"row_limit": row_limit, "rows_over_limit": rows_over_limit})
+    
+    if settings.MAX_MEMORY_MB > 0:
+        plan = planner.plan_for_frame(df, settings)
+        if plan.mode != "in_memory":
+            import tempfile
+            from datapurity_core.checkpoint import clean_checkpointed
+            
+            planner.log_plan(plan, f"{len(df)} loaded rows")
+            if provenance is not None:
+                logger.warning("Row provenance is only tracked by the in-memory pipeline")
+            with tempfile.TemporaryDirectory(prefix="datapurity_chunked_") as work_dir:
+                df, cleaning_stats = clean_checkpointed(df, settings, work_dir, chunk_size=plan.chunk_size, profiler=profiler)
+            return df, cleaning_stats.model_copy(update={"row_limit": row_limit, "rows_over_limit": rows_over_limit})
+    
+    profiler = profiler or NULL_PROFILER
+    
+    logger.info("=" * 60)
+    logger.info("Starting contact cleaning pipeline")
+    logger.info(f"Input rows: {len(df)}")
+    
+    # Statistics are accumulated step by step; no copy of the input is kept
+    accumulator = stats.StatsAccumulator()
+    accumulator.observe_input(len(df))
+    rows_original = len(df)
+    
+    if provenance is not None:
+        df = provenance.start(df)
+    
+    # Step 1: Normalize column names
+    profiler.step("normalize_column_names")
+    logger.info("Step 1: Normalizing column names")
+    df = io_utils.normalize_column_names(df, default_country_code=settings.DEFAULT_COUNTRY_CODE)
+    
+    # Step 2: Ensure required columns
+    profiler.step("ensure_columns")
+    logger.info("Step 2: Ensuring required columns")
+    df = ensure_columns(df)
+    
+    # Steps 3-6: Clean text, normalize names, phones and emails
+    df = normalize_contact_fields(df, settings, profiler, step_cache)
+    
+    # Step 7: Mark duplicates
+    profiler.step("mark_duplicates")
+    logger.info("Step 7: Marking duplicates")
+    df = deduplication.mark_duplicates(df, settings, step_cache, provenance)
+    
+    # Step 8: Remove hard duplicates
+    profiler.step("drop_hard_duplicates")
+    logger.info("Step 8: Removing hard duplicates")
+    rows_before_drop = len(df)
+    df = deduplication.drop_hard_duplicates(df)
+    accumulator.observe_deduplicated(len(df))
+    logger.info(f"  - Removed {rows_before_drop - len(df)} hard duplicates")
+    
+    # Steps 9-10: Compute quality scores, remove empty rows
+    rows_before_empty_removal = len(df)
+    index_before_empty_removal = df.index
+    df = score_and_filter(df, settings, profiler)
+    
+    if provenance is not None:
+        provenance.mark_dropped(index_before_empty_removal.difference(df.index), EMPTY)
+        provenance.finish(df.index)
+    
     empty_rows_removed = rows_before_empty_removal - len(df)
     logger.info(f"  - Removed {empty_rows_removed} empty rows")
     
@@ -392,14 +608,24 @@ def clean_contacts_df(df: pd.DataFrame, settings: Settings) -> tuple[pd.DataFram
     rows_final = len(df)
     
     # Step 11: Generate statistics
+    profiler.step("build_stats")
     logger.info("Step 11: Generating statistics")
-    cleaning_stats = stats.build_stats(
-        df_original=df_original,
-        df_after_drop_duplicates=df_after_drop,
-        df_final=df,
-        phone_valid_flags=df["phone_valid"].tolist(),
-        email_valid_flags=df["email_valid"].tolist()
-    )
+    accumulator.observe_final(df)
+    cleaning_stats = accumulator.to_stats()
+    cleaning_stats.row_limit = row_limit
+    cleaning_stats.rows_over_limit = rows_over_limit
+    stats.log_stats(cleaning_stats)
+    
+    # Step 12: Compact dtypes
+    if settings.COMPACT_DTYPES:
+        profiler.step("compact_dtypes")
+        logger.info("Step 12: Compacting output dtypes")
+        memory_before = df.memory_usage(deep=True).sum()
+        df = compact_dtypes(df, settings)
+        memory_after = df.memory_usage(deep=True).sum()
+        logger.info(f"  - Memory: {memory_before / 1024:.1f} KB → {memory_after / 1024:.1f} KB")
+    
+    profiler.finish()
     
     logger.info("=" * 60)
     logger.info("Cleaning pipeline completed")
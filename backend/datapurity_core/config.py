@@ -22,6 +22,10 @@ class Settings(BaseSettings):
         ENABLE_FUZZY_DEDUP: Enable fuzzy deduplication using similarity matching
         FUZZY_NAME_THRESHOLD: Similarity threshold (0-100) for fuzzy name matching
         FUZZY_NAME_COMPANY_THRESHOLD: Similarity threshold for name+company matching
+        COMPACT_DTYPES: Downcast cleaned output columns to compact dtypes
+        CATEGORY_MAX_UNIQUE_RATIO: Max unique/rows ratio for a text column to become categorical
+        MAX_MEMORY_MB: Memory budget used to choose in-memory, chunked or
+            out-of-core execution (0: no budget, always in-memory)
         LOG_LEVEL: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
     """
     
@@ -48,6 +52,13 @@ class Settings(BaseSettings):
     FUZZY_NAME_THRESHOLD: int = 90
     FUZZY_NAME_COMPANY_THRESHOLD: int = 85
     
+    # Output configuration
+    COMPACT_DTYPES: bool = True
+    CATEGORY_MAX_UNIQUE_RATIO: float = 0.5
+    
+    # Execution configuration
+    MAX_MEMORY_MB: int = 0
+    
     # Logging configuration
     LOG_LEVEL: str = "INFO"
     
@@ -0,0 +1,394 @@
+"""
+Dataset Profiles for DataPurity Core
+====================================
+
+One-pass, mergeable profiles of cleaned contact data for dashboards:
+distinct counts (HyperLogLog), top values (frequent-items summary), quality
+score histogram, phone country mix and email domain distribution.
+
+Profiles are built chunk by chunk and combine with `merge`, so chunked,
+parallel and multi-file runs can be profiled without re-reading the data.
+"""
+
+import base64
+import json
+import logging
+from pathlib import Path
+from typing import Any
+import numpy as np
+import pandas as pd
+
+from datapurity_core.models import DatasetProfileReport
+
+logger = logging.getLogger(__name__)
+
+
+# HyperLogLog precision: 2**12 registers, ~1.6% standard error
+HLL_PRECISION = 12
+
+# Counters kept per top-values summary
+TOPK_CAPACITY = 200
+
+# Values reported per column
+TOP_N = 20
+
+# Columns with distinct counts and top values ("email_domain" is derived)
+PROFILE_COLUMNS = ["company", "city", "job_title", "email_domain"]
+
+# Quality score histogram bin edges (last bin includes 100)
+SCORE_BINS = np.arange(0, 101, 10)
+
+
+def _present(values: pd.Series) -> pd.Series:
+    """Non-null, non-empty values as strings (missing optional columns are "")."""
+    values = values.dropna().astype(str)
+    return values[values != ""]
+
+
+def _hash_values(values: pd.Series) -> np.ndarray:
+    """64-bit hashes of the present values, stable across chunks and processes."""
+    return pd.util.hash_array(_present(values).to_numpy(dtype=object))
+
+
+def _bit_length(x: np.ndarray) -> np.ndarray:
+    """Exact bit length of each uint64 (vectorized binary search)."""
+    x = x.copy()
+    length = np.zeros(len(x), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = x >= (np.uint64(1) << np.uint64(shift))
+        length[high] += shift
+        x[high] >>= np.uint64(shift)
+    return length + (x > 0)
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count sketch.
+    
+    Uses 2**precision one-byte registers; sketches merge by element-wise
+    max, so the estimate of a merged sketch equals that of one built on all
+    the data.
+    
+    Example:
+        >>> hll = HyperLogLog()
+        >>> hll.update(df["company"])
+        >>> hll.estimate()
+        1834
+    """
+    
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+    
+    def update(self, values: pd.Series) -> None:
+        """Add the present (non-null, non-empty) values of a Series."""
+        hashes = _hash_values(values)
+        if not len(hashes):
+            return
+        
+        p = np.uint64(self.precision)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.int64)
+        rest = hashes & ((np.uint64(1) << (np.uint64(64) - p)) - np.uint64(1))
+        rank = (64 - self.precision) - _bit_length(rest) + 1
+        
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+    
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Combine another sketch of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+    
+    def estimate(self) -> int:
+        """Estimated number of distinct values."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            return int(round(m * np.log(m / zeros)))
+        return int(round(raw))
+    
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "precision": self.precision,
+            "registers": base64.b64encode(self.registers.tobytes()).decode("ascii"),
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "HyperLogLog":
+        hll = cls(data["precision"])
+        hll.registers[:] = np.frombuffer(base64.b64decode(data["registers"]), dtype=np.uint8)
+        return hll
+
+
+class TopKSketch:
+    """
+    Mergeable frequent-items summary (Misra-Gries form of space-saving).
+    
+    Keeps at most `capacity` counters. When more values compete, the
+    (capacity+1)-th largest count is subtracted from all counters and
+    non-positive ones are dropped; the subtracted amount is added to
+    `error`. Every reported count is a lower bound, at most `error` below
+    the true count, and `error` ≤ total / (capacity + 1).
+    
+    Example:
+        >>> topk = TopKSketch()
+        >>> topk.update(df["city"])
+        >>> topk.top(3)
+        [('Riyadh', 5210), ('Jeddah', 3120), ('Dammam', 1400)]
+    """
+    
+    def __init__(self, capacity: int = TOPK_CAPACITY):
+        self.capacity = capacity
+        self.counts: dict[str, int] = {}
+        self.total = 0
+        self.error = 0
+    
+    def _absorb(self, counts: pd.Series) -> None:
+        combined = pd.Series(self.counts, dtype="int64").add(counts.astype("int64"), fill_value=0)
+        
+        if len(combined) > self.capacity:
+            # Sort by count, then value, so the result does not depend on merge order
+            combined = combined.sort_index().sort_values(ascending=False, kind="stable")
+            cut = int(combined.iloc[self.capacity])
+            combined = combined.iloc[: self.capacity] - cut
+            combined = combined[combined > 0]
+            self.error += cut
+        
+        self.counts = {str(k): int(v) for k, v in combined.items()}
+    
+    def update(self, values: pd.Series) -> None:
+        """Add the present (non-null, non-empty) values of a Series."""
+        values = _present(values)
+        self.total += len(values)
+        if len(values):
+            self._absorb(values.value_counts())
+    
+    def merge(self, other: "TopKSketch") -> "TopKSketch":
+        """Combine another summary into this one."""
+        self.total += other.total
+        self.error += other.error
+        if other.counts:
+            self._absorb(pd.Series(other.counts, dtype="int64"))
+        return self
+    
+    def top(self, n: int = TOP_N) -> list[tuple[str, int]]:
+        """Return up to `n` (value, count) pairs, most frequent first."""
+        ranked = sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:n]
+    
+    def to_dict(self) -> dict[str, Any]:
+        return {"capacity": self.capacity, "counts": self.counts, "total": self.total, "error": self.error}
+    
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TopKSketch":
+        topk = cls(data["capacity"])
+        topk.counts = dict(data["counts"])
+        topk.total = data["total"]
+        topk.error = data["error"]
+        return topk
+
+
+def phone_calling_codes(phones: pd.Series) -> pd.Series:
+    """
+    Country calling code ("+966") of each E.164 phone number.
+    
+    Calling codes are prefix-free, so each number matches at most one code
+    of length 1-3.
+    
+    Args:
+        phones: Normalized phone numbers
+    
+    Returns:
+        Calling codes of the numbers that have one
+    """
+    import phonenumbers
+    
+    digits = phones.dropna().astype(str)
+    digits = digits[digits.str.startswith("+")].str[1:]
+    codes = pd.Series(np.nan, index=digits.index, dtype=object)
+    
+    for length in (1, 2, 3):
+        known = {str(code) for code in phonenumbers.COUNTRY_CODE_TO_REGION_CODE if len(str(code)) == length}
+        prefix = digits.str[:length]
+        codes = codes.where(~prefix.isin(known), "+" + prefix)
+    
+    return codes.dropna()
+
+
+def calling_code_region(calling_code: str) -> str:
+    """Main region of a calling code, e.g. "+966" → "SA" ("+1" → "US")."""
+    import phonenumbers
+    
+    regions = phonenumbers.COUNTRY_CODE_TO_REGION_CODE.get(int(calling_code.lstrip("+")), ())
+    return regions[0] if regions else "ZZ"
+
+
+def email_domains(emails: pd.Series) -> pd.Series:
+    """Lower-cased domain of each email address."""
+    emails = emails.dropna().astype(str)
+    return emails[emails.str.contains("@", regex=False)].str.rsplit("@", n=1).str[-1].str.lower()
+
+
+class DatasetProfile:
+    """
+    One-pass, mergeable profile of cleaned contacts.
+    
+    Example:
+        >>> profile = DatasetProfile()
+        >>> for chunk in chunks:
+        ...     profile.update(chunk)
+        >>> profile.merge(other_worker_profile)
+        >>> report = profile.report()
+        >>> report.distinct_counts["company"]
+        1834
+    """
+    
+    def __init__(self):
+        self.rows = 0
+        self.distinct = {column: HyperLogLog() for column in PROFILE_COLUMNS}
+        self.top = {column: TopKSketch() for column in PROFILE_COLUMNS}
+        self.score_histogram = np.zeros(len(SCORE_BINS) - 1, dtype=np.int64)
+        self.phone_countries: dict[str, int] = {}
+    
+    def update(self, df: pd.DataFrame) -> None:
+        """
+        Fold a chunk of cleaned contacts into the profile.
+        
+        Args:
+            df: Cleaned contacts (output of clean_contacts_df), or a chunk
+        """
+        self.rows += len(df)
+        
+        for column in PROFILE_COLUMNS:
+            if column == "email_domain":
+                values = email_domains(df["email"]) if "email" in df.columns else None
+            else:
+                values = df[column] if column in df.columns else None
+            
+            if values is not None:
+                self.distinct[column].update(values)
+                self.top[column].update(values)
+        
+        if "quality_score" in df.columns:
+            scores = df["quality_score"].dropna().to_numpy(dtype=np.float64)
+            self.score_histogram += np.histogram(scores, bins=SCORE_BINS)[0]
+        
+        if "phone" in df.columns:
+            for code, count in phone_calling_codes(df["phone"]).value_counts().items():
+                self.phone_countries[code] = self.phone_countries.get(code, 0) + int(count)
+    
+    def merge(self, other: "DatasetProfile") -> "DatasetProfile":
+        """
+        Combine another profile (another chunk, sheet, worker or file).
+        
+        Returns:
+            self, for chaining
+        """
+        self.rows += other.rows
+        for column in PROFILE_COLUMNS:
+            self.distinct[column].merge(other.distinct[column])
+            self.top[column].merge(other.top[column])
+        self.score_histogram += other.score_histogram
+        for code, count in other.phone_countries.items():
+            self.phone_countries[code] = self.phone_countries.get(code, 0) + count
+        return self
+    
+    def report(self, top_n: int = TOP_N) -> DatasetProfileReport:
+        """
+        Summarize the profile for display.
+        
+        Args:
+            top_n: Values reported per column
+        
+        Returns:
+            DatasetProfileReport
+        """
+        labels = [f"{int(lo)}-{int(hi) - 1}" for lo, hi in zip(SCORE_BINS[:-1], SCORE_BINS[1:])]
+        labels[-1] = f"{int(SCORE_BINS[-2])}-{int(SCORE_BINS[-1])}"
+        
+        countries = sorted(self.phone_countries.items(), key=lambda item: (-item[1], item[0]))
+        
+        return DatasetProfileReport(
+            rows=self.rows,
+            distinct_counts={column: hll.estimate() for column, hll in self.distinct.items()},
+            top_values={column: topk.top(top_n) for column, topk in self.top.items()},
+            top_values_max_error={column: topk.error for column, topk in self.top.items()},
+            score_histogram=dict(zip(labels, self.score_histogram.tolist())),
+            phone_countries={f"{code} {calling_code_region(code)}": count for code, count in countries}
+        )
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the sketch state (JSON-safe, a few KB per column)."""
+        return {
+            "rows": self.rows,
+            "distinct": {column: hll.to_dict() for column, hll in self.distinct.items()},
+            "top": {column: topk.to_dict() for column, topk in self.top.items()},
+            "score_histogram": self.score_histogram.tolist(),
+            "phone_countries": self.phone_countries,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "DatasetProfile":
+        """Rebuild a profile serialized with to_dict."""
+        profile = cls()
+        profile.rows = data["rows"]
+        profile.distinct = {column: HyperLogLog.from_dict(d) for column, d in data["distinct"].items()}
+        profile.top = {column: TopKSketch.from_dict(d) for column, d in data["top"].items()}
+        profile.score_histogram[:] = data["score_histogram"]
+        profile.phone_countries = dict(data["phone_countries"])
+        return profile
+
+
+def build_dataset_profile(data: pd.DataFrame | list[pd.DataFrame]) -> DatasetProfile:
+    """
+    Build a profile from cleaned contacts.
+    
+    Args:
+        data: Cleaned DataFrame, or an iterable of chunks
+    
+    Returns:
+        DatasetProfile
+    """
+    profile = DatasetProfile()
+    for chunk in [data] if isinstance(data, pd.DataFrame) else data:
+        profile.update(chunk)
+    return profile
+
+
+def save_dataset_profile(profile: DatasetProfile, output_path: str) -> None:
+    """
+    Write the report and the mergeable sketch state to a JSON file.
+    
+    Args:
+        profile: Dataset profile
+        output_path: Path to JSON file
+    """
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    Path(output_path).write_text(
+        json.dumps(
+            {"report": profile.report().model_dump(), "state": profile.to_dict()},
+            ensure_ascii=False,
+            indent=2
+        ),
+        encoding="utf-8"
+    )
+    logger.info(f"Wrote dataset profile to {output_path}")
+
+
+def load_dataset_profile(input_path: str) -> DatasetProfile:
+    """
+    Load a profile written by save_dataset_profile (e.g. to merge it).
+    
+    Args:
+        input_path: Path to JSON file
+    
+    Returns:
+        DatasetProfile
+    """
+    data = json.loads(Path(input_path).read_text(encoding="utf-8"))
+    return DatasetProfile.from_dict(data["state"])
@@ -5,19 +5,295 @@ Deduplication Logic for DataPurity Core
 Functions for detecting and removing duplicate contacts using:
 - Hard deduplication (exact phone/email matches)
 - Fuzzy deduplication (name similarity with RapidFuzz)
+
+Fuzzy matching compares names by a matching key rather than as written:
+Arabic spelling variants (hamza forms of alef, tashkeel, tatweel, alef
+maqsura and taa marbuta) are folded so "أحمد" matches "احمد". The key is
+only used to compare names; the name kept in the output is unchanged.
 """
 
 import logging
 from typing import Any
+import numpy as np
 import pandas as pd
-from rapidfuzz import fuzz
 
 from datapurity_core.config import Settings
+from datapurity_core.step_cache import NULL_STEP_CACHE
+from datapurity_core import provenance as lineage
 
 logger = logging.getLogger(__name__)
 
 
-def mark_duplicates(df: pd.DataFrame, settings: Settings) -> pd.DataFrame:
+# Similarity scores computed per cdist block in fuzzy matching
+FUZZY_BLOCK_CELLS = 4_000_000
+
+# Largest candidate pair list built; denser inputs (many similar names) are
+# matched greedily instead, which never holds more than the duplicates found
+MAX_FUZZY_PAIRS = 2_000_000
+
+# Arabic spelling variants folded in name matching keys
+ARABIC_MATCH_TABLE = str.maketrans({
+    "\u0622": "\u0627",  # alef with madda -> alef
+    "\u0623": "\u0627",  # alef with hamza above -> alef
+    "\u0625": "\u0627",  # alef with hamza below -> alef
+    "\u0671": "\u0627",  # alef wasla -> alef
+    "\u0624": "\u0648",  # waw with hamza -> waw
+    "\u0626": "\u064a",  # yeh with hamza -> yeh
+    "\u0649": "\u064a",  # alef maqsura -> yeh
+    "\u0629": "\u0647",  # taa marbuta -> heh
+    "\u0640": None,       # tatweel
+    **{chr(c): None for c in range(0x064B, 0x0656)},  # tashkeel (fathatan..hamza below)
+    "\u0670": None,       # superscript alef
+})
+
+
+class HardDedupIndex:
+    """
+    Index of phone numbers and emails already seen.
+    
+    Used to extend exact (hard) deduplication across sheets, chunks or files:
+    a row is a duplicate if its phone or email was indexed by an earlier batch.
+    
+    Example:
+        >>> index = HardDedupIndex()
+        >>> index.add(sheet1_df)
+        >>> is_dup = index.match(sheet2_df)
+    """
+    
+    def __init__(self):
+        self.phones: set[str] = set()
+        self.emails: set[str] = set()
+    
+    def __len__(self) -> int:
+        return len(self.phones) + len(self.emails)
+    
+    def match(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Flag rows whose phone or email is already in the index.
+        
+        Args:
+            df: DataFrame with normalized phone/email columns
+            
+        Returns:
+            Boolean Series aligned with df
+        """
+        phone_hit = df["phone"].notna() & df["phone"].isin(self.phones)
+        email_hit = df["email"].notna() & df["email"].isin(self.emails)
+        return phone_hit | email_hit
+    
+    def add(self, df: pd.DataFrame) -> None:
+        """
+        Add the phones and emails of a DataFrame to the index.
+        
+        Args:
+            df: DataFrame with normalized phone/email columns
+        """
+        self.phones.update(df["phone"].dropna())
+        self.emails.update(df["email"].dropna())
+
+
+def name_match_keys(names: pd.Series) -> pd.Series:
+    """
+    Return the fuzzy matching key of each name.
+    
+    Keys fold Arabic spelling variants with ARABIC_MATCH_TABLE in one
+    vectorized translate; other characters are kept as they are.
+    
+    Args:
+        names: Names as written
+        
+    Returns:
+        Series of keys aligned with names
+        
+    Example:
+        >>> name_match_keys(pd.Series(["أحمد", "فاطمة", "مُصْطَفَى"])).tolist()
+        ['احمد', 'فاطمه', 'مصطفي']
+    """
+    return names.str.translate(ARABIC_MATCH_TABLE)
+
+
+def _length_window(
+    sorted_lengths: np.ndarray,
+    shortest: int,
+    longest: int,
+    score_cutoff: float
+) -> tuple[int, int]:
+    """Return the slice of `sorted_lengths` that names of these lengths can match."""
+    if score_cutoff <= 0:
+        return 0, len(sorted_lengths)
+    low = shortest * score_cutoff / (200 - score_cutoff)
+    high = longest * (200 - score_cutoff) / score_cutoff
+    return (
+        int(np.searchsorted(sorted_lengths, low - 1e-9, side="left")),
+        int(np.searchsorted(sorted_lengths, high + 1e-9, side="right"))
+    )
+
+
+def length_blocked_cdist(
+    queries: list[str],
+    choices: list[str],
+    score_cutoff: float,
+    same: bool = False,
+    choice_lengths: np.ndarray | None = None
+):
+    """
+    Compare names in blocks, each only with the choices its lengths can reach.
+    
+    fuzz.ratio(a, b) is at most 200 * len(a) / (len(a) + len(b)) for
+    len(a) <= len(b), so with both lists sorted by length a block of queries
+    only needs the window of choice lengths within that bound. Blocks are
+    sized so each cdist matrix holds about FUZZY_BLOCK_CELLS scores.
+    
+    Args:
+        queries: Names (or matching keys) to look up
+        choices: Names to compare them with
+        score_cutoff: Minimum fuzz.ratio similarity (0-100); lower scores are 0
+        same: queries and choices are the same list; each block's window
+            then starts at the block itself, so np.triu(scores, k=1) holds
+            every pair once
+        choice_lengths: Precomputed lengths of `choices`
+    
+    Yields:
+        Tuple of (query positions, choice positions, scores): positions into
+        `queries` and `choices` of a block and its window, and their cdist
+        score matrix
+    """
+    from rapidfuzz import fuzz, process
+    
+    query_lengths = np.fromiter(map(len, queries), dtype=np.int64, count=len(queries))
+    query_order = np.argsort(query_lengths, kind="stable")
+    sorted_query_lengths = query_lengths[query_order]
+    sorted_queries = [queries[k] for k in query_order]
+    
+    if same:
+        choice_order, sorted_choice_lengths, sorted_choices = query_order, sorted_query_lengths, sorted_queries
+    else:
+        if choice_lengths is None:
+            choice_lengths = np.fromiter(map(len, choices), dtype=np.int64, count=len(choices))
+        choice_order = np.argsort(choice_lengths, kind="stable")
+        sorted_choice_lengths = choice_lengths[choice_order]
+        sorted_choices = [choices[k] for k in choice_order]
+    
+    start = 0
+    while start < len(queries):
+        # Size the block from the window of its first (shortest) query
+        low, high = _length_window(sorted_choice_lengths, sorted_query_lengths[start], sorted_query_lengths[start], score_cutoff)
+        block_rows = max(1, FUZZY_BLOCK_CELLS // max(high - low, 1))
+        stop = min(start + block_rows, len(queries))
+        
+        low, high = _length_window(
+            sorted_choice_lengths, sorted_query_lengths[start], sorted_query_lengths[stop - 1], score_cutoff
+        )
+        if same:
+            # Shorter names were compared with this block in earlier blocks
+            low, high = start, max(stop, high)
+        
+        if high > low:
+            matrix = process.cdist(
+                sorted_queries[start:stop], sorted_choices[low:high],
+                scorer=fuzz.ratio, score_cutoff=score_cutoff, dtype=np.float64
+            )
+            yield query_order[start:stop], choice_order[low:high], matrix
+        
+        start = stop
+
+
+def fuzzy_candidate_pairs(
+    names: list[str],
+    score_cutoff: float,
+    max_pairs: int | None = None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray] | None:
+    """
+    Find every pair of names whose similarity is at least `score_cutoff`.
+    
+    Names are compared in length blocks (see length_blocked_cdist), so each
+    name is only scored against the names whose lengths can reach the
+    cutoff and memory stays at about FUZZY_BLOCK_CELLS scores per block.
+    
+    Args:
+        names: Names (or matching keys) to compare
+        score_cutoff: Minimum fuzz.ratio similarity (0-100)
+        max_pairs: Give up once more pairs than this are found
+        
+    Returns:
+        Tuple of (first, second, scores): positions i < j into `names` in
+        (i, j) order, and their similarities; None if there are more than
+        `max_pairs` pairs
+    """
+    first, second, scores = [], [], []
+    found = 0
+    
+    for query_positions, choice_positions, matrix in length_blocked_cdist(names, names, score_cutoff, same=True):
+        rows, cols = np.nonzero(np.triu(matrix >= score_cutoff, k=1))
+        
+        found += len(rows)
+        if max_pairs is not None and found > max_pairs:
+            return None
+        
+        a = query_positions[rows]
+        b = choice_positions[cols]
+        first.append(np.minimum(a, b))
+        second.append(np.maximum(a, b))
+        scores.append(matrix[rows, cols])
+    
+    if not first:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+    
+    first, second, scores = np.concatenate(first), np.concatenate(second), np.concatenate(scores)
+    
+    # Back to (i, j) order for the greedy replay
+    pair_order = np.lexsort((second, first))
+    return first[pair_order], second[pair_order], scores[pair_order]
+
+
+def fuzzy_duplicate_pairs(names: list[str], threshold: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find the fuzzy duplicates among names, comparing each name with every later one.
+    
+    A name that matched an earlier name is a duplicate and is neither compared
+    nor matched again, so dense inputs (many similar names) shrink as they
+    are processed instead of producing every similar pair.
+    
+    Args:
+        names: Names to compare
+        threshold: Minimum fuzz.ratio similarity (0-100)
+        
+    Returns:
+        Tuple of (first, second, scores): for each duplicate `second`, the
+        earlier name `first` it matched and their similarity, in (i, j) order
+    """
+    from rapidfuzz import fuzz, process
+    
+    marked = np.zeros(len(names), dtype=bool)
+    block_rows = max(1, FUZZY_BLOCK_CELLS // max(len(names), 1))
+    first, second, scores = [], [], []
+    
+    for start in range(0, len(names), block_rows):
+        stop = min(start + block_rows, len(names))
+        block = np.flatnonzero(~marked[start:stop]) + start
+        columns = np.flatnonzero(~marked[start:]) + start
+        if len(block) == 0:
+            continue
+        
+        matrix = process.cdist(
+            [names[i] for i in block], [names[j] for j in columns],
+            scorer=fuzz.ratio, score_cutoff=threshold, dtype=np.float64
+        )
+        
+        for row, i in enumerate(block):
+            if marked[i]:
+                continue
+            hits = (matrix[row] >= threshold) & (columns > i) & ~marked[columns]
+            for col in np.flatnonzero(hits):
+                first.append(i)
+                second.append(columns[col])
+                scores.append(matrix[row, col])
+            marked[columns[hits]] = True
+    
+    return np.asarray(first, dtype=np.int64), np.asarray(second, dtype=np.int64), np.asarray(scores, dtype=np.float64)
+
+
+def mark_duplicates(df: pd.DataFrame, settings: Settings, step_cache=None, provenance=None) -> pd.DataFrame:
     """
     Mark duplicates in DataFrame using both hard and fuzzy matching.
     
@@ -26,7 +302,7 @@ def mark_duplicates(df: pd.DataFrame, settings: Settings) -> pd.DataFrame:
     - Same email address
     
     Fuzzy duplicates:
-    - Similar names (using Levenshtein ratio)
+    - Similar names (using Levenshtein ratio on name_match_keys)
     - Threshold controlled by settings
     
     Adds columns:
@@ -37,6 +313,10 @@ def mark_duplicates(df: pd.DataFrame, settings: Settings) -> pd.DataFrame:
     Args:
         df: Input DataFrame
         settings: Configuration settings
+        step_cache: Optional step_cache.StepCache for the fuzzy pair list
+        provenance: Optional provenance.RowProvenance; records each
+            duplicate's reason and the row it duplicates (df must be indexed
+            by source row)
         
     Returns:
         DataFrame with duplicate flags
@@ -51,6 +331,7 @@ def mark_duplicates(df: pd.DataFrame, settings: Settings) -> pd.DataFrame:
         [False, True]
     """
     logger.info("Marking duplicates")
+    step_cache = step_cache or NULL_STEP_CACHE
     
     # Initialize duplicate columns
     df["is_duplicate"] = False
@@ -78,6 +359,8 @@ def mark_duplicates(df: pd.DataFrame, settings: Settings) -> pd.DataFrame:
                     df.at[idx, "duplicate_group_id"] = group_counter
                     df.at[idx, "duplicate_reason"] = f"phone:{phone}"
                     marked.add(idx)
+                    if provenance is not None:
+                        provenance.mark_duplicate(idx, first_idx, lineage.DUPLICATE_PHONE)
             
             # Also assign group ID to first occurrence (even though not marked as duplicate)
             df.at[first_idx, "duplicate_group_id"] = group_counter
@@ -105,6 +388,8 @@ def mark_duplicates(df: pd.DataFrame, settings: Settings) -> pd.DataFrame:
                     df.at[idx, "duplicate_reason"] = f"email:{email}"
                     marked.add(idx)
                     email_marked_count += 1
+                    if provenance is not None:
+                        provenance.mark_duplicate(idx, first_idx, lineage.DUPLICATE_EMAIL)
             
             # Also assign group ID to first occurrence
             if df.at[first_idx, "duplicate_group_id"] is None:
@@ -128,36 +413,50 @@ def mark_duplicates(df: pd.DataFrame, settings: Settings) -> pd.DataFrame:
         ]
         
         if len(valid_names_df) > 1:
-            # Compare each pair
-            names = valid_names_df["name"].tolist()
+            # Compare matching keys; the names themselves are left as written
+            names = name_match_keys(valid_names_df["name"]).tolist()
             indices = valid_names_df.index.tolist()
             
-            for i in range(len(names)):
-                if indices[i] in marked:
+            threshold = settings.FUZZY_NAME_THRESHOLD
+            
+            # Pairs are cached down to the floor, so another threshold only re-filters them
+            score_cutoff = min(threshold, step_cache.fuzzy_pair_floor)
+            pairs = step_cache.cached(
+                "fuzzy_pairs", names, {"score_cutoff": score_cutoff},
+                lambda: fuzzy_candidate_pairs(names, score_cutoff, max_pairs=MAX_FUZZY_PAIRS)
+            )
+            if pairs is None:
+                pairs = step_cache.cached(
+                    "fuzzy_duplicates", names, {"threshold": threshold},
+                    lambda: fuzzy_duplicate_pairs(names, threshold)
+                )
+            first, second, scores = pairs
+            
+            # Pairs come in (i, j) order: replaying them greedily marks the
+            # same rows as comparing each name with every later name
+            for i, j, similarity in zip(first.tolist(), second.tolist(), scores.tolist()):
+                if similarity < settings.FUZZY_NAME_THRESHOLD:
+                    continue
+                
+                idx_i = indices[i]
+                idx_j = indices[j]
+                if idx_i in marked or idx_j in marked:
                     continue
                 
-                for j in range(i + 1, len(names)):
-                    if indices[j] in marked:
-                        continue
-                    
-                    # Calculate similarity
-                    similarity = fuzz.ratio(names[i], names[j])
-                    
-                    if similarity >= settings.FUZZY_NAME_THRESHOLD:
-                        # Mark second as duplicate
-                        idx_j = indices[j]
-                        df.at[idx_j, "is_duplicate"] = True
-                        df.at[idx_j, "duplicate_group_id"] = group_counter
-                        df.at[idx_j, "duplicate_reason"] = f"fuzzy_name:{similarity}%"
-                        marked.add(idx_j)
-                        fuzzy_marked_count += 1
-                        
-                        # Assign group to first if needed
-                        idx_i = indices[i]
-                        if df.at[idx_i, "duplicate_group_id"] is None:
-                            df.at[idx_i, "duplicate_group_id"] = group_counter
-                        
-                        group_counter += 1
+                # Mark second as duplicate
+                df.at[idx_j, "is_duplicate"] = True
+                df.at[idx_j, "duplicate_group_id"] = group_counter
+                df.at[idx_j, "duplicate_reason"] = f"fuzzy_name:{similarity}%"
+                marked.add(idx_j)
+                fuzzy_marked_count += 1
+                if provenance is not None:
+                    provenance.mark_duplicate(idx_j, idx_i, lineage.DUPLICATE_NAME)
+                
+                # Assign group to first if needed
+                if df.at[idx_i, "duplicate_group_id"] is None:
+                    df.at[idx_i, "duplicate_group_id"] = group_counter
+                
+                group_counter += 1
         
         logger.info(f"  - Found {fuzzy_marked_count} fuzzy name duplicates")
     
@@ -0,0 +1,282 @@
+"""
+External Deduplication for DataPurity Core
+==========================================
+
+Hard (phone/email) deduplication of inputs whose dedup index does not fit in
+memory. Normalized keys are hash-partitioned into on-disk partition files,
+each partition is deduplicated on its own, and the resulting duplicate marks
+are routed back to the row range they belong to:
+
+1. Stream the input; normalize each range, spill it to disk, and append its
+   (key, row) pairs to the partition chosen by the key's hash
+2. Per partition: the first row of each key is its anchor; every later row
+   with the key is a duplicate of it
+3. Stream the ranges again, apply their marks, score, filter and write
+
+Memory is bounded by one range plus one partition. Decisions match the
+in-memory hard dedup exactly: a row is a phone duplicate if any earlier row
+had its phone, otherwise an email duplicate if any earlier row had its email
+(dropped rows included). Fuzzy name matching needs every retained name and
+is not done in this mode.
+"""
+
+import logging
+import pickle
+import tempfile
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from datapurity_core.config import Settings
+from datapurity_core.models import CleaningStats
+from datapurity_core import cleaning, io_utils, stats
+from datapurity_core.checkpoint import iter_input_ranges
+from datapurity_core.profiling import NULL_PROFILER
+
+logger = logging.getLogger(__name__)
+
+
+# Partition files the key index is spread over
+DEFAULT_PARTITIONS = 64
+
+# Kinds of key pairs and duplicate marks
+KIND_PHONE = 0
+KIND_EMAIL = 1
+KIND_ANCHOR = 2
+
+RANGE_PATTERN = "range_{:06d}.pkl"
+PARTITION_PATTERN = "keys_{:04d}.pkl"
+MARKS_PATTERN = "marks_{:06d}.pkl"
+
+
+def _append_frame(path: Path, frame: pd.DataFrame) -> None:
+    """Append a frame to a file of concatenated pickles."""
+    with open(path, "ab") as f:
+        pickle.dump(frame, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _read_frames(path: Path, columns: list[str]) -> pd.DataFrame:
+    """Read and concatenate every frame appended to a file."""
+    frames = []
+    if path.exists():
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    frames.append(pickle.load(f))
+                except EOFError:
+                    break
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+def key_pairs(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return the (kind, key, row) pairs of a normalized range.
+    
+    Args:
+        chunk: Normalized range indexed by global row number
+    
+    Returns:
+        DataFrame with kind (KIND_PHONE/KIND_EMAIL), key and row columns
+    """
+    frames = []
+    for kind, column in ((KIND_PHONE, "phone"), (KIND_EMAIL, "email")):
+        values = chunk[column].dropna()
+        frames.append(pd.DataFrame({
+            "kind": np.full(len(values), kind, dtype=np.int8),
+            "key": values.astype(object).to_numpy(),
+            "row": values.index.to_numpy(dtype=np.int64),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def partition_of(keys: pd.Series, partitions: int) -> np.ndarray:
+    """Return the partition number of each key (stable across runs)."""
+    return (pd.util.hash_array(keys.to_numpy(dtype=object)) % np.uint64(partitions)).astype(np.int64)
+
+
+def dedup_partition(pairs: pd.DataFrame) -> pd.DataFrame:
+    """
+    Find the duplicates among the key pairs of one partition.
+    
+    Every key lives in exactly one partition, so the first row per key here
+    is its first row in the whole input.
+    
+    Args:
+        pairs: (kind, key, row) pairs
+    
+    Returns:
+        Marks with row, kind and anchor columns: one KIND_PHONE/KIND_EMAIL
+        mark per duplicate row and key kind, and one KIND_ANCHOR mark per
+        anchor row
+    """
+    anchors = pairs.groupby(["kind", "key"], sort=False)["row"].transform("min")
+    is_duplicate = pairs["row"] != anchors
+    
+    duplicates = pd.DataFrame({
+        "row": pairs["row"][is_duplicate],
+        "kind": pairs["kind"][is_duplicate],
+        "anchor": anchors[is_duplicate],
+    })
+    anchor_rows = np.unique(anchors[is_duplicate].to_numpy())
+    anchor_marks = pd.DataFrame({
+        "row": anchor_rows,
+        "kind": np.full(len(anchor_rows), KIND_ANCHOR, dtype=np.int8),
+        "anchor": anchor_rows,
+    })
+    
+    return pd.concat([duplicates, anchor_marks], ignore_index=True)
+
+
+def apply_marks(chunk: pd.DataFrame, marks: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the is_duplicate, duplicate_group_id and duplicate_reason columns.
+    
+    A row's phone anchor wins over its email anchor, as in mark_duplicates.
+    Duplicate groups are identified by their anchor's input row number.
+    
+    Args:
+        chunk: Normalized range indexed by global row number
+        marks: Marks of the range (see dedup_partition)
+    
+    Returns:
+        Marked range
+    """
+    def anchor_of(kind: int) -> pd.Series:
+        kind_marks = marks[marks["kind"] == kind].drop_duplicates("row")
+        return pd.Series(kind_marks["anchor"].to_numpy(), index=kind_marks["row"].to_numpy()).reindex(chunk.index)
+    
+    phone_anchor = anchor_of(KIND_PHONE)
+    email_anchor = anchor_of(KIND_EMAIL)
+    anchor = phone_anchor.fillna(email_anchor)
+    is_anchor = chunk.index.isin(marks.loc[marks["kind"] == KIND_ANCHOR, "row"])
+    
+    # Duplicates join their anchor's group; anchors head their own
+    group_ids = anchor.fillna(pd.Series(chunk.index, index=chunk.index).where(is_anchor))
+    
+    chunk["is_duplicate"] = anchor.notna().to_numpy()
+    chunk["duplicate_group_id"] = pd.Series(
+        [None if pd.isna(group_id) else int(group_id) for group_id in group_ids],
+        index=chunk.index,
+        dtype=object
+    )
+    chunk["duplicate_reason"] = np.where(
+        phone_anchor.notna(), "phone:" + chunk["phone"].astype(str),
+        np.where(email_anchor.notna(), "email:" + chunk["email"].astype(str), "")
+    )
+    
+    return chunk
+
+
+def clean_file_external(
+    input_path: str,
+    output_paths: list[str],
+    settings: Settings,
+    chunk_size: int = io_utils.DEFAULT_CHUNK_SIZE,
+    partitions: int = DEFAULT_PARTITIONS,
+    sheet_name: str | None = None,
+    stats_path: str | None = None,
+    work_dir: str | None = None,
+    profiler=None
+) -> CleaningStats:
+    """
+    Clean a file with hard dedup through on-disk key partitions.
+    
+    For inputs where even the phone/email index does not fit in memory.
+    Rows and hard-duplicate decisions are the same as clean_contacts_df with
+    fuzzy dedup disabled; columns keep their plain dtypes.
+    
+    Args:
+        input_path: Path to input file
+        output_paths: Output files (.csv, .xlsx, .parquet, .jsonl, .vcf)
+        settings: Configuration settings (ENABLE_FUZZY_DEDUP is ignored)
+        chunk_size: Rows per range
+        partitions: Number of key partition files; each partition holds
+            about 1/partitions of the index
+        sheet_name: Excel sheet to read (default: first sheet)
+        stats_path: Optional JSON stats file
+        work_dir: Directory for spill files (default: a temporary directory)
+        profiler: Optional profiling.PipelineProfiler
+    
+    Returns:
+        CleaningStats
+    
+    Example:
+        >>> stats = clean_file_external("huge.csv.gz", ["clean.parquet"], settings, partitions=256)
+    """
+    from datapurity_core.writers import MultiFormatWriter
+    
+    profiler = profiler or NULL_PROFILER
+    
+    if settings.ENABLE_FUZZY_DEDUP:
+        logger.warning("Fuzzy dedup is not supported with external dedup; only phone/email duplicates are removed")
+    
+    with tempfile.TemporaryDirectory(prefix="datapurity_external_", dir=work_dir) as tmp_dir:
+        work_path = Path(tmp_dir)
+        starts = []
+        
+        # Pass 1: normalize and spill ranges, partition their keys
+        for chunk in iter_input_ranges(input_path, chunk_size, sheet_name, profiler, settings.DEFAULT_COUNTRY_CODE):
+            logger.info(f"Normalizing rows {chunk.index[0]}-{chunk.index[-1]}")
+            chunk = cleaning.normalize_contact_fields(chunk, settings, profiler)
+            
+            profiler.step("partition_keys")
+            pairs = key_pairs(chunk)
+            for partition, part in pairs.groupby(partition_of(pairs["key"], partitions)):
+                _append_frame(work_path / PARTITION_PATTERN.format(partition), part)
+            
+            _append_frame(work_path / RANGE_PATTERN.format(len(starts)), chunk)
+            starts.append(chunk.index[0])
+        
+        # Pass 2: dedup each partition, route marks to their ranges
+        profiler.step("dedup_partitions")
+        starts = np.asarray(starts, dtype=np.int64)
+        marked = 0
+        for partition in range(partitions):
+            path = work_path / PARTITION_PATTERN.format(partition)
+            if not path.exists():
+                continue
+            
+            marks = dedup_partition(_read_frames(path, ["kind", "key", "row"]))
+            path.unlink()
+            marked += int((marks["kind"] != KIND_ANCHOR).sum())
+            
+            range_numbers = np.searchsorted(starts, marks["row"].to_numpy(), side="right") - 1
+            for range_number, range_marks in marks.groupby(range_numbers):
+                _append_frame(work_path / MARKS_PATTERN.format(range_number), range_marks)
+        
+        logger.info(f"Deduplicated {partitions} partitions: {marked} duplicate key marks")
+        
+        # Pass 3: apply marks, score, filter and write
+        accumulator = stats.StatsAccumulator()
+        rows_written = 0
+        
+        with MultiFormatWriter(output_paths, stats_path=stats_path) as writer:
+            for range_number in range(len(starts)):
+                profiler.step("drop_hard_duplicates")
+                chunk = _read_frames(work_path / RANGE_PATTERN.format(range_number), [])
+                chunk.index = pd.RangeIndex(starts[range_number], starts[range_number] + len(chunk))
+                marks = _read_frames(work_path / MARKS_PATTERN.format(range_number), ["row", "kind", "anchor"])
+                chunk = apply_marks(chunk, marks)
+                
+                after_drop = chunk[~chunk["is_duplicate"]].copy()
+                final = cleaning.score_and_filter(after_drop, settings, profiler)
+                
+                accumulator.observe_input(len(chunk))
+                accumulator.observe_deduplicated(len(after_drop))
+                accumulator.observe_final(final)
+                
+                profiler.step("save_output")
+                final = final.reset_index(drop=True)
+                final["id"] = final.index + rows_written
+                rows_written += len(final)
+                writer.write(final)
+            
+            cleaning_stats = accumulator.to_stats()
+            writer.stats = cleaning_stats
+    
+    stats.log_stats(cleaning_stats)
+    profiler.finish()
+    
+    logger.info(f"External dedup cleaning completed: {cleaning_stats.rows_final} rows (from {cleaning_stats.rows_original})")
+    
+    return cleaning_stats
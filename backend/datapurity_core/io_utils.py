@@ -5,8 +5,22 @@ I/O Utilities for DataPurity Core
 Functions for loading and saving contact files (Excel, CSV) and normalizing column names.
 """
 
+import bz2
+import codecs
+import csv
+import gzip
+import io
 import logging
+import lzma
+import re
+import shutil
+import tempfile
+import zipfile
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from functools import partial
 from pathlib import Path
+from typing import Any, BinaryIO
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
@@ -20,6 +34,7 @@ COLUMN_MAPPINGS = {
     ],
     "phone": [
         "phone", "mobile", "mobile_phone", "tel", "telephone", "cell", "phone_number",
+        "mobile no", "mobile number", "phone no", "contact number", "whatsapp",
         "الجوال", "رقم الجوال", "رقم الهاتف", "جوال", "موبايل", "هاتف"
     ],
     "email": [
@@ -45,6 +60,964 @@ COLUMN_MAPPINGS = {
 }
 
 
+# Rows sampled per column when inferring a mapping from content
+COLUMN_SAMPLE_ROWS = 200
+
+# Minimum confidence (lower bound on the share of sampled values that look
+# like a field) required to map it
+MIN_CONTENT_CONFIDENCE = 0.8
+
+# z-score of the Wilson lower bound used as content confidence, so small
+# samples are never as confident as large ones (2 matching values: 0.34,
+# 20: 0.84, 200: 0.98)
+CONTENT_CONFIDENCE_Z = 1.96
+
+# Country used to validate phone-like values when none is given
+DEFAULT_INFER_COUNTRY = "SA"
+
+EMAIL_LIKE_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+ARABIC_WORD_PATTERN = re.compile(r"^[\u0621-\u064A\u0671-\u06D3]+$")
+LATIN_WORD_PATTERN = re.compile(r"^[A-Za-z][A-Za-z'.-]*$")
+
+# Words that mark an organization rather than a person
+COMPANY_MARKERS = {
+    "شركة", "مؤسسة", "مجموعة", "مكتب", "company", "co", "ltd", "inc", "llc", "est", "group"
+}
+
+# Number of leading bytes inspected when sniffing CSV encoding and delimiter
+SNIFF_SAMPLE_BYTES = 64 * 1024
+
+# Candidate CSV delimiters, in order of preference
+CSV_DELIMITERS = [",", ";", "\t", "|"]
+
+# Byte-order marks and the encodings they imply
+BOM_ENCODINGS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+# Fallback for non-UTF-8 files (Windows Arabic)
+FALLBACK_ENCODING = "cp1256"
+
+# Rows per DataFrame chunk yielded by the streaming readers
+DEFAULT_CHUNK_SIZE = 50_000
+
+EXCEL_SUFFIXES = [".xlsx", ".xlsm", ".xls"]
+PARQUET_SUFFIXES = [".parquet", ".pq"]
+ARROW_SUFFIXES = [".feather", ".arrow", ".ipc"]
+
+# Compressed/archive suffixes and their codecs
+COMPRESSION_SUFFIXES = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zst": "zstd",
+    ".zip": "zip",
+}
+
+# Copy buffer used when spilling random-access formats out of a compressed stream
+SPILL_BUFFER_BYTES = 1024 * 1024
+
+# Block size for the multi-threaded pyarrow CSV reader
+ARROW_CSV_BLOCK_SIZE = 8 * 1024 * 1024
+
+# Columnar output defaults
+DEFAULT_COMPRESSION = "zstd"
+DEFAULT_ROW_GROUP_SIZE = 100_000
+
+# Codecs each columnar format supports ("none" writes uncompressed)
+PARQUET_CODECS = ["zstd", "snappy", "lz4", "gzip", "brotli", "none"]
+ARROW_CODECS = ["zstd", "lz4", "none"]
+
+# Rows per worksheet Excel can hold (header included)
+EXCEL_MAX_ROWS = 1_048_576
+
+# Block size for counting CSV rows without parsing
+COUNT_BLOCK_BYTES = 8 * 1024 * 1024
+
+# What to do with inputs over a row limit
+ROW_LIMIT_ACTIONS = ["error", "truncate"]
+
+
+class RowLimitExceededError(ValueError):
+    """
+    Raised when an input has more rows than allowed (e.g. a plan's records per file).
+    
+    Attributes:
+        source: Input file path (or "DataFrame")
+        max_rows: The row limit
+        rows: Rows in the input, if known
+    """
+    
+    def __init__(self, source: str, max_rows: int, rows: int | None = None):
+        self.source = source
+        self.max_rows = max_rows
+        self.rows = rows
+        found = f"{rows} rows" if rows is not None else f"more than {max_rows} rows"
+        super().__init__(f"{source} has {found}; the limit is {max_rows} rows")
+
+
+def _require_pyarrow():
+    """Import pyarrow, with a clear error if the optional dependency is missing."""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required for Parquet/Arrow files: pip install pyarrow"
+        ) from e
+    return pyarrow
+
+
+def _supported_formats() -> str:
+    formats = ", ".join(EXCEL_SUFFIXES + [".csv"] + PARQUET_SUFFIXES + ARROW_SUFFIXES)
+    return f"{formats} (optionally compressed: {', '.join(COMPRESSION_SUFFIXES)})"
+
+
+def split_compression_suffix(input_path: str) -> tuple[str, str | None]:
+    """
+    Split a file name into its data format suffix and compression codec.
+    
+    Args:
+        input_path: Path to input file
+        
+    Returns:
+        Tuple of (data_suffix, compression); compression is None for plain files
+        
+    Example:
+        >>> split_compression_suffix("contacts.csv.gz")
+        ('.csv', 'gzip')
+        >>> split_compression_suffix("uploads.zip")
+        ('', 'zip')
+    """
+    suffixes = [suffix.lower() for suffix in Path(input_path).suffixes]
+    
+    if not suffixes:
+        return ("", None)
+    
+    if suffixes[-1] in COMPRESSION_SUFFIXES:
+        compression = COMPRESSION_SUFFIXES[suffixes[-1]]
+        data_suffix = suffixes[-2] if len(suffixes) > 1 and compression != "zip" else ""
+        return (data_suffix, compression)
+    
+    return (suffixes[-1], None)
+
+
+def open_decompressed(input_path: str, compression: str) -> BinaryIO:
+    """
+    Open a compressed file as a streaming binary reader.
+    
+    Bytes are decompressed incrementally as they are read.
+    
+    Args:
+        input_path: Path to compressed file
+        compression: "gzip", "bz2", "xz" or "zstd"
+        
+    Returns:
+        Readable binary file object
+    """
+    if compression == "gzip":
+        return gzip.open(input_path, "rb")
+    if compression == "bz2":
+        return bz2.open(input_path, "rb")
+    if compression == "xz":
+        return lzma.open(input_path, "rb")
+    if compression == "zstd":
+        try:
+            from compression import zstd  # Python 3.14+
+            return zstd.open(input_path, "rb")
+        except ImportError:
+            pass
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                "zstandard is required for .zst files: pip install zstandard"
+            ) from e
+        return zstandard.open(input_path, "rb")
+    
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+def detect_encoding(sample: bytes) -> str:
+    """
+    Detect text encoding from the leading bytes of a file.
+    
+    Checks for a byte-order mark first, then whether the sample is valid
+    UTF-8 (ignoring a multi-byte character cut off at the end of the sample),
+    and otherwise falls back to Windows-1256 (Arabic).
+    
+    Args:
+        sample: Leading bytes of the file
+        
+    Returns:
+        Encoding name usable by pandas/codecs
+        
+    Example:
+        >>> detect_encoding(codecs.BOM_UTF8 + b"name,phone")
+        'utf-8-sig'
+        >>> detect_encoding("الاسم".encode("cp1256"))
+        'cp1256'
+    """
+    for bom, encoding in BOM_ENCODINGS:
+        if sample.startswith(bom):
+            return encoding
+    
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING
+    
+    return "utf-8"
+
+
+def detect_delimiter(text: str) -> str:
+    """
+    Detect the CSV delimiter from a decoded text sample.
+    
+    Args:
+        text: Decoded leading text of the file
+        
+    Returns:
+        Delimiter character (defaults to ",")
+        
+    Example:
+        >>> detect_delimiter("name;phone\nAhmed;0501234567\n")
+        ';'
+    """
+    lines = text.splitlines()
+    
+    # Drop a trailing line that may have been cut off by the sample size
+    if len(lines) > 1 and not text.endswith(("\n", "\r")):
+        lines = lines[:-1]
+    
+    lines = lines[:50]
+    if not lines:
+        return ","
+    
+    try:
+        dialect = csv.Sniffer().sniff("\n".join(lines), delimiters="".join(CSV_DELIMITERS))
+        return dialect.delimiter
+    except csv.Error:
+        pass
+    
+    # Fall back to the most frequent candidate in the header line
+    header = lines[0]
+    best = max(CSV_DELIMITERS, key=header.count)
+    
+    return best if header.count(best) > 0 else ","
+
+
+def sniff_csv_format(input_path: str) -> tuple[str, str]:
+    """
+    Sniff encoding and delimiter of a CSV file from its first few KB.
+    
+    Only SNIFF_SAMPLE_BYTES are read, so the full file is parsed exactly once
+    afterwards with the detected options.
+    
+    Args:
+        input_path: Path to CSV file
+        
+    Returns:
+        Tuple of (encoding, delimiter)
+        
+    Example:
+        >>> sniff_csv_format("contacts.csv")
+        ('utf-8-sig', ';')
+    """
+    with open(input_path, "rb") as f:
+        sample = f.read(SNIFF_SAMPLE_BYTES)
+    
+    return sniff_csv_sample(sample)
+
+
+def sniff_csv_sample(sample: bytes) -> tuple[str, str]:
+    """
+    Sniff encoding and delimiter from the leading bytes of a CSV stream.
+    
+    Args:
+        sample: Leading bytes (up to SNIFF_SAMPLE_BYTES)
+        
+    Returns:
+        Tuple of (encoding, delimiter)
+    """
+    encoding = detect_encoding(sample)
+    text = sample.decode(encoding, errors="ignore")
+    delimiter = detect_delimiter(text)
+    
+    logger.info(f"Sniffed CSV format: encoding={encoding}, delimiter={delimiter!r}")
+    
+    return (encoding, delimiter)
+
+
+class _Utf8FallbackReader(io.TextIOBase):
+    """
+    Text view of a binary stream: UTF-8, switching to FALLBACK_ENCODING for
+    the rest of the stream at the first byte that is not valid UTF-8.
+    
+    The switch happens at that byte offset, so every record is read once
+    whatever quoted multi-line fields come before it.
+    """
+    
+    def __init__(self, raw: BinaryIO, block_bytes: int = 1024 * 1024):
+        self._raw = raw
+        self._block_bytes = block_bytes
+        self._pending = b""
+        self._buffer = ""
+        self._eof = False
+        self.fallback_offset: int | None = None
+        self._offset = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def _decode(self, data: bytes, final: bool) -> str:
+        if self.fallback_offset is not None:
+            return data.decode(FALLBACK_ENCODING)
+        try:
+            text, consumed = codecs.utf_8_decode(data, "strict", final)
+        except UnicodeDecodeError as e:
+            self.fallback_offset = self._offset + e.start
+            logger.warning(f"Input is not valid UTF-8 at byte {self.fallback_offset}; reading the rest as {FALLBACK_ENCODING}")
+            return data[:e.start].decode("utf-8") + data[e.start:].decode(FALLBACK_ENCODING)
+        self._pending = data[consumed:]
+        self._offset += consumed
+        return text
+    
+    def _fill(self, size: int) -> None:
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            block = self._raw.read(self._block_bytes)
+            self._eof = not block
+            data, self._pending = self._pending + block, b""
+            self._buffer += self._decode(data, final=self._eof)
+    
+    def read(self, size: int | None = -1) -> str:
+        size = -1 if size is None else size
+        self._fill(size)
+        if size < 0:
+            text, self._buffer = self._buffer, ""
+        else:
+            text, self._buffer = self._buffer[:size], self._buffer[size:]
+        return text
+    
+    def readline(self, size: int | None = -1) -> str:
+        while "\n" not in self._buffer and not self._eof:
+            self._fill(len(self._buffer) + 1)
+        end = self._buffer.find("\n") + 1 or len(self._buffer)
+        if size is not None and size >= 0:
+            end = min(end, size)
+        text, self._buffer = self._buffer[:end], self._buffer[end:]
+        return text
+
+
+def read_csv_chunks(
+    opener: Callable[[], BinaryIO],
+    encoding: str,
+    delimiter: str,
+    chunk_size: int
+) -> Iterator[pd.DataFrame]:
+    """
+    Parse a CSV stream in chunks, falling back to Windows-1256 on decode errors.
+    
+    The encoding is sniffed from the first SNIFF_SAMPLE_BYTES only, so a
+    "utf-8" file may still hold non-UTF-8 bytes further down. Such streams
+    are decoded as UTF-8 up to the first invalid byte and as
+    FALLBACK_ENCODING from there on (see _Utf8FallbackReader).
+    
+    Args:
+        opener: Callable returning a fresh binary stream
+        encoding: Sniffed encoding
+        delimiter: Sniffed delimiter
+        chunk_size: Number of rows per chunk
+        
+    Yields:
+        DataFrame chunks
+    """
+    with opener() as f:
+        if encoding == "utf-8":
+            source, options = _Utf8FallbackReader(f), {}
+        else:
+            source, options = f, {"encoding": encoding}
+        
+        with pd.read_csv(source, sep=delimiter, chunksize=chunk_size, **options) as reader:
+            yield from reader
+
+
+def _convert_excel_cell(value: Any) -> Any:
+    """Convert a raw Excel cell to the value pandas.read_excel would produce."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if value == "":
+        return None
+    return value
+
+
+def _iter_excel_rows(input_path: str, sheet_name: str | None) -> Iterator[tuple]:
+    """
+    Yield raw row tuples from an Excel sheet without building a workbook model.
+    
+    Uses python-calamine when installed, otherwise openpyxl in read-only mode
+    (.xlsx/.xlsm only).
+    """
+    try:
+        from python_calamine import CalamineWorkbook
+    except ImportError:
+        CalamineWorkbook = None
+    
+    if CalamineWorkbook is not None:
+        workbook = CalamineWorkbook.from_path(str(input_path))
+        try:
+            if sheet_name is None:
+                sheet = workbook.get_sheet_by_index(0)
+            else:
+                sheet = workbook.get_sheet_by_name(sheet_name)
+            for row in sheet.iter_rows():
+                yield tuple(row)
+        finally:
+            workbook.close()
+        return
+    
+    if Path(input_path).suffix.lower() == ".xls":
+        # openpyxl cannot read legacy .xls; let pandas pick an engine
+        df = pd.read_excel(input_path, sheet_name=sheet_name or 0, header=None)
+        yield from df.itertuples(index=False, name=None)
+        return
+    
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(input_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active if sheet_name is None else workbook[sheet_name]
+        yield from sheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def list_sheet_names(input_path: str) -> list[str]:
+    """
+    List the worksheet names of an Excel workbook without loading any rows.
+    
+    Args:
+        input_path: Path to Excel file
+        
+    Returns:
+        Sheet names in workbook order
+    """
+    try:
+        from python_calamine import CalamineWorkbook
+    except ImportError:
+        CalamineWorkbook = None
+    
+    if CalamineWorkbook is not None:
+        workbook = CalamineWorkbook.from_path(str(input_path))
+        try:
+            return list(workbook.sheet_names)
+        finally:
+            workbook.close()
+    
+    if Path(input_path).suffix.lower() == ".xls":
+        return list(pd.ExcelFile(input_path).sheet_names)
+    
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(input_path, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def dedupe_columns(columns: Sequence[str]) -> list[str]:
+    """
+    Make repeated column names unique the way pandas.read_csv/read_excel do.
+    
+    Args:
+        columns: Header names, possibly repeated
+        
+    Returns:
+        Names with repeats suffixed ".1", ".2", ...
+        
+    Example:
+        >>> dedupe_columns(["name", "phone", "phone", "phone.1"])
+        ['name', 'phone', 'phone.2', 'phone.1']
+    """
+    result = list(columns)
+    counts: dict[str, int] = {}
+    taken = set(result)
+    
+    for i, col in enumerate(result):
+        count = counts.get(col, 0)
+        if count > 0:
+            new_col = f"{col}.{count}"
+            while new_col in taken:
+                count += 1
+                new_col = f"{col}.{count}"
+            result[i] = new_col
+            taken.add(new_col)
+        counts[col] = count + 1
+    
+    return result
+
+
+def read_excel_chunks(
+    input_path: str,
+    sheet_name: str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream an Excel sheet as DataFrame chunks.
+    
+    Rows are read one at a time and only `chunk_size` rows are held in memory,
+    so large workbooks never have to be materialized as a whole. Trailing
+    all-empty rows (formatted but empty cells) are dropped, as
+    pd.read_excel does; empty rows between data rows are kept.
+    
+    Args:
+        input_path: Path to Excel file
+        sheet_name: Sheet to read (default: first sheet)
+        chunk_size: Number of rows per chunk
+        
+    Yields:
+        DataFrame chunks with the header row as columns
+        
+    Example:
+        >>> for chunk in read_excel_chunks("contacts.xlsx", sheet_name="Riyadh"):
+        ...     print(len(chunk))
+        50000
+        12345
+    """
+    rows = _iter_excel_rows(input_path, sheet_name)
+    header = next(rows, None)
+    
+    if header is None:
+        return
+    
+    columns = dedupe_columns([
+        str(col) if col not in (None, "") else f"Unnamed: {i}"
+        for i, col in enumerate(header)
+    ])
+    width = len(columns)
+    
+    batch = []
+    # Empty rows seen since the last data row; only emitted if data follows
+    blank_rows = 0
+    
+    for row in rows:
+        row = [_convert_excel_cell(value) for value in row[:width]]
+        if all(value is None for value in row):
+            blank_rows += 1
+            continue
+        
+        if len(row) < width:
+            row.extend([None] * (width - len(row)))
+        
+        for pending in [[None] * width] * blank_rows + [row]:
+            batch.append(pending)
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame(batch, columns=columns)
+                batch = []
+        blank_rows = 0
+    
+    if batch:
+        yield pd.DataFrame(batch, columns=columns)
+
+
+def select_contact_columns(columns: Sequence[str], head: pd.DataFrame | None = None) -> list[str] | None:
+    """
+    Select the columns that map to a canonical contact field.
+    
+    Used for column projection on columnar formats, so only contact data is
+    read from disk. Columns with unknown headers are kept when content
+    inference on `head` maps them (see infer_column_mapping), so projection
+    never hides a column that normalize_column_names would have mapped.
+    
+    Args:
+        columns: Column names available in the file
+        head: First rows of the file, for content inference
+        
+    Returns:
+        Matching column names, or None if nothing matches (read everything)
+        
+    Example:
+        >>> select_contact_columns(["الاسم", "internal_id", "Mobile"])
+        ['الاسم', 'Mobile']
+    """
+    inferred = set(infer_column_mapping(head)) if head is not None else set()
+    selected = [
+        col for col in columns
+        if col in inferred or normalize_text_for_matching(str(col)) in COLUMN_LOOKUP
+    ]
+    
+    return selected or None
+
+
+def columnar_contact_columns(input_path: str) -> list[str] | None:
+    """
+    Select the contact columns of an uncompressed Parquet or Arrow IPC file.
+    
+    Header matches are taken from the schema; unknown headers are inferred
+    from the first COLUMN_SAMPLE_ROWS rows (see select_contact_columns).
+    
+    Args:
+        input_path: Path to .parquet/.feather/.arrow file
+        
+    Returns:
+        Column names to read, or None to read everything
+    """
+    pa = _require_pyarrow()
+    is_parquet = Path(input_path).suffix.lower() in PARQUET_SUFFIXES
+    
+    if is_parquet:
+        import pyarrow.parquet as pq
+        
+        parquet_file = pq.ParquetFile(input_path)
+        names = parquet_file.schema_arrow.names
+    else:
+        with pa.memory_map(str(input_path)) as source:
+            names = pa.ipc.open_file(source).schema.names
+    
+    if all(normalize_text_for_matching(str(col)) in COLUMN_LOOKUP for col in names):
+        return list(names) or None
+    
+    # Unknown headers: sample the first rows for content inference
+    head = None
+    if is_parquet:
+        batch = next(parquet_file.iter_batches(batch_size=COLUMN_SAMPLE_ROWS), None)
+        if batch is not None:
+            head = batch.to_pandas()
+    else:
+        with pa.memory_map(str(input_path)) as source:
+            reader = pa.ipc.open_file(source)
+            if reader.num_record_batches:
+                head = reader.get_batch(0).slice(0, COLUMN_SAMPLE_ROWS).to_pandas()
+    
+    return select_contact_columns(names, head)
+
+
+def read_arrow_chunks(
+    input_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    columns: list[str] | None = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a Parquet or Arrow IPC (Feather) file as DataFrame chunks.
+    
+    Only contact columns are read (see select_contact_columns) unless
+    `columns` is given. Arrow IPC files are memory-mapped.
+    
+    Args:
+        input_path: Path to .parquet/.feather/.arrow file
+        chunk_size: Number of rows per chunk
+        columns: Columns to read (default: contact columns)
+        
+    Yields:
+        DataFrame chunks
+    """
+    pa = _require_pyarrow()
+    suffix = Path(input_path).suffix.lower()
+    
+    if suffix in PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq
+        
+        parquet_file = pq.ParquetFile(input_path)
+        columns = columns or columnar_contact_columns(input_path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+        return
+    
+    with pa.memory_map(str(input_path)) as source:
+        reader = pa.ipc.open_file(source)
+        columns = columns or columnar_contact_columns(input_path)
+        
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if columns:
+                batch = batch.select(columns)
+            for offset in range(0, batch.num_rows, chunk_size):
+                yield batch.slice(offset, chunk_size).to_pandas()
+
+
+def read_arrow_file(input_path: str, columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Load a Parquet or Arrow IPC (Feather) file with column projection.
+    
+    Args:
+        input_path: Path to .parquet/.feather/.arrow file
+        columns: Columns to read (default: contact columns)
+        
+    Returns:
+        DataFrame with the projected columns
+    """
+    _require_pyarrow()
+    suffix = Path(input_path).suffix.lower()
+    
+    if suffix in PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq
+        
+        columns = columns or columnar_contact_columns(input_path)
+        table = pq.read_table(input_path, columns=columns)
+    else:
+        import pyarrow.feather as feather
+        
+        table = feather.read_table(input_path, memory_map=True)
+        columns = columns or columnar_contact_columns(input_path)
+        if columns:
+            table = table.select(columns)
+    
+    return table.to_pandas()
+
+
+def write_arrow_file(
+    df: pd.DataFrame,
+    output_path: str,
+    compression: str = DEFAULT_COMPRESSION,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE
+) -> None:
+    """
+    Save a DataFrame as Parquet or Arrow IPC (Feather).
+    
+    Args:
+        df: DataFrame to save
+        output_path: Path to .parquet/.feather/.arrow file
+        compression: Codec: one of PARQUET_CODECS for Parquet ("zstd",
+            "snappy", "lz4", "gzip", "brotli", "none"), or ARROW_CODECS for
+            Feather/Arrow IPC ("zstd", "lz4", "none")
+        row_group_size: Rows per Parquet row group / Feather record batch
+        
+    Raises:
+        ValueError: If the codec is not supported by the output format
+    """
+    is_parquet = Path(output_path).suffix.lower() in PARQUET_SUFFIXES
+    codecs_supported = PARQUET_CODECS if is_parquet else ARROW_CODECS
+    if (compression or "none") not in codecs_supported:
+        raise ValueError(
+            f"Unsupported compression for {Path(output_path).suffix} output: {compression}. "
+            f"Choose from: {', '.join(codecs_supported)}"
+        )
+    
+    pa = _require_pyarrow()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    
+    if is_parquet:
+        import pyarrow.parquet as pq
+        
+        pq.write_table(table, output_path, compression=compression, row_group_size=row_group_size)
+    else:
+        import pyarrow.feather as feather
+        
+        feather_compression = "uncompressed" if compression in (None, "none") else compression
+        feather.write_feather(table, output_path, compression=feather_compression, chunksize=row_group_size)
+
+
+def _iter_stream_chunks(
+    opener: Callable[[], BinaryIO],
+    suffix: str,
+    chunk_size: int,
+    sheet_name: str | None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream contacts from a decompressed byte stream.
+    
+    CSV is parsed straight from the stream. Random-access formats (Excel,
+    Parquet, Arrow) are spilled to a temporary file in fixed-size blocks and
+    read from there, so the decompressed bytes are never held in memory.
+    
+    Args:
+        opener: Callable returning a fresh binary stream (called twice for CSV)
+        suffix: Data format suffix of the stream
+        chunk_size: Number of rows per chunk
+        sheet_name: Excel sheet to read
+    """
+    if suffix == ".csv":
+        with opener() as f:
+            sample = f.read(SNIFF_SAMPLE_BYTES)
+        encoding, delimiter = sniff_csv_sample(sample)
+        yield from read_csv_chunks(opener, encoding, delimiter, chunk_size)
+        
+    elif suffix in EXCEL_SUFFIXES + PARQUET_SUFFIXES + ARROW_SUFFIXES:
+        with tempfile.TemporaryDirectory(prefix="datapurity_") as tmp_dir:
+            spill_path = Path(tmp_dir) / f"spill{suffix}"
+            with opener() as src, open(spill_path, "wb") as dst:
+                shutil.copyfileobj(src, dst, SPILL_BUFFER_BYTES)
+            yield from iter_contacts_file(str(spill_path), chunk_size=chunk_size, sheet_name=sheet_name)
+            
+    else:
+        raise ValueError(
+            f"Unsupported file format: {suffix}. "
+            f"Supported formats: {_supported_formats()}"
+        )
+
+
+def _iter_zip_chunks(
+    input_path: str,
+    chunk_size: int,
+    sheet_name: str | None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream contacts from every supported member of a zip archive, in order.
+    
+    When the archive has several members, each member's columns are
+    normalized so members with different header languages line up. The
+    mapping is inferred once per member, from its first chunk, and applied
+    to its other chunks, so all rows of a member keep the same columns.
+    """
+    supported = EXCEL_SUFFIXES + [".csv"] + PARQUET_SUFFIXES + ARROW_SUFFIXES
+    
+    with zipfile.ZipFile(input_path) as archive:
+        members = [
+            info for info in archive.infolist()
+            if not info.is_dir()
+            and not Path(info.filename).name.startswith((".", "~$"))
+            and not info.filename.startswith("__MACOSX/")
+            and Path(info.filename).suffix.lower() in supported
+        ]
+        
+        if not members:
+            raise ValueError(f"No supported files in archive: {input_path}")
+        
+        for info in members:
+            logger.info(f"Reading archive member: {info.filename}")
+            suffix = Path(info.filename).suffix.lower()
+            
+            rename_map = None
+            for chunk in _iter_stream_chunks(partial(archive.open, info), suffix, chunk_size, sheet_name):
+                if len(members) > 1:
+                    if rename_map is None:
+                        rename_map = dict(zip(chunk.columns, normalize_column_names(chunk).columns))
+                    chunk = chunk.rename(columns=rename_map)
+                yield chunk
+
+
+def iter_contacts_file(
+    input_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    sheet_name: str | None = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream contacts from an Excel, CSV, Parquet or Arrow file as DataFrame chunks.
+    
+    Compressed inputs (.gz, .bz2, .xz, .zst) are decompressed on the fly, and
+    zip archives are read member by member.
+    
+    Args:
+        input_path: Path to input file
+        chunk_size: Number of rows per chunk
+        sheet_name: Excel sheet to read (default: first sheet)
+        
+    Yields:
+        DataFrame chunks with loaded contacts
+        
+    Raises:
+        ValueError: If file format is not supported
+        FileNotFoundError: If file does not exist
+    """
+    path = Path(input_path)
+    
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {input_path}")
+    
+    suffix, compression = split_compression_suffix(input_path)
+    
+    if compression == "zip":
+        yield from _iter_zip_chunks(input_path, chunk_size, sheet_name)
+        
+    elif compression is not None:
+        opener = partial(open_decompressed, input_path, compression)
+        yield from _iter_stream_chunks(opener, suffix, chunk_size, sheet_name)
+        
+    elif suffix in EXCEL_SUFFIXES:
+        yield from read_excel_chunks(input_path, sheet_name=sheet_name, chunk_size=chunk_size)
+        
+    elif suffix == ".csv":
+        encoding, delimiter = sniff_csv_format(input_path)
+        yield from read_csv_chunks(partial(open, input_path, "rb"), encoding, delimiter, chunk_size)
+            
+    elif suffix in PARQUET_SUFFIXES + ARROW_SUFFIXES:
+        yield from read_arrow_chunks(input_path, chunk_size=chunk_size)
+        
+    else:
+        raise ValueError(
+            f"Unsupported file format: {suffix}. "
+            f"Supported formats: {_supported_formats()}"
+        )
+
+
+def read_csv_arrow(
+    input_path: str,
+    block_size: int = ARROW_CSV_BLOCK_SIZE,
+    use_threads: bool = True,
+    arrow_dtypes: bool = True
+) -> pd.DataFrame:
+    """
+    Parse a CSV file with the multi-threaded pyarrow CSV reader.
+    
+    The file is memory-mapped and split into `block_size` blocks that are
+    parsed in parallel. Encoding and delimiter are sniffed first, and all
+    columns are read as strings so phone numbers keep their leading zeros.
+    
+    Args:
+        input_path: Path to CSV file
+        block_size: Bytes per parse block
+        use_threads: Parse blocks on multiple threads
+        arrow_dtypes: Return an Arrow-backed DataFrame (no copy to NumPy)
+        
+    Returns:
+        DataFrame with loaded contacts
+        
+    Example:
+        >>> df = read_csv_arrow("contacts_5gb.csv")
+        >>> df.dtypes["phone"]
+        string[pyarrow]
+    """
+    pa = _require_pyarrow()
+    import pyarrow.csv as pa_csv
+    
+    encoding, delimiter = sniff_csv_format(input_path)
+    
+    with open(input_path, encoding=encoding, newline="") as f:
+        header = next(csv.reader(f, delimiter=delimiter), [])
+    
+    read_options = pa_csv.ReadOptions(
+        use_threads=use_threads,
+        block_size=block_size,
+        encoding="utf8" if encoding in ("utf-8", "utf-8-sig") else encoding
+    )
+    parse_options = pa_csv.ParseOptions(delimiter=delimiter)
+    convert_options = pa_csv.ConvertOptions(
+        column_types={col: pa.string() for col in header},
+        strings_can_be_null=True
+    )
+    
+    try:
+        with pa.memory_map(str(input_path)) as source:
+            table = pa_csv.read_csv(
+                source,
+                read_options=read_options,
+                parse_options=parse_options,
+                convert_options=convert_options
+            )
+    except pa.ArrowInvalid as e:
+        # Only the head was sniffed; non-UTF-8 bytes may appear further down.
+        # Other errors (e.g. ragged rows) are real parse errors.
+        if encoding != "utf-8" or "invalid UTF8" not in str(e):
+            raise
+        logger.warning(f"{input_path} is not valid UTF-8; re-reading as {FALLBACK_ENCODING}")
+        read_options.encoding = FALLBACK_ENCODING
+        with pa.memory_map(str(input_path)) as source:
+            table = pa_csv.read_csv(
+                source,
+                read_options=read_options,
+                parse_options=parse_options,
+                convert_options=convert_options
+            )
+    
+    logger.info(f"Parsed {table.num_rows} rows with pyarrow (threads={use_threads})")
+    
+    if arrow_dtypes:
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    return table.to_pandas()
+
+
 def normalize_text_for_matching(text: str) -> str:
     """
     Normalize text for column name matching.
@@ -70,15 +1043,187 @@ def normalize_text_for_matching(text: str) -> str:
     return text
 
 
-def normalize_column_names(df: pd.DataFrame) -> pd.DataFrame:
+def _build_column_lookup() -> dict[str, str]:
+    """Build the normalized-variant → canonical-name index from COLUMN_MAPPINGS."""
+    lookup = {}
+    for canonical_name, variants in COLUMN_MAPPINGS.items():
+        for variant in variants:
+            lookup.setdefault(normalize_text_for_matching(variant), canonical_name)
+    return lookup
+
+
+# Precompiled header index, built once at import
+COLUMN_LOOKUP = _build_column_lookup()
+
+
+def _is_phone_like(value: str) -> bool:
+    compact = "".join(value.split())
+    digits = sum(ch.isdigit() for ch in compact)
+    return digits >= 7 and digits / len(compact) >= 0.7
+
+
+def _content_confidence(hits: int, total: int) -> float:
+    """Wilson lower bound on the share of matching values, capped at 0.99."""
+    if total == 0 or hits == 0:
+        return 0.0
+    
+    z2 = CONTENT_CONFIDENCE_Z ** 2
+    share = hits / total
+    centre = share + z2 / (2 * total)
+    margin = CONTENT_CONFIDENCE_Z * np.sqrt(share * (1 - share) / total + z2 / (4 * total * total))
+    return round(min(float((centre - margin) / (1 + z2 / total)), 0.99), 3)
+
+
+def _is_name_like(value: str) -> bool:
+    tokens = value.split()
+    if not 2 <= len(tokens) <= 4:
+        return False
+    if any(token.lower().strip(".") in COMPANY_MARKERS for token in tokens):
+        return False
+    return all(
+        ARABIC_WORD_PATTERN.match(token) or LATIN_WORD_PATTERN.match(token)
+        for token in tokens
+    )
+
+
+def infer_column_type(
+    values: pd.Series,
+    sample_rows: int = COLUMN_SAMPLE_ROWS,
+    default_country_code: str = DEFAULT_INFER_COUNTRY
+) -> tuple[str | None, float]:
+    """
+    Infer a column's canonical field from a small sample of its values.
+    
+    Signals:
+    - phone: values with >= 7 digits making up >= 70% of characters that
+      also normalize to a valid number for `default_country_code`
+    - email: values shaped like local@domain.tld that pass email normalization
+    - name: values made of 2-4 Arabic or Latin words (no company markers)
+    
+    Phone and email values are checked with the pipeline's own normalizers,
+    so a column is never mapped to a field that would then null its values
+    (e.g. national ID numbers are not phones). Confidence is the Wilson
+    lower bound on the matching share, so it grows with the sample size.
+    
+    Args:
+        values: Column values
+        sample_rows: Number of non-empty values to sample
+        default_country_code: ISO country code used to validate phones
+        
+    Returns:
+        Tuple of (canonical_name or None, confidence 0-0.99); content
+        inference is never reported as certain as a header match
+        
+    Example:
+        >>> infer_column_type(pd.Series(["0501234567", "+966 55 111 2222"] * 20))
+        ('phone', 0.912)
+        >>> infer_column_type(pd.Series(["1023456789", "1098765432"] * 20))
+        (None, 0.0)
+    """
+    # Imported here: cleaning imports this module
+    from datapurity_core.cleaning import normalize_email, normalize_phone
+    
+    sample = values.dropna().head(sample_rows * 2).astype(str).str.strip()
+    sample = sample[sample != ""].head(sample_rows)
+    
+    if sample.empty:
+        return (None, 0.0)
+    
+    hits = {
+        "email": sum(bool(EMAIL_LIKE_PATTERN.match(v)) and normalize_email(v, [])[1] for v in sample),
+        "phone": sum(_is_phone_like(v) and normalize_phone(v, default_country_code)[1] for v in sample),
+        "name": sum(_is_name_like(v) for v in sample),
+    }
+    
+    best = max(hits, key=hits.get)
+    
+    if hits[best] == 0:
+        return (None, 0.0)
+    
+    return (best, _content_confidence(hits[best], len(sample)))
+
+
+def infer_column_mapping(
+    df: pd.DataFrame,
+    sample_rows: int = COLUMN_SAMPLE_ROWS,
+    min_confidence: float = MIN_CONTENT_CONFIDENCE,
+    infer_from_content: bool = True,
+    default_country_code: str = DEFAULT_INFER_COUNTRY
+) -> dict[str, tuple[str, float]]:
+    """
+    Map DataFrame columns to canonical names, with a confidence per mapping.
+    
+    Known headers (English/Arabic variants) map with confidence 1.0 through
+    the precompiled COLUMN_LOOKUP. Unknown headers fall back to content
+    inference on a small row sample (see infer_column_type) and are mapped
+    when the confidence is at least `min_confidence`. Each canonical name is
+    assigned at most once; header matches win, then the most confident
+    inferred column.
+    
+    Args:
+        df: Input DataFrame
+        sample_rows: Number of values sampled per unknown column
+        min_confidence: Minimum confidence to accept an inferred mapping
+        infer_from_content: Infer unknown headers from sampled values
+        default_country_code: ISO country code used to validate phones
+        
+    Returns:
+        Dict of {column: (canonical_name, confidence)}
+        
+    Example:
+        >>> df = pd.DataFrame({"Mobile No.": ["0501234567"] * 50, "رقم التواصل": ["0551112222"] * 50})
+        >>> infer_column_mapping(df)
+        {'Mobile No.': ('phone', 1.0)}
+        >>> infer_column_mapping(pd.DataFrame({"رقم التواصل": ["0551112222"] * 50}))
+        {'رقم التواصل': ('phone', 0.929)}
+    """
+    mapping = {}
+    assigned = set()
+    unknown = []
+    
+    for col in df.columns:
+        canonical_name = COLUMN_LOOKUP.get(normalize_text_for_matching(str(col)))
+        
+        if canonical_name is None:
+            unknown.append(col)
+        elif canonical_name not in assigned:
+            mapping[col] = (canonical_name, 1.0)
+            assigned.add(canonical_name)
+    
+    if not infer_from_content:
+        return mapping
+    
+    candidates = []
+    for col in unknown:
+        canonical_name, confidence = infer_column_type(df[col], sample_rows, default_country_code)
+        if canonical_name is not None and confidence >= min_confidence:
+            candidates.append((confidence, col, canonical_name))
+    
+    for confidence, col, canonical_name in sorted(candidates, key=lambda c: -c[0]):
+        if canonical_name not in assigned:
+            mapping[col] = (canonical_name, confidence)
+            assigned.add(canonical_name)
+    
+    return mapping
+
+
+def normalize_column_names(
+    df: pd.DataFrame,
+    infer_from_content: bool = True,
+    default_country_code: str = DEFAULT_INFER_COUNTRY
+) -> pd.DataFrame:
     """
     Normalize DataFrame column names to canonical names.
     
     Maps various column name variations (English/Arabic) to standard names:
-    name, phone, email, company, job_title, city, notes.
+    name, phone, email, company, job_title, city, notes. Unknown headers are
+    mapped from their content when `infer_from_content` is set (see
+    infer_column_mapping).
     
     Args:
         df: Input DataFrame
+        infer_from_content: Infer unknown headers from sampled values
+        default_country_code: ISO country code used to validate inferred phones
         
     Returns:
         DataFrame with normalized column names
@@ -94,19 +1239,20 @@ def normalize_column_names(df: pd.DataFrame) -> pd.DataFrame:
     # Create a copy
     df = df.copy()
     
+    mapping = infer_column_mapping(
+        df, infer_from_content=infer_from_content, default_country_code=default_country_code
+    )
+    
     # Create mapping from current columns to canonical names
-    rename_map = {}
+    rename_map = {
+        col: canonical_name
+        for col, (canonical_name, _) in mapping.items()
+        if col != canonical_name
+    }
     
-    for col in df.columns:
-        normalized_col = normalize_text_for_matching(str(col))
-        
-        # Find match in mappings
-        for canonical_name, variants in COLUMN_MAPPINGS.items():
-            normalized_variants = [normalize_text_for_matching(v) for v in variants]
-            
-            if normalized_col in normalized_variants:
-                rename_map[col] = canonical_name
-                break
+    inferred = {col: f"{name} ({confidence:.0%})" for col, (name, confidence) in mapping.items() if confidence < 1.0}
+    if inferred:
+        logger.info(f"Inferred columns from content: {inferred}")
     
     # Rename columns
     if rename_map:
@@ -118,16 +1264,471 @@ def normalize_column_names(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def load_contacts_file(input_path: str) -> pd.DataFrame:
+# Fill colors used by the streaming Excel writer's conditional formats
+INVALID_PHONE_FILL = "FFC7CE"
+DUPLICATE_FILL = "FFEB9C"
+
+
+def _frame_rows(df: pd.DataFrame) -> Iterator[list]:
+    """Yield DataFrame rows as plain Python lists with missing values as None."""
+    df = df.astype(object).where(df.notna(), None)
+    for row in df.itertuples(index=False, name=None):
+        yield list(row)
+
+
+class ExcelStreamWriter:
+    """
+    Constant-memory Excel writer.
+    
+    Rows are flushed to disk as they are written (xlsxwriter `constant_memory`
+    mode, or openpyxl write-only mode as a fallback), so memory use does not
+    grow with the number of rows. Invalid phones and duplicate groups are
+    highlighted with sheet-level conditional formats rather than per-cell
+    styles.
+    
+    Example:
+        >>> with ExcelStreamWriter("cleaned.xlsx") as writer:
+        ...     for chunk in chunks:
+        ...         writer.write(chunk)
+    """
+    
+    def __init__(
+        self,
+        output_path: str,
+        columns: Sequence[str] | None = None,
+        sheet_name: str = "Contacts",
+        highlight: bool = True,
+        engine: str | None = None
+    ):
+        """
+        Args:
+            output_path: Path to output .xlsx file
+            columns: Column names (default: taken from the first chunk)
+            sheet_name: Worksheet name
+            highlight: Add conditional formats for invalid phones and duplicates
+            engine: "xlsxwriter" or "openpyxl" (default: xlsxwriter if installed)
+        """
+        self.output_path = str(output_path)
+        self.sheet_name = sheet_name
+        self.highlight = highlight
+        self.columns: list[str] | None = None
+        self.rows_written = 0
+        self._sheet = None
+        
+        if engine is None:
+            try:
+                import xlsxwriter  # noqa: F401
+                engine = "xlsxwriter"
+            except ImportError:
+                engine = "openpyxl"
+        self.engine = engine
+        
+        if engine == "xlsxwriter":
+            import xlsxwriter
+            self._workbook = xlsxwriter.Workbook(self.output_path, {
+                "constant_memory": True,
+                "strings_to_formulas": False,
+                "strings_to_urls": False,
+                "default_date_format": "yyyy-mm-dd",
+            })
+        elif engine == "openpyxl":
+            from openpyxl import Workbook
+            self._workbook = Workbook(write_only=True)
+        else:
+            raise ValueError(f"Unsupported Excel engine: {engine}")
+        
+        self.add_sheet(sheet_name, columns)
+    
+    def add_sheet(self, sheet_name: str, columns: Sequence[str] | None = None) -> None:
+        """
+        Finish the current worksheet and start streaming into a new one.
+        
+        Args:
+            sheet_name: Worksheet name
+            columns: Column names (default: taken from the first chunk)
+        """
+        if self._sheet is not None:
+            self._finish_sheet()
+        
+        if self.engine == "xlsxwriter":
+            self._sheet = self._workbook.add_worksheet(sheet_name)
+        else:
+            self._sheet = self._workbook.create_sheet(sheet_name)
+        
+        self.sheet_name = sheet_name
+        self.columns = None
+        self.rows_written = 0
+        
+        if columns is not None:
+            self._write_header(columns)
+    
+    def __enter__(self) -> "ExcelStreamWriter":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _write_header(self, columns: Sequence[str]) -> None:
+        self.columns = [str(col) for col in columns]
+        self._append(self.columns)
+    
+    def _append(self, row: list) -> None:
+        if self.rows_written >= EXCEL_MAX_ROWS:
+            raise ValueError(
+                f"Sheet {self.sheet_name!r} is full: Excel holds at most {EXCEL_MAX_ROWS} rows "
+                f"per sheet; write CSV or Parquet for larger outputs"
+            )
+        
+        if self.engine == "xlsxwriter":
+            # xlsxwriter returns -1 instead of raising when a row is out of range
+            if self._sheet.write_row(self.rows_written, 0, row) == -1:
+                raise ValueError(f"xlsxwriter rejected row {self.rows_written} of sheet {self.sheet_name!r}")
+        else:
+            self._sheet.append(row)
+        self.rows_written += 1
+    
+    def write(self, chunk: pd.DataFrame) -> None:
+        """
+        Append a DataFrame chunk.
+        
+        Args:
+            chunk: Rows to write (columns must match the first chunk)
+        """
+        if self.columns is None:
+            self._write_header(chunk.columns)
+        
+        for row in _frame_rows(chunk[self.columns]):
+            self._append(row)
+    
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> None:
+        """
+        Append plain row sequences (requires `columns` to be set).
+        
+        Args:
+            rows: Iterable of row values in column order
+        """
+        if self.columns is None:
+            raise ValueError("columns must be given before writing plain rows")
+        
+        for row in rows:
+            self._append([None if pd.isna(v) else v for v in row])
+    
+    def _column_letter(self, col: str) -> str:
+        index = self.columns.index(col)
+        if self.engine == "xlsxwriter":
+            from xlsxwriter.utility import xl_col_to_name
+            return xl_col_to_name(index)
+        from openpyxl.utils import get_column_letter
+        return get_column_letter(index + 1)
+    
+    def _add_rule(self, cell_range: str, formula: str, color: str) -> None:
+        if self.engine == "xlsxwriter":
+            cell_format = self._workbook.add_format({"bg_color": f"#{color}"})
+            self._sheet.conditional_format(cell_range, {
+                "type": "formula", "criteria": f"={formula}", "format": cell_format
+            })
+        else:
+            from openpyxl.formatting.rule import FormulaRule
+            from openpyxl.styles import PatternFill
+            fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
+            self._sheet.conditional_formatting.add(
+                cell_range, FormulaRule(formula=[formula], fill=fill)
+            )
+    
+    def _apply_highlights(self) -> None:
+        last_row = self.rows_written
+        if last_row < 2:
+            return
+        
+        columns = self.columns
+        first_col = self._column_letter(columns[0])
+        last_col = self._column_letter(columns[-1])
+        
+        if "duplicate_group_id" in columns:
+            key = self._column_letter("duplicate_group_id")
+            self._add_rule(f"{first_col}2:{last_col}{last_row}", f"LEN(${key}2)>0", DUPLICATE_FILL)
+        elif "is_duplicate" in columns:
+            key = self._column_letter("is_duplicate")
+            self._add_rule(f"{first_col}2:{last_col}{last_row}", f"${key}2=TRUE", DUPLICATE_FILL)
+        
+        if "phone" in columns and "phone_valid" in columns:
+            phone = self._column_letter("phone")
+            flag = self._column_letter("phone_valid")
+            self._add_rule(f"{phone}2:{phone}{last_row}", f"${flag}2=FALSE", INVALID_PHONE_FILL)
+    
+    def _finish_sheet(self) -> None:
+        if self.columns is None:
+            self._write_header([])
+        
+        if self.highlight:
+            self._apply_highlights()
+        
+        logger.info(f"Streamed {self.rows_written - 1} rows to sheet {self.sheet_name!r}")
+    
+    def close(self) -> None:
+        """Apply conditional formats and finish the file."""
+        if self._workbook is None:
+            return
+        
+        self._finish_sheet()
+        
+        if self.engine == "xlsxwriter":
+            self._workbook.close()
+        else:
+            self._workbook.save(self.output_path)
+        
+        self._workbook = None
+        logger.info(f"Saved Excel file ({self.engine}): {self.output_path}")
+
+
+def write_excel_stream(
+    chunks: Iterable[pd.DataFrame] | Iterable[Sequence[Any]],
+    output_path: str,
+    columns: Sequence[str] | None = None,
+    highlight: bool = True,
+    sheet_name: str = "Contacts"
+) -> int:
+    """
+    Write DataFrame chunks or plain rows to an Excel file in constant memory.
+    
+    Args:
+        chunks: Iterable of DataFrame chunks, or of row sequences (requires columns)
+        output_path: Path to output .xlsx file
+        columns: Column names (required for row sequences)
+        highlight: Highlight invalid phones and duplicate groups
+        sheet_name: Worksheet name
+        
+    Returns:
+        Number of data rows written
+        
+    Example:
+        >>> write_excel_stream(iter_contacts_file("big.csv"), "big.xlsx")
+        1250000
+    """
+    with ExcelStreamWriter(output_path, columns=columns, sheet_name=sheet_name, highlight=highlight) as writer:
+        for chunk in chunks:
+            if isinstance(chunk, pd.DataFrame):
+                writer.write(chunk)
+            else:
+                writer.write_rows([chunk])
+    
+    return writer.rows_written - 1
+
+
+def stored_row_count(input_path: str, sheet_name: str | None = None) -> int | None:
+    """
+    Return the row count a file records in its metadata, without reading rows.
+    
+    Args:
+        input_path: Path to input file
+        sheet_name: Excel sheet (default: first sheet)
+        
+    Returns:
+        Row count for uncompressed Parquet/Arrow files, otherwise None.
+        Excel sheets are not counted: their <dimension> includes formatted
+        but empty rows, so it is only an upper bound
+    """
+    suffix, compression = split_compression_suffix(input_path)
+    if compression is not None:
+        return None
+    
+    if suffix in PARQUET_SUFFIXES:
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(input_path).metadata.num_rows
+    
+    if suffix in ARROW_SUFFIXES:
+        pa = _require_pyarrow()
+        with pa.memory_map(str(input_path)) as source:
+            return pa.ipc.open_file(source).count_rows()
+    
+    return None
+
+
+def _count_csv_rows(input_path: str) -> int | None:
+    """Count the non-blank records of an uncompressed CSV by scanning its bytes."""
+    encoding, _ = sniff_csv_format(input_path)
+    if encoding.startswith("utf-16"):
+        return None
+    
+    records = 0
+    in_quotes = False
+    line_start = 0    # offset of the current record's first byte
+    offset = 0
+    
+    with open(input_path, "rb") as f:
+        for block in iter(lambda: f.read(COUNT_BLOCK_BYTES), b""):
+            data = np.frombuffer(block, dtype=np.uint8)
+            newlines = data == 0x0A
+            
+            # Newlines inside quoted fields do not end a record ("" keeps the parity)
+            if in_quotes or b'"' in block:
+                quotes = np.cumsum(data == 0x22) + in_quotes
+                newlines &= quotes % 2 == 0
+                in_quotes = bool(quotes[-1] % 2)
+            
+            ends = np.flatnonzero(newlines) + offset
+            if len(ends):
+                # A record is blank if only "\r" (or nothing) precedes its newline
+                starts = np.concatenate(([line_start], ends[:-1] + 1))
+                lengths = ends - starts
+                blank = lengths == 0
+                carriage = lengths == 1
+                if carriage.any():
+                    positions = ends[carriage] - 1 - offset
+                    inside = positions >= 0
+                    blank[np.flatnonzero(carriage)[inside]] = data[positions[inside]] == 0x0D
+                records += int(len(ends) - blank.sum())
+                line_start = int(ends[-1]) + 1
+            
+            offset += len(block)
+    
+    # A last record without a trailing newline
+    if offset > line_start:
+        records += 1
+    
+    # Minus the header
+    return max(records - 1, 0)
+
+
+def count_rows(input_path: str, sheet_name: str | None = None) -> int | None:
+    """
+    Count the data rows of a file without parsing it.
+    
+    Uses the stored count where the format has one (see stored_row_count);
+    uncompressed CSVs are scanned for newlines outside quoted fields, at
+    disk speed. Compressed, zip and Excel inputs would need a full read and
+    are not counted.
+    
+    Args:
+        input_path: Path to input file
+        sheet_name: Excel sheet (default: first sheet)
+        
+    Returns:
+        Row count, or None if it cannot be counted cheaply
+        
+    Example:
+        >>> count_rows("contacts.csv")
+        2000000
+    """
+    if not Path(input_path).exists():
+        raise FileNotFoundError(f"File not found: {input_path}")
+    
+    suffix, compression = split_compression_suffix(input_path)
+    if compression is None and suffix == ".csv":
+        return _count_csv_rows(input_path)
+    
+    return stored_row_count(input_path, sheet_name)
+
+
+def limit_rows(
+    df: pd.DataFrame,
+    max_rows: int,
+    on_row_limit: str = "error",
+    source: str = "DataFrame",
+    rows: int | None = None
+) -> pd.DataFrame:
+    """
+    Enforce a row limit on a DataFrame.
+    
+    Truncated frames record the limit in df.attrs ("row_limit" and
+    "rows_over_limit"), which clean_contacts_df reports in its stats.
+    
+    Args:
+        df: Rows read so far (at most max_rows + 1 are needed)
+        max_rows: Row limit
+        on_row_limit: "error" to raise, "truncate" to keep the first max_rows rows
+        source: Input name for messages
+        rows: Total rows of the input, if known
+        
+    Returns:
+        df, truncated to max_rows if needed
+        
+    Raises:
+        RowLimitExceededError: If df has more than max_rows rows and
+            on_row_limit is "error"
+    """
+    if on_row_limit not in ROW_LIMIT_ACTIONS:
+        raise ValueError(f"Unknown row limit action: {on_row_limit}. Choose from: {', '.join(ROW_LIMIT_ACTIONS)}")
+    
+    if len(df) <= max_rows and (rows is None or rows <= max_rows):
+        return df
+    
+    if on_row_limit == "error":
+        raise RowLimitExceededError(source, max_rows, rows)
+    
+    found = f"{rows} rows" if rows is not None else f"more than {max_rows} rows"
+    logger.warning(f"{source} has {found}; keeping the first {max_rows}")
+    df = df.iloc[:max_rows].copy()
+    df.attrs["row_limit"] = max_rows
+    df.attrs["rows_over_limit"] = rows - max_rows if rows is not None else None
+    return df
+
+
+def _load_limited(
+    input_path: str,
+    max_rows: int,
+    on_row_limit: str,
+    sheet_name: str | None
+) -> pd.DataFrame:
+    """Read at most max_rows + 1 rows of a file and enforce the row limit."""
+    # Formats that store their row count are rejected before reading any row
+    rows = stored_row_count(input_path, sheet_name)
+    if rows is not None and rows > max_rows and on_row_limit == "error":
+        raise RowLimitExceededError(input_path, max_rows, rows)
+    
+    chunks = []
+    read = 0
+    reader = iter_contacts_file(input_path, chunk_size=min(max_rows + 1, DEFAULT_CHUNK_SIZE), sheet_name=sheet_name)
+    try:
+        for chunk in reader:
+            chunks.append(chunk)
+            read += len(chunk)
+            if read > max_rows:
+                break
+    finally:
+        reader.close()
+    
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    logger.info(f"Read {min(read, max_rows + 1)} rows (limit {max_rows})")
+    
+    if read > max_rows and rows is None and on_row_limit == "truncate":
+        # Report how much was left out where that is cheap to find; Excel,
+        # compressed and zip inputs are not read past the limit (None)
+        rows = count_rows(input_path, sheet_name)
+    
+    return limit_rows(df, max_rows, on_row_limit, source=input_path, rows=rows)
+
+
+def load_contacts_file(
+    input_path: str,
+    sheet_name: str | None = None,
+    csv_engine: str = "pandas",
+    max_rows: int | None = None,
+    on_row_limit: str = "error"
+) -> pd.DataFrame:
     """
-    Load contacts from Excel or CSV file.
+    Load contacts from Excel, CSV, Parquet or Arrow IPC file.
     
     Supports:
-    - Excel files (.xlsx, .xls)
-    - CSV files (.csv)
+    - Excel files (.xlsx, .xlsm, .xls), streamed row by row via
+      python-calamine or read-only openpyxl
+    - CSV files (.csv) in UTF-8, UTF-8 with BOM, UTF-16 or Windows-1256,
+      delimited by comma, semicolon, tab or pipe
+    - Parquet (.parquet, .pq) and Arrow IPC/Feather (.feather, .arrow, .ipc),
+      reading only the contact columns
+    - Any of the above compressed with gzip, bz2, xz or zstd (streamed), and
+      zip archives, whose members are read one after another
     
     Args:
         input_path: Path to input file
+        sheet_name: Excel sheet to read (default: first sheet)
+        csv_engine: "pandas" or "pyarrow" (multi-threaded, memory-mapped,
+            returns an Arrow-backed DataFrame)
+        max_rows: Row limit; reading stops after max_rows + 1 rows, and
+            files that store their row count are checked before reading
+        on_row_limit: "error" to raise RowLimitExceededError, or "truncate"
+            to keep the first max_rows rows (see limit_rows)
         
     Returns:
         DataFrame with loaded contacts
@@ -135,6 +1736,8 @@ def load_contacts_file(input_path: str) -> pd.DataFrame:
     Raises:
         ValueError: If file format is not supported
         FileNotFoundError: If file does not exist
+        RowLimitExceededError: If the file has more than max_rows rows and
+            on_row_limit is "error"
         
     Example:
         >>> df = load_contacts_file("contacts.xlsx")
@@ -146,28 +1749,50 @@ def load_contacts_file(input_path: str) -> pd.DataFrame:
     if not path.exists():
         raise FileNotFoundError(f"File not found: {input_path}")
     
-    suffix = path.suffix.lower()
+    suffix, compression = split_compression_suffix(input_path)
     
-    logger.info(f"Loading file: {input_path} (format: {suffix})")
+    logger.info(f"Loading file: {input_path} (format: {suffix}, compression: {compression})")
+    
+    if max_rows is not None:
+        return _load_limited(input_path, max_rows, on_row_limit, sheet_name)
     
     try:
-        if suffix in [".xlsx", ".xls"]:
-            df = pd.read_excel(input_path)
+        if compression is not None:
+            chunks = list(iter_contacts_file(input_path, sheet_name=sheet_name))
+            df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+            logger.info(f"Loaded {len(df)} rows from {compression} input")
+            
+        elif suffix in EXCEL_SUFFIXES:
+            chunks = list(read_excel_chunks(input_path, sheet_name=sheet_name))
+            df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
             logger.info(f"Loaded {len(df)} rows from Excel file")
             
+        elif suffix == ".csv" and csv_engine == "pyarrow":
+            df = read_csv_arrow(input_path)
+            logger.info(f"Loaded {len(df)} rows from CSV file (pyarrow)")
+            
         elif suffix == ".csv":
-            # Try UTF-8 first, fallback to UTF-8-SIG for BOM
+            # Sniff encoding/delimiter once, then parse a single time
+            encoding, delimiter = sniff_csv_format(input_path)
             try:
-                df = pd.read_csv(input_path, encoding="utf-8")
+                df = pd.read_csv(input_path, encoding=encoding, sep=delimiter)
             except UnicodeDecodeError:
-                df = pd.read_csv(input_path, encoding="utf-8-sig")
+                # Only the head was sniffed; non-UTF-8 bytes may appear further down
+                if encoding != "utf-8":
+                    raise
+                logger.warning(f"{input_path} is not valid UTF-8; re-reading as {FALLBACK_ENCODING}")
+                df = pd.read_csv(input_path, encoding=FALLBACK_ENCODING, sep=delimiter)
             
             logger.info(f"Loaded {len(df)} rows from CSV file")
             
+        elif suffix in PARQUET_SUFFIXES + ARROW_SUFFIXES:
+            df = read_arrow_file(input_path)
+            logger.info(f"Loaded {len(df)} rows from columnar file")
+            
         else:
             raise ValueError(
                 f"Unsupported file format: {suffix}. "
-                f"Supported formats: .xlsx, .xls, .csv"
+                f"Supported formats: {_supported_formats()}"
             )
         
         return df
@@ -177,13 +1802,23 @@ def load_contacts_file(input_path: str) -> pd.DataFrame:
         raise
 
 
-def save_contacts_file(df: pd.DataFrame, output_path: str) -> None:
+def save_contacts_file(
+    df: pd.DataFrame,
+    output_path: str,
+    compression: str = DEFAULT_COMPRESSION,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE
+) -> None:
     """
-    Save contacts DataFrame to Excel or CSV file.
+    Save contacts DataFrame to Excel, CSV, Parquet or Arrow IPC file.
+    
+    Excel output is streamed in constant memory with invalid phones and
+    duplicate groups highlighted.
     
     Args:
         df: DataFrame to save
         output_path: Path to output file
+        compression: Codec for Parquet/Arrow output
+        row_group_size: Rows per Parquet row group / Arrow record batch
         
     Example:
         >>> df = pd.DataFrame({"name": ["Ahmed"], "phone": ["+966501234567"]})
@@ -199,9 +1834,13 @@ def save_contacts_file(df: pd.DataFrame, output_path: str) -> None:
     
     try:
         if suffix in [".xlsx", ".xls"]:
-            df.to_excel(output_path, index=False, engine="openpyxl")
+            write_excel_stream([df], output_path)
             logger.info("Saved as Excel file")
             
+        elif suffix in PARQUET_SUFFIXES + ARROW_SUFFIXES:
+            write_arrow_file(df, output_path, compression=compression, row_group_size=row_group_size)
+            logger.info(f"Saved as columnar file ({compression})")
+            
         else:  # Default to CSV
             df.to_csv(output_path, index=False, encoding="utf-8-sig")
             logger.info("Saved as CSV file")
@@ -87,6 +87,12 @@ class CleaningStats(BaseModel):
         invalid_emails: Count of invalid emails
         avg_quality_score: Average quality score of final dataset
         fuzzy_duplicate_clusters: Number of fuzzy duplicate groups found
+        null_counts: Missing values per contact column in the final rows
+        valid_counts: Valid values per validated column (phone, email) in
+            the final rows
+        row_limit: Row limit the input was truncated to (None: not truncated)
+        rows_over_limit: Input rows left out by the row limit (None if not
+            truncated or the input's size is unknown)
     """
     
     rows_original: int = 0
@@ -98,3 +104,132 @@ class CleaningStats(BaseModel):
     invalid_emails: int = 0
     avg_quality_score: float = 0.0
     fuzzy_duplicate_clusters: int = 0
+    null_counts: dict[str, int] = Field(default_factory=dict)
+    valid_counts: dict[str, int] = Field(default_factory=dict)
+    row_limit: int | None = None
+    rows_over_limit: int | None = None
+
+
+class DatasetProfileReport(BaseModel):
+    """
+    Dashboard summary of a dataset profile (see dataset_profile.DatasetProfile).
+    
+    Attributes:
+        rows: Rows profiled
+        distinct_counts: Estimated distinct values per column (HyperLogLog)
+        top_values: Most frequent (value, count) pairs per column; counts
+            are lower bounds
+        top_values_max_error: Maximum undercount of top_values per column
+        score_histogram: Rows per quality score range
+        phone_countries: Phones per calling code and region, e.g. "+966 SA"
+    """
+    
+    rows: int = 0
+    distinct_counts: dict[str, int] = Field(default_factory=dict)
+    top_values: dict[str, list[tuple[str, int]]] = Field(default_factory=dict)
+    top_values_max_error: dict[str, int] = Field(default_factory=dict)
+    score_histogram: dict[str, int] = Field(default_factory=dict)
+    phone_countries: dict[str, int] = Field(default_factory=dict)
+
+
+class ExecutionPlan(BaseModel):
+    """
+    How to run the cleaning pipeline within a memory budget (see planner).
+    
+    Attributes:
+        mode: "in_memory", "chunked" (input in memory, pipeline in row
+            ranges), "out_of_core" (input streamed from disk) or
+            "external" (also the dedup index partitioned on disk)
+        estimated_rows: Estimated input rows
+        bytes_per_row: Sampled in-memory bytes per input row
+        input_mb: Estimated size of the loaded input
+        peak_mb: Estimated peak memory of the in-memory pipeline
+        max_memory_mb: Budget the plan was made for (0: none)
+        chunk_size: Rows per range in chunked and out-of-core modes
+        workers: Worker processes that fit in the budget
+        partitions: Key partitions in external mode
+        reason: Why this mode was chosen
+    """
+    
+    mode: str = "in_memory"
+    estimated_rows: int = 0
+    bytes_per_row: float = 0.0
+    input_mb: float = 0.0
+    peak_mb: float = 0.0
+    max_memory_mb: int = 0
+    chunk_size: int = 0
+    workers: int = 1
+    partitions: int = 0
+    reason: str = ""
+
+
+class PreviewEstimate(BaseModel):
+    """
+    Full-file estimates from cleaning a preview sample.
+    
+    Attributes:
+        sample: Sampling method ("head" or "stratified")
+        sample_rows: Rows in the preview sample
+        estimated_rows: Estimated rows in the whole file
+        exact: The sample is the whole file, so estimates are exact
+        stats: Cleaning statistics of the sample
+        estimated_rows_final: Estimated rows after cleaning
+        estimated_duplicates_removed: Estimated duplicates removed, from how
+            often duplicate groups recur in the sample (see
+            preview.estimate_distinct)
+        estimated_empty_rows_removed: Estimated empty rows removed
+        estimated_invalid_phones: Estimated invalid phone numbers
+        estimated_invalid_emails: Estimated invalid emails
+        preview_seconds: Time taken by the preview
+        estimated_seconds: Estimated time to clean the whole file
+    """
+    
+    sample: str = "head"
+    sample_rows: int = 0
+    estimated_rows: int = 0
+    exact: bool = False
+    stats: CleaningStats = Field(default_factory=CleaningStats)
+    estimated_rows_final: int = 0
+    estimated_duplicates_removed: int = 0
+    estimated_empty_rows_removed: int = 0
+    estimated_invalid_phones: int = 0
+    estimated_invalid_emails: int = 0
+    preview_seconds: float = 0.0
+    estimated_seconds: float = 0.0
+
+
+class WorkbookStats(BaseModel):
+    """
+    Statistics from cleaning every sheet of a workbook.
+    
+    Attributes:
+        sheets: Per-sheet cleaning statistics (within-sheet dedup only)
+        cross_sheet_duplicates: Rows removed per sheet because their phone or
+            email already appeared in an earlier sheet
+        total: Global statistics over the whole workbook
+    """
+    
+    sheets: dict[str, CleaningStats] = Field(default_factory=dict)
+    cross_sheet_duplicates: dict[str, int] = Field(default_factory=dict)
+    total: CleaningStats = Field(default_factory=CleaningStats)
+
+
+class FileResult(BaseModel):
+    """
+    Outcome of cleaning one file in batch mode.
+    
+    Attributes:
+        input_path: Source file
+        output_path: Cleaned output file
+        status: "ok" or "error"
+        error: Error message when status is "error"
+        seconds: Wall time spent on the file (load + clean + save)
+        stats: Cleaning statistics when status is "ok"
+    """
+    
+    input_path: str
+    output_path: str
+    status: str = "ok"
+    error: str | None = None
+    seconds: float = 0.0
+    stats: CleaningStats | None = None
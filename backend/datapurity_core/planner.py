@@ -0,0 +1,322 @@
+"""
+Execution Planner for DataPurity Core
+=====================================
+
+Chooses how to run the cleaning pipeline within a memory budget
+(Settings.MAX_MEMORY_MB):
+
+- in_memory: load the input and clean it in one pass (fastest)
+- chunked: the input fits, but the pipeline's working copies do not; clean
+  it in checkpointed row ranges (see checkpoint.clean_checkpointed)
+- out_of_core: not even the input fits; stream it from disk range by range
+  (see checkpoint.clean_file_streaming)
+- external: not even the phone/email dedup index fits; stream the input and
+  dedup through on-disk key partitions (see external_dedup). External dedup
+  has no fuzzy name matching, so it is only chosen when fuzzy dedup is off
+  or the caller opts in (allow_external); otherwise the planner stays with
+  out_of_core and warns that the index may exceed the budget
+
+Estimates come from the file size, an exact row count where the format
+stores one (Parquet, Arrow) and the width of a sample of rows.
+"""
+
+import logging
+import math
+import os
+import pandas as pd
+
+from datapurity_core.config import Settings
+from datapurity_core.models import ExecutionPlan
+from datapurity_core import io_utils
+
+logger = logging.getLogger(__name__)
+
+
+MB = 1024 * 1024
+
+# Rows read to measure row width
+PLAN_SAMPLE_ROWS = 1000
+
+# Peak memory of the in-memory pipeline relative to the loaded input
+# (normalization copies, dedup keys, scores); measured at 5-10x
+PIPELINE_MEMORY_FACTOR = 8
+
+# Dedup index (phone/email → first row) bytes per input row in ranged modes
+INDEX_BYTES_PER_ROW = 300
+
+# Interpreter, pandas and phonenumbers metadata per worker process
+WORKER_BASE_MB = 150
+
+# Key partitions for external dedup: at least this many, and enough that one
+# partition's share of the index uses at most a quarter of the budget
+MIN_PARTITIONS = 64
+
+# Bounds for automatically chosen range sizes
+MIN_CHUNK_SIZE = 5_000
+MAX_CHUNK_SIZE = 500_000
+
+# Typical decompressed size / file size, used to estimate rows of formats
+# that do not store a row count
+EXPANSION_RATIOS = {
+    "gzip": 4.0,
+    "bz2": 5.0,
+    "xz": 5.0,
+    "zstd": 4.0,
+    "zip": 4.0,
+    ".xlsx": 1.5,
+    ".xlsm": 1.5,
+    ".xls": 1.0,
+}
+
+
+def estimate_input(input_path: str, sheet_name: str | None = None) -> tuple[int, float]:
+    """
+    Estimate the row count and in-memory row width of an input file.
+    
+    Reads only the first PLAN_SAMPLE_ROWS rows. Row counts are exact for
+    uncompressed Parquet/Arrow files and for files smaller than the sample;
+    otherwise they are the (decompressed) file size divided by the sample's
+    CSV width.
+    
+    Args:
+        input_path: Path to input file
+        sheet_name: Excel sheet to sample
+    
+    Returns:
+        Tuple of (estimated_rows, bytes_per_row)
+    
+    Example:
+        >>> rows, bytes_per_row = estimate_input("contacts.csv.gz")
+    """
+    chunks = io_utils.iter_contacts_file(input_path, chunk_size=PLAN_SAMPLE_ROWS, sheet_name=sheet_name)
+    sample = next(iter(chunks), pd.DataFrame())
+    chunks.close()
+    
+    if sample.empty:
+        return 0, 0.0
+    
+    bytes_per_row = sample.memory_usage(deep=True, index=False).sum() / len(sample)
+    complete = len(sample) < PLAN_SAMPLE_ROWS
+    
+    return estimate_rows(input_path, sample, complete), float(bytes_per_row)
+
+
+def estimate_rows(input_path: str, sample: pd.DataFrame, complete: bool = False) -> int:
+    """
+    Estimate the row count of an input file from a sample of its rows.
+    
+    Args:
+        input_path: Path to input file
+        sample: Rows read from the file
+        complete: The sample is every row the reader returned (the whole
+            file, unless it is a zip archive with more members)
+    
+    Returns:
+        Estimated rows: exact for complete samples and uncompressed
+        Parquet/Arrow files, otherwise the (decompressed) file size divided
+        by the sample's CSV width
+    """
+    suffix, compression = io_utils.split_compression_suffix(input_path)
+    
+    if complete and compression != "zip":
+        return len(sample)
+    
+    if compression is None and suffix in io_utils.PARQUET_SUFFIXES + io_utils.ARROW_SUFFIXES:
+        return io_utils.stored_row_count(input_path)
+    
+    if sample.empty:
+        return 0
+    
+    text_bytes_per_row = len(sample.to_csv(index=False, header=False).encode("utf-8")) / len(sample)
+    expansion = EXPANSION_RATIOS.get(compression or suffix, 1.0)
+    return max(len(sample), int(os.path.getsize(input_path) * expansion / text_bytes_per_row))
+
+
+def plan_workers(per_worker_mb: float, max_memory_mb: int, max_workers: int | None = None) -> int:
+    """
+    Return how many worker processes fit in the memory budget.
+    
+    Args:
+        per_worker_mb: Peak memory of one worker's task
+        max_memory_mb: Memory budget (0: none)
+        max_workers: Upper bound (default: CPU count)
+    
+    Returns:
+        Worker count, at least 1
+    """
+    workers = max(1, max_workers or os.cpu_count() or 1)
+    if max_memory_mb > 0:
+        workers = min(workers, int(max_memory_mb // (per_worker_mb + WORKER_BASE_MB)))
+    return max(1, workers)
+
+
+def _range_chunk_size(available_mb: float, bytes_per_row: float) -> int:
+    """Rows per range whose pipeline working set fits in `available_mb`."""
+    rows = int(available_mb * MB / max(bytes_per_row * PIPELINE_MEMORY_FACTOR, 1.0))
+    return min(max(rows, MIN_CHUNK_SIZE), MAX_CHUNK_SIZE)
+
+
+def make_plan(
+    rows: int,
+    bytes_per_row: float,
+    settings: Settings,
+    input_loaded: bool = False,
+    max_workers: int | None = None,
+    allow_external: bool = False
+) -> ExecutionPlan:
+    """
+    Choose the execution mode, range size and worker count for an input.
+    
+    Args:
+        rows: Input rows
+        bytes_per_row: In-memory bytes per input row
+        settings: Configuration settings (MAX_MEMORY_MB is the budget)
+        input_loaded: The input is already a DataFrame, so streaming it is
+            not an option
+        max_workers: Upper bound for the worker count (default: CPU count)
+        allow_external: Allow external mode even though it drops fuzzy
+            dedup (it is always allowed when ENABLE_FUZZY_DEDUP is off)
+    
+    Returns:
+        ExecutionPlan
+    """
+    budget = settings.MAX_MEMORY_MB
+    input_mb = rows * bytes_per_row / MB
+    peak_mb = input_mb * PIPELINE_MEMORY_FACTOR
+    index_mb = rows * INDEX_BYTES_PER_ROW / MB
+    
+    plan = ExecutionPlan(
+        estimated_rows=rows,
+        bytes_per_row=round(bytes_per_row, 1),
+        input_mb=round(input_mb, 1),
+        peak_mb=round(peak_mb, 1),
+        max_memory_mb=budget,
+        chunk_size=io_utils.DEFAULT_CHUNK_SIZE,
+        workers=plan_workers(peak_mb, budget, max_workers)
+    )
+    
+    if budget <= 0:
+        plan.reason = "no memory budget set"
+        return plan
+    
+    if peak_mb <= budget:
+        plan.reason = f"estimated peak {peak_mb:.0f} MB fits in {budget} MB"
+        return plan
+    
+    # Ranged modes: one range's working set plus the dedup index at a time
+    plan.workers = 1
+    available_mb = budget - index_mb
+    
+    # External mode changes results when fuzzy dedup is on: only with an opt-in
+    external_ok = allow_external or not settings.ENABLE_FUZZY_DEDUP
+    
+    if index_mb > budget / 2 and not input_loaded and external_ok:
+        plan.mode = "external"
+        plan.chunk_size = _range_chunk_size(budget / 2, bytes_per_row)
+        plan.partitions = max(MIN_PARTITIONS, math.ceil(index_mb / (budget / 4)))
+        plan.reason = f"dedup index (~{index_mb:.0f} MB) does not fit in {budget} MB; partitioning it on disk"
+        return plan
+    
+    if input_loaded or input_mb + index_mb < budget / 2:
+        plan.mode = "chunked"
+        plan.chunk_size = _range_chunk_size(available_mb - input_mb, bytes_per_row)
+        plan.reason = (
+            f"estimated peak {peak_mb:.0f} MB exceeds {budget} MB; "
+            f"input ({input_mb:.0f} MB) stays in memory"
+        )
+    else:
+        plan.mode = "out_of_core"
+        plan.chunk_size = _range_chunk_size(available_mb, bytes_per_row)
+        plan.reason = f"input ({input_mb:.0f} MB) leaves too little of {budget} MB to clean it in memory"
+    
+    if index_mb > budget / 2:
+        hint = "" if input_loaded else "; use --external-dedup to partition it on disk (drops fuzzy dedup)"
+        logger.warning(f"The dedup index alone needs about {index_mb:.0f} MB of the {budget} MB budget{hint}")
+    
+    return plan
+
+
+def plan_execution(
+    input_path: str,
+    settings: Settings,
+    sheet_name: str | None = None,
+    max_workers: int | None = None,
+    allow_external: bool = False
+) -> ExecutionPlan:
+    """
+    Plan how to clean a file within Settings.MAX_MEMORY_MB.
+    
+    Args:
+        input_path: Path to input file
+        settings: Configuration settings
+        sheet_name: Excel sheet to be cleaned
+        max_workers: Upper bound for the worker count (default: CPU count)
+        allow_external: Allow external mode with fuzzy dedup enabled (see make_plan)
+    
+    Returns:
+        ExecutionPlan
+    
+    Example:
+        >>> settings.MAX_MEMORY_MB = 2048
+        >>> plan = plan_execution("huge.csv.gz", settings)
+        >>> plan.mode, plan.chunk_size
+        ('out_of_core', 120000)
+    """
+    rows, bytes_per_row = estimate_input(input_path, sheet_name=sheet_name)
+    plan = make_plan(rows, bytes_per_row, settings, max_workers=max_workers, allow_external=allow_external)
+    log_plan(plan, input_path)
+    return plan
+
+
+def plan_for_frame(df: pd.DataFrame, settings: Settings) -> ExecutionPlan:
+    """
+    Plan how to clean an already loaded DataFrame within Settings.MAX_MEMORY_MB.
+    
+    Args:
+        df: Input DataFrame
+        settings: Configuration settings
+    
+    Returns:
+        ExecutionPlan with mode "in_memory" or "chunked"
+    """
+    sample = df.head(PLAN_SAMPLE_ROWS)
+    bytes_per_row = sample.memory_usage(deep=True, index=False).sum() / max(len(sample), 1)
+    return make_plan(len(df), float(bytes_per_row), settings, input_loaded=True)
+
+
+def plan_batch_workers(input_paths: list, settings: Settings, max_workers: int | None = None) -> int:
+    """
+    Return how many files can be cleaned in parallel within Settings.MAX_MEMORY_MB.
+    
+    Sized for the file with the largest estimated peak, since any worker
+    may get it.
+    
+    Args:
+        input_paths: Files of the batch
+        settings: Configuration settings
+        max_workers: Upper bound (default: CPU count)
+    
+    Returns:
+        Worker count, at least 1
+    """
+    peak_mb = 0.0
+    for input_path in input_paths:
+        rows, bytes_per_row = estimate_input(str(input_path))
+        peak_mb = max(peak_mb, rows * bytes_per_row / MB * PIPELINE_MEMORY_FACTOR)
+    
+    workers = plan_workers(peak_mb, settings.MAX_MEMORY_MB, max_workers)
+    logger.info(
+        f"Batch plan: {workers} workers for {settings.MAX_MEMORY_MB} MB "
+        f"(largest file ~{peak_mb:.0f} MB peak)"
+    )
+    return workers
+
+
+def log_plan(plan: ExecutionPlan, label: str) -> None:
+    """Log an execution plan."""
+    logger.info(
+        f"Execution plan for {label}: {plan.mode} "
+        f"(~{plan.estimated_rows} rows, ~{plan.input_mb:.0f} MB loaded, ~{plan.peak_mb:.0f} MB peak; "
+        f"chunk size {plan.chunk_size}, {plan.workers} workers"
+        f"{f', {plan.partitions} partitions' if plan.partitions else ''}) - {plan.reason}"
+    )
@@ -0,0 +1,316 @@
+"""
+Preview for DataPurity Core
+===========================
+
+Cleans a small sample of an input file so users can see how their data will
+look before committing a full cleaning job, and estimates the full file's
+statistics and runtime from it.
+
+Samples are either the first rows ("head") or rows spread over the whole
+file ("stratified"): uncompressed CSVs are read at evenly spaced byte
+offsets, Parquet files from evenly spaced row groups and Arrow IPC files at
+evenly spaced rows of the memory-mapped table. No sampling mode reads more
+than the sample, so previews stay fast however large the input is.
+"""
+
+import logging
+import math
+import os
+import time
+from io import BytesIO
+import numpy as np
+import pandas as pd
+
+from datapurity_core.config import Settings
+from datapurity_core.models import PreviewEstimate
+from datapurity_core import io_utils, planner
+from datapurity_core.cleaning import clean_contacts_df
+from datapurity_core.profiling import PipelineProfiler
+from datapurity_core.provenance import RowProvenance
+
+logger = logging.getLogger(__name__)
+
+
+PREVIEW_ROWS = 1000
+PREVIEW_SAMPLES = ["head", "stratified"]
+
+# Seconds per fuzzy name comparison (rapidfuzz cdist, one core), measured on
+# typical contact names; used to extrapolate fuzzy matching time
+FUZZY_SECONDS_PER_PAIR = 40e-9
+
+# File regions (CSV byte ranges, Parquet row groups, Arrow record batches) a
+# stratified sample is drawn from
+PREVIEW_STRATA = 10
+
+
+def read_head(input_path: str, n_rows: int, sheet_name: str | None = None) -> tuple[pd.DataFrame, bool]:
+    """
+    Read the first rows of an input file.
+    
+    Args:
+        input_path: Path to input file
+        n_rows: Rows to read
+        sheet_name: Excel sheet to read (default: first sheet)
+    
+    Returns:
+        Tuple of (rows, complete): complete is True if the file has no
+        further rows
+    """
+    chunks = io_utils.iter_contacts_file(input_path, chunk_size=n_rows, sheet_name=sheet_name)
+    head = next(iter(chunks), pd.DataFrame())
+    chunks.close()
+    return head, len(head) < n_rows
+
+
+def _read_csv_strata(input_path: str, n_rows: int) -> tuple[pd.DataFrame, bool] | None:
+    """Read runs of lines at evenly spaced offsets of an uncompressed CSV."""
+    encoding, delimiter = io_utils.sniff_csv_format(input_path)
+    if encoding.startswith("utf-16"):
+        # Offsets may fall inside a code unit
+        return None
+    
+    size = os.path.getsize(input_path)
+    per_stratum = math.ceil(n_rows / PREVIEW_STRATA)
+    frames = []
+    skipped = False
+    
+    with open(input_path, "rb") as f:
+        header = f.readline()
+        
+        for stratum in range(PREVIEW_STRATA):
+            # Start on the line after the offset, never inside an earlier run
+            offset = size * stratum // PREVIEW_STRATA
+            if offset > f.tell():
+                f.seek(offset)
+                f.readline()
+                skipped = True
+            
+            lines = [line for line in (f.readline() for _ in range(per_stratum)) if line]
+            if lines:
+                frames.append(pd.read_csv(
+                    BytesIO(header + b"".join(lines)),
+                    encoding=encoding, sep=delimiter, on_bad_lines="skip"
+                ))
+        
+        # Nothing was skipped and the runs reached the end: the whole file was read
+        complete = not skipped and f.tell() >= size
+    
+    if not frames:
+        return pd.DataFrame(), True
+    
+    return pd.concat(frames, ignore_index=True), complete
+
+
+def _read_columnar_strata(input_path: str, n_rows: int) -> tuple[pd.DataFrame, bool]:
+    """Read evenly spaced rows from a few Parquet row groups or Arrow record batches."""
+    pa = io_utils._require_pyarrow()
+    
+    if io_utils.split_compression_suffix(input_path)[0] in io_utils.PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq
+        
+        parquet_file = pq.ParquetFile(input_path)
+        columns = io_utils.columnar_contact_columns(input_path)
+        tables = _take_strata(
+            parquet_file.num_row_groups,
+            lambda group: parquet_file.read_row_group(group, columns=columns),
+            n_rows
+        )
+        return (pa.concat_tables(tables).to_pandas() if tables else pd.DataFrame()), parquet_file.metadata.num_rows <= n_rows
+    
+    # Memory-mapped: only the record batches read are paged in (and decompressed)
+    with pa.memory_map(str(input_path)) as source:
+        reader = pa.ipc.open_file(source)
+        columns = io_utils.columnar_contact_columns(input_path)
+        tables = _take_strata(
+            reader.num_record_batches,
+            lambda group: pa.Table.from_batches([reader.get_batch(group)]).select(columns or reader.schema.names),
+            n_rows
+        )
+        return (pa.concat_tables(tables).to_pandas() if tables else pd.DataFrame()), reader.count_rows() <= n_rows
+
+
+def _take_strata(groups: int, read_group, n_rows: int) -> list:
+    """Take evenly spaced rows from up to PREVIEW_STRATA evenly spaced row groups."""
+    picked = np.unique(np.linspace(0, groups - 1, min(PREVIEW_STRATA, groups)).round().astype(int))
+    per_group = math.ceil(n_rows / max(len(picked), 1))
+    tables = []
+    
+    for group in picked:
+        table = read_group(int(group))
+        positions = np.unique(np.linspace(0, table.num_rows - 1, min(per_group, table.num_rows)).astype(int))
+        tables.append(table.take(positions))
+    
+    return tables
+
+
+def read_preview_rows(
+    input_path: str,
+    n_rows: int = PREVIEW_ROWS,
+    sample: str = "head",
+    sheet_name: str | None = None
+) -> tuple[pd.DataFrame, bool, str]:
+    """
+    Read a preview sample of an input file.
+    
+    Stratified samples need random access; compressed and Excel inputs are
+    sampled from their head instead.
+    
+    Args:
+        input_path: Path to input file
+        n_rows: Rows in the sample
+        sample: "head" or "stratified"
+        sheet_name: Excel sheet to read (default: first sheet)
+    
+    Returns:
+        Tuple of (rows, complete, sample method used)
+    
+    Raises:
+        ValueError: If the sample method is unknown
+    """
+    if sample not in PREVIEW_SAMPLES:
+        raise ValueError(f"Unknown preview sample: {sample}. Choose from: {', '.join(PREVIEW_SAMPLES)}")
+    
+    if not os.path.exists(input_path):
+        raise FileNotFoundError(f"File not found: {input_path}")
+    
+    if sample == "stratified":
+        suffix, compression = io_utils.split_compression_suffix(input_path)
+        strata = None
+        
+        if compression is None and suffix == ".csv":
+            strata = _read_csv_strata(input_path, n_rows)
+        elif compression is None and suffix in io_utils.PARQUET_SUFFIXES + io_utils.ARROW_SUFFIXES:
+            strata = _read_columnar_strata(input_path, n_rows)
+        
+        if strata is not None:
+            df, complete = strata
+            return df, complete, "stratified"
+        
+        logger.info(f"Stratified preview needs an uncompressed CSV, Parquet or Arrow file; previewing the head of {input_path}")
+    
+    df, complete = read_head(input_path, n_rows, sheet_name)
+    return df, complete, "head"
+
+
+def estimate_distinct(group_sizes: np.ndarray, population_rows: float) -> float:
+    """
+    Estimate the number of distinct groups in a population from a row sample.
+    
+    Uses the GEE estimator (Charikar et al., 2000): groups seen more than
+    once in the sample are mostly the population's large groups and are
+    counted once, while groups seen once stand for sqrt(N/n) groups each.
+    Duplicates do not scale linearly with the sample (a sample of a file
+    with few distinct contacts already contains most of them), so scaling
+    sample counts up over-estimates distinct rows.
+    
+    Args:
+        group_sizes: Sample rows in each group seen in the sample
+        population_rows: Rows in the population (N)
+    
+    Returns:
+        Estimated distinct groups, between the sample's and population_rows
+    
+    Example:
+        >>> estimate_distinct(np.array([5, 5, 1]), 1000)
+        11.53...
+    """
+    sample_rows = int(group_sizes.sum())
+    if sample_rows == 0:
+        return 0.0
+    
+    singletons = int((group_sizes == 1).sum())
+    repeated = int((group_sizes > 1).sum())
+    ratio = max(population_rows / sample_rows, 1.0)
+    
+    return float(min(math.sqrt(ratio) * singletons + repeated, max(population_rows, len(group_sizes))))
+
+
+def _duplicate_groups(provenance: RowProvenance) -> np.ndarray:
+    """Return sample rows per duplicate group (kept row and its dropped duplicates)."""
+    anchors = np.where(provenance.duplicate_of >= 0, provenance.duplicate_of, np.arange(len(provenance)))
+    return np.bincount(anchors)[np.unique(anchors)]
+
+
+def preview_contacts_file(
+    input_path: str,
+    settings: Settings,
+    n_rows: int = PREVIEW_ROWS,
+    sample: str = "head",
+    sheet_name: str | None = None
+) -> tuple[pd.DataFrame, PreviewEstimate]:
+    """
+    Clean a sample of a file and estimate the full file's stats and runtime.
+    
+    Counts are scaled from the sample to the estimated row count (see
+    planner.estimate_rows), except duplicates: final rows are estimated
+    from how often each duplicate group recurs in the sample (see
+    estimate_distinct), which assumes the sample is spread over the file
+    (stratified) rather than its head. Runtime is the sample's load and cleaning time
+    scaled linearly, plus FUZZY_SECONDS_PER_PAIR for every name pair when
+    fuzzy dedup is enabled (an upper bound: names that matched are not
+    compared again).
+    
+    Args:
+        input_path: Path to input file
+        settings: Configuration settings
+        n_rows: Rows in the preview sample
+        sample: "head" (first rows) or "stratified" (rows spread over the file)
+        sheet_name: Excel sheet to preview (default: first sheet)
+    
+    Returns:
+        Tuple of (cleaned sample, PreviewEstimate)
+    
+    Example:
+        >>> preview_df, estimate = preview_contacts_file("upload.csv", settings, sample="stratified")
+        >>> estimate.estimated_rows_final, estimate.estimated_seconds
+        (812000, 41.5)
+    """
+    started = time.perf_counter()
+    
+    df, complete, method = read_preview_rows(input_path, n_rows, sample, sheet_name)
+    load_seconds = time.perf_counter() - started
+    estimated_rows = planner.estimate_rows(input_path, df, complete)
+    
+    # Samples are small: run the in-memory pipeline whatever the memory budget
+    profiler = PipelineProfiler()
+    sample_settings = settings.model_copy(update={"MAX_MEMORY_MB": 0})
+    provenance = RowProvenance()
+    cleaned_df, sample_stats = clean_contacts_df(df, sample_settings, profiler=profiler, provenance=provenance)
+    
+    scale = estimated_rows / len(df) if len(df) else 0.0
+    
+    # Distinct contacts, then the share of them dropped as empty
+    groups = _duplicate_groups(provenance)
+    distinct = len(groups) if complete else estimate_distinct(groups, estimated_rows)
+    empty_share = sample_stats.empty_rows_removed / len(groups) if len(groups) else 0.0
+    estimated_empty = distinct * empty_share
+    pipeline_seconds = sum(entry["seconds"] for entry in profiler.steps)
+    
+    # Every step is linear in the rows but fuzzy matching, which compares name pairs
+    estimated_seconds = (load_seconds + pipeline_seconds) * scale
+    if settings.ENABLE_FUZZY_DEDUP and not complete:
+        estimated_seconds += FUZZY_SECONDS_PER_PAIR * estimated_rows * (estimated_rows - 1) / 2
+    
+    estimate = PreviewEstimate(
+        sample=method,
+        sample_rows=len(df),
+        estimated_rows=estimated_rows,
+        exact=complete,
+        stats=sample_stats,
+        estimated_rows_final=round(distinct - estimated_empty),
+        estimated_duplicates_removed=round(estimated_rows - distinct),
+        estimated_empty_rows_removed=round(estimated_empty),
+        estimated_invalid_phones=round(sample_stats.invalid_phones * scale),
+        estimated_invalid_emails=round(sample_stats.invalid_emails * scale),
+        preview_seconds=round(time.perf_counter() - started, 3),
+        estimated_seconds=round(estimated_seconds, 1)
+    )
+    
+    logger.info(
+        f"Preview of {input_path}: {estimate.sample_rows} {method} rows in {estimate.preview_seconds:.2f}s; "
+        f"estimated {estimate.estimated_rows_final} of ~{estimated_rows} rows kept, "
+        f"~{estimate.estimated_seconds:.0f}s to clean{' (exact)' if complete else ''}"
+    )
+    
+    return cleaned_df, estimate
+
@@ -0,0 +1,304 @@
+"""
+Profiling for DataPurity Core
+=============================
+
+Per-step wall time and memory of the cleaning pipeline, plus function-level
+hotspot reports (cProfile, or a stack sampler for speedscope output).
+"""
+
+import cProfile
+import io
+import json
+import logging
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+PROFILE_FORMATS = ["text", "json", "speedscope"]
+
+# Number of functions listed in text/json reports
+TOP_FUNCTIONS = 40
+
+# Seconds between stack samples for speedscope reports
+SAMPLE_INTERVAL = 0.005
+
+_MB = 1024 * 1024
+
+
+class PipelineProfiler:
+    """
+    Lap timer for pipeline steps.
+    
+    Each call to `step()` closes the previous step and opens a new one,
+    recording its wall time and, when tracemalloc is tracing, the traced
+    memory at the end of the step and the peak during it.
+    
+    Example:
+        >>> profiler = PipelineProfiler()
+        >>> cleaned_df, stats = clean_contacts_df(df, settings, profiler=profiler)
+        >>> profiler.steps[0]["step"], profiler.steps[0]["seconds"]
+        ('normalize_column_names', 0.004)
+    """
+    
+    def __init__(self):
+        self.steps: list[dict] = []
+        self._origin = time.perf_counter()
+        self._current: tuple[str, float] | None = None
+    
+    def step(self, name: str) -> None:
+        """
+        Start timing a new step (ends the current one).
+        
+        Args:
+            name: Step name
+        """
+        self.finish()
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        self._current = (name, time.perf_counter())
+    
+    def finish(self) -> None:
+        """End the current step, if any."""
+        if self._current is None:
+            return
+        
+        name, started = self._current
+        ended = time.perf_counter()
+        entry = {
+            "step": name,
+            "start": round(started - self._origin, 6),
+            "seconds": round(ended - started, 6),
+        }
+        
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            entry["memory_mb"] = round(current / _MB, 2)
+            entry["peak_memory_mb"] = round(peak / _MB, 2)
+        
+        self.steps.append(entry)
+        self._current = None
+
+
+class _NullProfiler:
+    """No-op stand-in used when profiling is off."""
+    
+    def step(self, name: str) -> None:
+        pass
+    
+    def finish(self) -> None:
+        pass
+
+
+NULL_PROFILER = _NullProfiler()
+
+
+class StackSampler:
+    """
+    Sampling profiler for one thread, using only the standard library.
+    
+    A background thread records the target thread's call stack every
+    `interval` seconds. Overhead is independent of how many Python calls the
+    pipeline makes, unlike cProfile.
+    """
+    
+    def __init__(self, interval: float = SAMPLE_INTERVAL, thread_id: int | None = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.frames: list[dict] = []
+        self.samples: list[list[int]] = []
+        self.weights: list[float] = []
+        self._frame_index: dict[tuple, int] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+    
+    def _frame_id(self, code) -> int:
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        if key not in self._frame_index:
+            self._frame_index[key] = len(self.frames)
+            self.frames.append({"name": code.co_name, "file": code.co_filename, "line": code.co_firstlineno})
+        return self._frame_index[key]
+    
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                continue
+            
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_id(frame.f_code))
+                frame = frame.f_back
+            
+            self.samples.append(stack[::-1])
+            self.weights.append(now - last)
+            last = now
+    
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="datapurity-sampler", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+class ProfileSession:
+    """
+    Profile a block of code and write a report.
+    
+    Combines per-step timings (`session.pipeline`, passed to
+    clean_contacts_df) with a function-level profile: cProfile for text/json,
+    a stack sampler for speedscope.
+    
+    Example:
+        >>> with ProfileSession("json") as session:
+        ...     cleaned_df, stats = clean_contacts_df(df, settings, profiler=session.pipeline)
+        >>> session.write_report("profile.json")
+    """
+    
+    def __init__(self, profile_format: str = "text", trace_memory: bool = True):
+        """
+        Args:
+            profile_format: "text", "json" or "speedscope"
+            trace_memory: Record per-step memory with tracemalloc (slower)
+        """
+        if profile_format not in PROFILE_FORMATS:
+            raise ValueError(f"Unsupported profile format: {profile_format}. Supported: {PROFILE_FORMATS}")
+        
+        self.profile_format = profile_format
+        self.trace_memory = trace_memory
+        self.pipeline = PipelineProfiler()
+        self.seconds = 0.0
+        self._cprofile: cProfile.Profile | None = None
+        self._sampler: StackSampler | None = None
+        self._started = 0.0
+    
+    def __enter__(self) -> "ProfileSession":
+        if self.trace_memory:
+            tracemalloc.start()
+        
+        if self.profile_format == "speedscope":
+            self._sampler = StackSampler()
+            self._sampler.start()
+        else:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        
+        self._started = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.seconds = time.perf_counter() - self._started
+        self.pipeline.finish()
+        
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+        if self.trace_memory:
+            tracemalloc.stop()
+    
+    def _top_functions(self) -> list[dict]:
+        stats = pstats.Stats(self._cprofile)
+        rows = []
+        for (filename, line, name), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+            rows.append({
+                "function": name,
+                "file": filename,
+                "line": line,
+                "ncalls": ncalls,
+                "tottime": round(tottime, 6),
+                "cumtime": round(cumtime, 6),
+            })
+        rows.sort(key=lambda r: r["cumtime"], reverse=True)
+        return rows[:TOP_FUNCTIONS]
+    
+    def _text_report(self) -> str:
+        out = io.StringIO()
+        out.write(f"DataPurity profile — total {self.seconds:.3f}s\n\n")
+        out.write(f"{'step':<32}{'seconds':>10}{'memory MB':>12}{'peak MB':>10}\n")
+        out.write("-" * 64 + "\n")
+        for entry in self.pipeline.steps:
+            out.write(
+                f"{entry['step']:<32}{entry['seconds']:>10.3f}"
+                f"{entry.get('memory_mb', float('nan')):>12.1f}{entry.get('peak_memory_mb', float('nan')):>10.1f}\n"
+            )
+        out.write("\nTop functions by cumulative time\n\n")
+        stats = pstats.Stats(self._cprofile, stream=out)
+        stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        return out.getvalue()
+    
+    def _json_report(self) -> dict:
+        return {
+            "total_seconds": round(self.seconds, 6),
+            "steps": self.pipeline.steps,
+            "functions": self._top_functions(),
+        }
+    
+    def _speedscope_report(self) -> dict:
+        sampler = self._sampler
+        frames = list(sampler.frames)
+        
+        # Pipeline steps as an evented profile alongside the samples
+        step_events = []
+        for entry in self.pipeline.steps:
+            frames.append({"name": f"step: {entry['step']}"})
+            frame_id = len(frames) - 1
+            step_events.append({"type": "O", "frame": frame_id, "at": entry["start"]})
+            step_events.append({"type": "C", "frame": frame_id, "at": entry["start"] + entry["seconds"]})
+        
+        end = max([self.seconds] + [event["at"] for event in step_events])
+        
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": "DataPurity profile",
+            "exporter": "datapurity_core.profiling",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": "main thread (sampled)",
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": round(sum(sampler.weights), 6),
+                    "samples": sampler.samples,
+                    "weights": sampler.weights,
+                },
+                {
+                    "type": "evented",
+                    "name": "pipeline steps",
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": round(end, 6),
+                    "events": step_events,
+                },
+            ],
+        }
+    
+    def write_report(self, report_path: str) -> None:
+        """
+        Write the report in the session's format.
+        
+        Args:
+            report_path: Output file path
+        """
+        path = Path(report_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        if self.profile_format == "text":
+            path.write_text(self._text_report(), encoding="utf-8")
+        elif self.profile_format == "json":
+            path.write_text(json.dumps(self._json_report(), indent=2), encoding="utf-8")
+        else:
+            path.write_text(json.dumps(self._speedscope_report()), encoding="utf-8")
+        
+        logger.info(f"Wrote {self.profile_format} profile to {report_path}")
@@ -7,6 +7,7 @@ Functions for building cleaning statistics.
 
 import logging
 from typing import Any
+import numpy as np
 import pandas as pd
 
 from datapurity_core.models import CleaningStats
@@ -14,6 +15,160 @@ from datapurity_core.models import CleaningStats
 logger = logging.getLogger(__name__)
 
 
+# Columns with per-column null counts in CleaningStats
+TRACKED_COLUMNS = ["name", "phone", "email", "company", "job_title", "city", "notes"]
+
+# Column → validity flag column, for per-column valid counts
+VALID_FLAG_COLUMNS = {"phone": "phone_valid", "email": "email_valid"}
+
+
+def missing_count(values: pd.Series) -> int:
+    """
+    Count missing values: NaN/None, and empty or blank strings.
+    
+    Text columns are cleaned to "" rather than NaN, so both count as missing.
+    
+    Args:
+        values: Column values
+        
+    Returns:
+        Number of missing values
+        
+    Example:
+        >>> missing_count(pd.Series(["Engineer", "", None, "  "]))
+        3
+    """
+    missing = values.isna().to_numpy(dtype=bool)
+    
+    if not (pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values)):
+        blank = values.astype("string").str.strip().eq("")
+        missing = missing | blank.to_numpy(dtype=bool, na_value=False)
+    
+    return int(missing.sum())
+
+
+class StatsAccumulator:
+    """
+    Mergeable, single-pass counters behind CleaningStats.
+    
+    Each pipeline step reports its row counts as it goes, and the final rows
+    are folded in chunk by chunk, so no intermediate DataFrame has to be
+    kept. All state is integer/float NumPy counters: accumulators built on
+    different chunks, sheets or workers combine with `merge`, which is
+    associative and commutative.
+    
+    Example:
+        >>> acc = StatsAccumulator()
+        >>> acc.observe_input(len(df))
+        >>> acc.observe_deduplicated(len(df_after_drop))
+        >>> acc.observe_final(df_final)
+        >>> total = acc.merge(other_chunk_acc).to_stats()
+    """
+    
+    # Integer counter slots
+    ROWS_ORIGINAL = 0
+    ROWS_AFTER_DROP = 1
+    ROWS_FINAL = 2
+    FUZZY_CLUSTERS = 3
+    
+    def __init__(self):
+        self.counts = np.zeros(4, dtype=np.int64)
+        self.null_counts = np.zeros(len(TRACKED_COLUMNS), dtype=np.int64)
+        self.valid_counts = np.zeros(len(VALID_FLAG_COLUMNS), dtype=np.int64)
+        self.score_sum = np.zeros(1, dtype=np.float64)
+    
+    def observe_input(self, rows: int) -> None:
+        """Count rows entering the pipeline."""
+        self.counts[self.ROWS_ORIGINAL] += rows
+    
+    def observe_deduplicated(self, rows: int) -> None:
+        """Count rows left after hard duplicate removal."""
+        self.counts[self.ROWS_AFTER_DROP] += rows
+    
+    def observe_fuzzy_clusters(self, clusters: int) -> None:
+        """Count fuzzy duplicate groups."""
+        self.counts[self.FUZZY_CLUSTERS] += clusters
+    
+    def observe_final(self, df: pd.DataFrame) -> None:
+        """
+        Fold final (cleaned) rows into the counters.
+        
+        Args:
+            df: Final rows, or a chunk of them
+        """
+        rows = len(df)
+        self.counts[self.ROWS_FINAL] += rows
+        
+        for i, column in enumerate(TRACKED_COLUMNS):
+            self.null_counts[i] += missing_count(df[column]) if column in df.columns else rows
+        
+        for i, flag in enumerate(VALID_FLAG_COLUMNS.values()):
+            if flag in df.columns:
+                self.valid_counts[i] += int(df[flag].to_numpy(dtype=bool, na_value=False).sum())
+        
+        if "quality_score" in df.columns and rows:
+            self.score_sum[0] += df["quality_score"].to_numpy(dtype=np.float64, na_value=0.0).sum()
+    
+    def merge(self, other: "StatsAccumulator") -> "StatsAccumulator":
+        """
+        Add another accumulator's counters into this one.
+        
+        Args:
+            other: Accumulator from another chunk, sheet or worker
+            
+        Returns:
+            self, for chaining
+        """
+        self.counts += other.counts
+        self.null_counts += other.null_counts
+        self.valid_counts += other.valid_counts
+        self.score_sum += other.score_sum
+        return self
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize to plain lists (JSON-safe)."""
+        return {
+            "counts": self.counts.tolist(),
+            "null_counts": self.null_counts.tolist(),
+            "valid_counts": self.valid_counts.tolist(),
+            "score_sum": float(self.score_sum[0]),
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "StatsAccumulator":
+        """Rebuild an accumulator serialized with to_dict."""
+        acc = cls()
+        acc.counts[:] = data["counts"]
+        acc.null_counts[:] = data["null_counts"]
+        acc.valid_counts[:] = data["valid_counts"]
+        acc.score_sum[0] = data["score_sum"]
+        return acc
+    
+    def to_stats(self) -> CleaningStats:
+        """
+        Build CleaningStats from the counters.
+        
+        Returns:
+            CleaningStats, including per-column null and valid counts
+        """
+        rows_original, rows_after_drop, rows_final, fuzzy_clusters = (int(c) for c in self.counts)
+        valid = dict(zip(VALID_FLAG_COLUMNS, (int(c) for c in self.valid_counts)))
+        
+        return CleaningStats(
+            rows_original=rows_original,
+            rows_after_drop_duplicates=rows_after_drop,
+            rows_final=rows_final,
+            duplicates_removed=rows_original - rows_after_drop,
+            empty_rows_removed=rows_after_drop - rows_final,
+            invalid_phones=rows_final - valid["phone"],
+            invalid_emails=rows_final - valid["email"],
+            avg_quality_score=float(self.score_sum[0] / rows_final) if rows_final else 0.0,
+            fuzzy_duplicate_clusters=fuzzy_clusters,
+            null_counts=dict(zip(TRACKED_COLUMNS, (int(c) for c in self.null_counts))),
+            valid_counts=valid
+        )
+
+
 def build_stats(
     df_original: pd.DataFrame,
     df_after_drop_duplicates: pd.DataFrame,
@@ -22,7 +177,11 @@ def build_stats(
     email_valid_flags: list[bool]
 ) -> CleaningStats:
     """
-    Build comprehensive cleaning statistics.
+    Build comprehensive cleaning statistics from whole DataFrames.
+    
+    A thin wrapper over StatsAccumulator, kept for existing callers; for
+    chunked or parallel runs use StatsAccumulator directly, which needs
+    neither the original frame nor Python lists of flags.
     
     Args:
         df_original: Original DataFrame before cleaning
@@ -43,46 +202,34 @@ def build_stats(
         ... })
         >>> stats = build_stats(df_orig, df_after_drop, df_final, [True, False], [True, True])
     """
-    # Basic counts
-    rows_original = len(df_original)
-    rows_after_drop = len(df_after_drop_duplicates)
-    rows_final = len(df_final)
-    duplicates_removed = rows_original - rows_after_drop
-    empty_rows_removed = rows_after_drop - rows_final
-    
-    # Validation counts
-    phone_valid_count = sum(phone_valid_flags) if phone_valid_flags else 0
-    phone_invalid_count = len(phone_valid_flags) - phone_valid_count if phone_valid_flags else 0
-    
-    email_valid_count = sum(email_valid_flags) if email_valid_flags else 0
-    email_invalid_count = len(email_valid_flags) - email_valid_count if email_valid_flags else 0
-    
-    # Quality scores
-    avg_quality_score = 0.0
-    if "quality_score" in df_final.columns and len(df_final) > 0:
-        avg_quality_score = float(df_final["quality_score"].mean())
-    
-    stats = CleaningStats(
-        rows_original=rows_original,
-        rows_after_drop_duplicates=rows_after_drop,
-        rows_final=rows_final,
-        duplicates_removed=duplicates_removed,
-        empty_rows_removed=empty_rows_removed,
-        invalid_phones=phone_invalid_count,
-        invalid_emails=email_invalid_count,
-        avg_quality_score=avg_quality_score,
-        fuzzy_duplicate_clusters=0  # Updated by deduplication module if needed
-    )
+    acc = StatsAccumulator()
+    acc.observe_input(len(df_original))
+    acc.observe_deduplicated(len(df_after_drop_duplicates))
+    acc.observe_final(df_final)
     
-    logger.info("Statistics computed:")
-    logger.info(f"  - Original rows: {rows_original}")
-    logger.info(f"  - Final rows: {rows_final}")
-    logger.info(f"  - Duplicates removed: {duplicates_removed}")
-    logger.info(f"  - Empty rows removed: {empty_rows_removed}")
-    logger.info(f"  - Valid phones: {phone_valid_count}")
-    logger.info(f"  - Invalid phones: {phone_invalid_count}")
-    logger.info(f"  - Valid emails: {email_valid_count}")
-    logger.info(f"  - Invalid emails: {email_invalid_count}")
-    logger.info(f"  - Avg quality score: {avg_quality_score:.1f}")
+    # Validity comes from the flags passed in, not from df_final's columns
+    stats = acc.to_stats()
+    stats.invalid_phones = len(phone_valid_flags) - sum(phone_valid_flags)
+    stats.invalid_emails = len(email_valid_flags) - sum(email_valid_flags)
+    stats.valid_counts.update(phone=sum(phone_valid_flags), email=sum(email_valid_flags))
+    
+    log_stats(stats)
     
     return stats
+
+
+def log_stats(stats: CleaningStats) -> None:
+    """Log a summary of cleaning statistics."""
+    logger.info("Statistics computed:")
+    logger.info(f"  - Original rows: {stats.rows_original}")
+    logger.info(f"  - Final rows: {stats.rows_final}")
+    logger.info(f"  - Duplicates removed: {stats.duplicates_removed}")
+    logger.info(f"  - Empty rows removed: {stats.empty_rows_removed}")
+    logger.info(f"  - Valid phones: {stats.rows_final - stats.invalid_phones}")
+    logger.info(f"  - Invalid phones: {stats.invalid_phones}")
+    logger.info(f"  - Valid emails: {stats.rows_final - stats.invalid_emails}")
+    logger.info(f"  - Invalid emails: {stats.invalid_emails}")
+    logger.info(f"  - Avg quality score: {stats.avg_quality_score:.1f}")
+    if stats.row_limit is not None:
+        left_out = stats.rows_over_limit if stats.rows_over_limit is not None else "unknown number of"
+        logger.info(f"  - Truncated to row limit {stats.row_limit} ({left_out} rows left out)")
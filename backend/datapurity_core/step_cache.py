@@ -0,0 +1,192 @@
+"""
+Step Cache for DataPurity Core
+==============================
+
+Caches the outputs of individual pipeline steps so a re-run after a settings
+change only recomputes the steps that change actually affects.
+
+Each entry is keyed on the engine fingerprint (see cache.engine_fingerprint),
+a fingerprint of the step's input values plus only the settings that step
+reads: moving FUZZY_NAME_THRESHOLD does not touch the
+cached phone normalization (keyed on the phone column and
+DEFAULT_COUNTRY_CODE).
+
+Fuzzy matching caches its candidate pair list with scores, computed down to
+a floor below the configured threshold, so a threshold change is a filter
+over the stored pairs instead of a new all-pairs comparison.
+
+Entries are pickle files and loading a pickle can run arbitrary code, so
+the cache directory must be trusted: never point a StepCache at a
+directory other users or uploads can write to.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+import numpy as np
+import pandas as pd
+
+from datapurity_core.cache import engine_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_STEP_CACHE_MAX_MB = 512
+
+# Fuzzy pairs are stored down to this score, so thresholds at or above it
+# are served from the same entry
+DEFAULT_FUZZY_PAIR_FLOOR = 70
+
+
+def fingerprint(values: pd.DataFrame | pd.Series | list) -> str:
+    """
+    Return a content hash of a step's input values (the index is ignored).
+    
+    Args:
+        values: DataFrame, Series or list of values
+    
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    
+    if isinstance(values, pd.DataFrame):
+        digest.update(json.dumps([str(c) for c in values.columns]).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(values, index=False).to_numpy().tobytes())
+    elif isinstance(values, pd.Series):
+        digest.update(pd.util.hash_pandas_object(values, index=False).to_numpy().tobytes())
+    else:
+        digest.update(pd.util.hash_array(np.asarray(values, dtype=object)).tobytes())
+    
+    digest.update(str(len(values)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class NullStepCache:
+    """Step cache that caches nothing; every step is computed."""
+    
+    fuzzy_pair_floor = 100
+    
+    def cached(self, step: str, values, settings_read: dict[str, Any], compute: Callable[[], Any]) -> Any:
+        return compute()
+
+
+NULL_STEP_CACHE = NullStepCache()
+
+
+class StepCache:
+    """
+    On-disk cache of pipeline step outputs, bounded in size (LRU).
+    
+    Entries are loaded with pickle: only use a directory that nobody
+    untrusted can write to.
+    
+    Example:
+        >>> step_cache = StepCache(".datapurity_steps")
+        >>> df1, _ = clean_contacts_df(df, settings, step_cache=step_cache)
+        >>> settings.FUZZY_NAME_THRESHOLD = 85
+        >>> df2, _ = clean_contacts_df(df, settings, step_cache=step_cache)  # only re-filters fuzzy pairs
+    """
+    
+    def __init__(
+        self,
+        cache_dir: str,
+        max_mb: int = DEFAULT_STEP_CACHE_MAX_MB,
+        fuzzy_pair_floor: int = DEFAULT_FUZZY_PAIR_FLOOR
+    ):
+        """
+        Args:
+            cache_dir: Directory holding the entries (created if needed)
+            max_mb: Total size bound; least recently used entries are evicted
+            fuzzy_pair_floor: Lowest score kept in cached fuzzy pair lists
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_mb * 1024 * 1024
+        self.fuzzy_pair_floor = fuzzy_pair_floor
+        self.hits = 0
+        self.misses = 0
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    def key(self, step: str, values, settings_read: dict[str, Any]) -> str:
+        """Build the key of a step run: engine, step name, input fingerprint and settings read."""
+        parts = [engine_fingerprint(), step, fingerprint(values), json.dumps(settings_read, sort_keys=True, default=str)]
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+    
+    def cached(self, step: str, values, settings_read: dict[str, Any], compute: Callable[[], Any]) -> Any:
+        """
+        Return a step's cached output, or compute and store it.
+        
+        Args:
+            step: Step name
+            values: The step's input values
+            settings_read: The settings (and parameters) the step reads
+            compute: Computes the output on a miss; the output must be picklable
+        
+        Returns:
+            Step output
+        """
+        path = self.cache_dir / f"{step}-{self.key(step, values, settings_read)}.pkl"
+        
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+            os.utime(path)
+            self.hits += 1
+            logger.info(f"Step cache hit: {step}")
+            return result
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+        
+        result = compute()
+        self.misses += 1
+        
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        
+        self.evict()
+        return result
+    
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache fits its bound.
+        
+        Returns:
+            Number of entries removed
+        """
+        entries = []
+        for path in self.cache_dir.glob("*.pkl"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        
+        return removed
+    
+    def clear(self) -> int:
+        """
+        Remove every entry.
+        
+        Returns:
+            Number of entries removed
+        """
+        paths = list(self.cache_dir.glob("*.pkl"))
+        for path in paths:
+            path.unlink(missing_ok=True)
+        return len(paths)
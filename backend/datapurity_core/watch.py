@@ -0,0 +1,377 @@
+"""
+Watch-Folder Mode for DataPurity Core
+=====================================
+
+Long-running ingestion: new files dropped into an input directory are
+cleaned as they arrive by a pool of warm worker processes.
+
+File arrival is detected with inotify when the optional `inotify_simple`
+package is available (Linux), otherwise by polling the directory and waiting
+for each file's size and mtime to settle.
+"""
+
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from datapurity_core.config import Settings
+from datapurity_core.models import FileResult
+from datapurity_core.batch import (
+    _clean_file_task,
+    append_batch_summary,
+    discover_inputs,
+    is_supported_input,
+    output_path_for,
+    output_paths_for,
+    warm_worker,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Seconds between directory scans (polling) or event reads (inotify)
+WATCH_POLL_INTERVAL = 1.0
+
+# Polling: a file is picked up once its size and mtime are unchanged this long
+SETTLE_SECONDS = 2.0
+
+# Files submitted to the pool at once, per worker; the rest wait in the backlog
+PENDING_PER_WORKER = 2
+
+# Record, in the output directory, of the input signature each output was cleaned from
+MANIFEST_FILE = ".watch_manifest.json"
+
+
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    """Return (size, mtime_ns) of a file, or None if it disappeared."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+class PollingWatcher:
+    """
+    Detect finished files by scanning a directory.
+    
+    A file is reported once its size and mtime have not changed for
+    `settle_seconds`, so files still being copied in are not picked up.
+    """
+    
+    def __init__(self, input_dir: str, interval: float = WATCH_POLL_INTERVAL, settle_seconds: float = SETTLE_SECONDS):
+        self.input_dir = Path(input_dir)
+        self.interval = interval
+        self.settle_seconds = settle_seconds
+        self._changes: dict[Path, tuple[tuple[int, int], float]] = {}
+        self._reported: dict[Path, tuple[int, int]] = {}
+    
+    def poll(self, stop_event: threading.Event) -> list[Path]:
+        """Wait one interval and return files that have settled since the last report."""
+        stop_event.wait(self.interval)
+        
+        now = time.monotonic()
+        ready = []
+        seen = set()
+        
+        for path in self.input_dir.iterdir():
+            if not path.is_file() or not is_supported_input(path):
+                continue
+            
+            signature = _file_signature(path)
+            if signature is None:
+                continue
+            
+            seen.add(path)
+            previous = self._changes.get(path)
+            if previous is None or previous[0] != signature:
+                self._changes[path] = (signature, now)
+            elif now - previous[1] >= self.settle_seconds and self._reported.get(path) != signature:
+                self._reported[path] = signature
+                ready.append(path)
+        
+        # Forget files that were removed (e.g. moved away once cleaned)
+        for path in self._changes.keys() - seen:
+            del self._changes[path]
+            self._reported.pop(path, None)
+        
+        return sorted(ready)
+    
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """
+    Detect finished files with inotify (requires `inotify_simple`).
+    
+    Reports files on close-after-write and on rename into the directory,
+    which covers both direct writes and atomic `mv` drops.
+    """
+    
+    def __init__(self, input_dir: str, interval: float = WATCH_POLL_INTERVAL):
+        from inotify_simple import INotify, flags
+        
+        self.input_dir = Path(input_dir)
+        self.interval = interval
+        self._inotify = INotify()
+        self._inotify.add_watch(str(self.input_dir), flags.CLOSE_WRITE | flags.MOVED_TO)
+    
+    def poll(self, stop_event: threading.Event) -> list[Path]:
+        """Return files written or moved in since the last call (waits up to one interval)."""
+        events = self._inotify.read(timeout=int(self.interval * 1000))
+        
+        ready = []
+        for event in events:
+            path = self.input_dir / event.name
+            if path not in ready and path.is_file() and is_supported_input(path):
+                ready.append(path)
+        
+        return ready
+    
+    def close(self) -> None:
+        self._inotify.close()
+
+
+def create_watcher(input_dir: str, interval: float = WATCH_POLL_INTERVAL, use_inotify: bool = True):
+    """
+    Create an inotify watcher if available, otherwise a polling watcher.
+    
+    Args:
+        input_dir: Directory to watch (non-recursive)
+        interval: Poll/read interval in seconds
+        use_inotify: Try inotify first
+    
+    Returns:
+        InotifyWatcher or PollingWatcher
+    """
+    if use_inotify:
+        try:
+            watcher = InotifyWatcher(input_dir, interval)
+            logger.info(f"Watching {input_dir} with inotify")
+            return watcher
+        except (ImportError, OSError) as e:
+            logger.info(f"inotify unavailable ({e}); falling back to polling")
+    
+    logger.info(f"Watching {input_dir} by polling every {interval}s")
+    return PollingWatcher(input_dir, interval)
+
+
+def _watch_worker_init() -> None:
+    """
+    Warm a watch worker and leave shutdown to the parent.
+    
+    SIGINT/SIGTERM sent to the whole process group must not kill workers
+    mid-file; the parent stops taking files and drains the pool instead.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    warm_worker()
+
+
+def _start_pool(workers: int) -> ProcessPoolExecutor:
+    """Start a pool of warm watch workers."""
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_watch_worker_init)
+    # Start every worker now so the first files do not pay for warm-up
+    wait([executor.submit(os.getpid) for _ in range(workers)])
+    return executor
+
+
+def _restart_pool(executor: ProcessPoolExecutor, workers: int) -> ProcessPoolExecutor:
+    """Replace a broken pool with a fresh one."""
+    executor.shutdown(wait=False, cancel_futures=True)
+    logger.warning(f"Worker pool broke; starting {workers} new workers")
+    return _start_pool(workers)
+
+
+def load_manifest(manifest_path: Path) -> dict[str, tuple[int, int]]:
+    """Return the recorded {input path: (size, mtime_ns)} of cleaned files."""
+    try:
+        entries = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {path: tuple(signature) for path, signature in entries.items()}
+
+
+def save_manifest(manifest_path: Path, manifest: dict[str, tuple[int, int]]) -> None:
+    """Write the manifest atomically, dropping inputs that no longer exist."""
+    entries = {path: list(signature) for path, signature in manifest.items() if os.path.exists(path)}
+    tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    tmp_path.write_text(json.dumps(entries, indent=2), encoding="utf-8")
+    os.replace(tmp_path, manifest_path)
+
+
+def watch_folder(
+    input_dir: str,
+    output_dir: str,
+    settings: Settings,
+    max_workers: int | None = None,
+    output_format: str | None = None,
+    max_pending: int | None = None,
+    poll_interval: float = WATCH_POLL_INTERVAL,
+    summary_path: str | None = None,
+    stop_event: threading.Event | None = None,
+    use_inotify: bool = True
+) -> int:
+    """
+    Clean files as they arrive in `input_dir` until `stop_event` is set.
+    
+    Workers are started and warmed (phonenumbers metadata, regexes,
+    rapidfuzz) before watching begins, so per-file latency is processing
+    time only. At most `max_pending` files are in the pool at once; further
+    arrivals wait in a backlog. Files already in `input_dir` without an
+    up-to-date output are cleaned on startup once they have settled for
+    SETTLE_SECONDS, and a file is cleaned again if it changes. Whether a
+    file is up to date is decided by the size and mtime it had when it was
+    cleaned (recorded in MANIFEST_FILE in `output_dir`), not by comparing
+    mtimes, so a new version moved in with an older mtime (`mv`, `cp -p`) is
+    still cleaned. Outputs are renamed into place once complete. If a worker
+    dies (e.g. OOM-killed), the files in flight are recorded as failed and
+    the pool is restarted.
+    
+    Args:
+        input_dir: Directory to watch (non-recursive)
+        output_dir: Directory for cleaned files
+        settings: Configuration settings
+        max_workers: Worker processes (default: CPU count)
+        output_format: Output suffix without dot (default: same as input)
+        max_pending: Files in flight at once (default: 2 per worker)
+        poll_interval: Poll/read interval in seconds
+        summary_path: CSV to append one row per file to
+            (default: <output_dir>/watch_summary.csv)
+        stop_event: Set to stop; in-flight files are finished first
+        use_inotify: Use inotify when available
+    
+    Returns:
+        Number of files processed
+    
+    Raises:
+        ValueError: If input and output directories are the same
+    
+    Example:
+        >>> stop = threading.Event()
+        >>> watch_folder("incoming/", "cleaned/", settings, max_workers=4, stop_event=stop)
+    """
+    if Path(input_dir).resolve() == Path(output_dir).resolve():
+        raise ValueError("Input and output directories must differ")
+    
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    stop_event = stop_event or threading.Event()
+    summary_path = summary_path or str(Path(output_dir) / "watch_summary.csv")
+    workers = max(1, max_workers or os.cpu_count() or 1)
+    max_pending = max(1, max_pending or workers * PENDING_PER_WORKER)
+    
+    backlog: deque[Path] = deque()
+    # In-flight futures: (input, output, pool generation, input signature when queued)
+    pending: dict[Future, tuple[Path, Path, int, tuple[int, int]]] = {}
+    # Signature of each file queued, in flight or failed (pruned once gone)
+    scheduled: dict[Path, tuple[int, int]] = {}
+    manifest_path = Path(output_dir) / MANIFEST_FILE
+    manifest = load_manifest(manifest_path)
+    processed = 0
+    
+    def output_for(path: Path) -> Path:
+        # Same naming as a batch over the files currently sharing this output
+        output_path = output_path_for(path, output_dir, output_format)
+        siblings = [
+            other for other in discover_inputs(input_dir)
+            if other != path and output_path_for(other, output_dir, output_format) == output_path
+        ]
+        return output_paths_for(siblings + [path], output_dir, output_format)[path]
+    
+    def enqueue(path: Path) -> None:
+        signature = _file_signature(path)
+        if signature is None or scheduled.get(path) == signature:
+            return
+        if manifest.get(str(path.resolve())) == signature and output_for(path).exists():
+            return
+        scheduled[path] = signature
+        backlog.append(path)
+    
+    def prune_scheduled() -> None:
+        in_flight = {path for path, _, _, _ in pending.values()} | set(backlog)
+        for path in [path for path in scheduled if path not in in_flight and not path.exists()]:
+            del scheduled[path]
+    
+    watcher = create_watcher(input_dir, poll_interval, use_inotify)
+    executor = _start_pool(workers)
+    generation = 0
+    logger.info(f"{workers} warm workers ready; cleaning {input_dir} → {output_dir}")
+    
+    try:
+        # Files already present may still be being copied in: only take those that settle
+        existing = {path: _file_signature(path) for path in discover_inputs(input_dir)}
+        if existing:
+            stop_event.wait(SETTLE_SECONDS)
+        for path, signature in existing.items():
+            if signature is not None and _file_signature(path) == signature:
+                enqueue(path)
+        
+        while not stop_event.is_set() or pending:
+            while backlog and len(pending) < max_pending and not stop_event.is_set():
+                path = backlog.popleft()
+                output_path = output_for(path)
+                try:
+                    future = executor.submit(_clean_file_task, str(path), str(output_path), settings)
+                except BrokenProcessPool:
+                    # Broke before its futures were collected; retry on a fresh pool
+                    backlog.appendleft(path)
+                    executor = _restart_pool(executor, workers)
+                    generation += 1
+                    continue
+                pending[future] = (path, output_path, generation, scheduled[path])
+            
+            if pending and (len(pending) >= max_pending or stop_event.is_set()):
+                # Saturated (or draining): wait for a worker instead of the directory
+                done, _ = wait(pending, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            else:
+                for path in watcher.poll(stop_event):
+                    enqueue(path)
+                prune_scheduled()
+                done = [future for future in pending if future.done()]
+            
+            broken = False
+            for future in done:
+                path, output_path, pool_generation, signature = pending.pop(future)
+                try:
+                    result = future.result()
+                except (BrokenProcessPool, CancelledError) as e:
+                    # A worker died (e.g. OOM-killed): every file in flight is lost
+                    broken = broken or pool_generation == generation
+                    result = FileResult(
+                        input_path=str(path), output_path=str(output_path),
+                        status="error", error=f"{type(e).__name__}: {e}"
+                    )
+                    logger.error(f"Worker pool crashed while cleaning {path.name}")
+                
+                if result.status == "ok":
+                    # Record the version that was cleaned; a changed file is cleaned again
+                    manifest[str(path.resolve())] = signature
+                    save_manifest(manifest_path, manifest)
+                    if scheduled.get(path) == signature:
+                        del scheduled[path]
+                
+                append_batch_summary(result, summary_path)
+                processed += 1
+                logger.info(
+                    f"{path.name}: {result.status} in {result.seconds:.2f}s "
+                    f"({len(pending)} in flight, {len(backlog)} queued)"
+                )
+            
+            if broken:
+                executor = _restart_pool(executor, workers)
+                generation += 1
+    finally:
+        watcher.close()
+        executor.shutdown(wait=True)
+    
+    logger.info(f"Watch stopped after {processed} files")
+    
+    return processed
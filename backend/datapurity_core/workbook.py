@@ -0,0 +1,145 @@
+"""
+Multi-Sheet Workbook Processing for DataPurity Core
+===================================================
+
+Functions for cleaning every sheet of a workbook in parallel worker processes,
+with hard deduplication across sheets.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import pandas as pd
+
+from datapurity_core.config import Settings
+from datapurity_core.models import CleaningStats, WorkbookStats
+from datapurity_core import cleaning, deduplication, io_utils, stats
+
+logger = logging.getLogger(__name__)
+
+
+def _clean_sheet(input_path: str, sheet_name: str, settings: Settings) -> tuple[pd.DataFrame, CleaningStats]:
+    """Load and clean a single sheet (runs in a worker process)."""
+    df = io_utils.load_contacts_file(input_path, sheet_name=sheet_name)
+    return cleaning.clean_contacts_df(df, settings)
+
+
+def _total_stats(
+    sheet_stats: list[CleaningStats],
+    frames: list[pd.DataFrame],
+    cross_sheet_removed: list[int]
+) -> CleaningStats:
+    """Combine per-sheet statistics into workbook-wide statistics."""
+    total = stats.StatsAccumulator()
+    
+    for sheet, df, removed in zip(sheet_stats, frames, cross_sheet_removed):
+        accumulator = stats.StatsAccumulator()
+        accumulator.observe_input(sheet.rows_original)
+        accumulator.observe_deduplicated(sheet.rows_after_drop_duplicates - removed)
+        accumulator.observe_fuzzy_clusters(sheet.fuzzy_duplicate_clusters)
+        accumulator.observe_final(df)
+        total.merge(accumulator)
+    
+    return total.to_stats()
+
+
+def clean_workbook(
+    input_path: str,
+    settings: Settings,
+    max_workers: int | None = None
+) -> tuple[dict[str, pd.DataFrame], WorkbookStats]:
+    """
+    Clean every sheet of a workbook in parallel.
+    
+    Each sheet is loaded and cleaned in its own worker process. Results are
+    then merged in sheet order through a shared HardDedupIndex, so a row whose
+    phone or email already appeared in an earlier sheet is removed.
+    
+    Args:
+        input_path: Path to Excel workbook
+        settings: Configuration settings
+        max_workers: Worker processes (default: one per sheet, up to CPU count)
+        
+    Returns:
+        Tuple of ({sheet_name: cleaned_df}, workbook_stats)
+        
+    Example:
+        >>> frames, stats = clean_workbook("branches.xlsx", get_settings())
+        >>> stats.total.rows_final
+        4210
+    """
+    sheet_names = io_utils.list_sheet_names(input_path)
+    
+    if not sheet_names:
+        return ({}, WorkbookStats())
+    
+    workers = max_workers or min(len(sheet_names), os.cpu_count() or 1)
+    logger.info(f"Cleaning {len(sheet_names)} sheets with {workers} workers: {sheet_names}")
+    
+    frames = {}
+    workbook_stats = WorkbookStats()
+    index = deduplication.HardDedupIndex()
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_clean_sheet, input_path, sheet_name, settings)
+            for sheet_name in sheet_names
+        ]
+        
+        # Merge in sheet order so earlier sheets win
+        for sheet_name, future in zip(sheet_names, futures):
+            df, sheet_stats = future.result()
+            
+            is_cross_dup = index.match(df)
+            index.add(df)
+            
+            df = df[~is_cross_dup].reset_index(drop=True)
+            df["id"] = df.index
+            
+            frames[sheet_name] = df
+            workbook_stats.sheets[sheet_name] = sheet_stats
+            workbook_stats.cross_sheet_duplicates[sheet_name] = int(is_cross_dup.sum())
+            
+            logger.info(
+                f"Sheet {sheet_name!r}: {sheet_stats.rows_final} rows, "
+                f"{workbook_stats.cross_sheet_duplicates[sheet_name]} cross-sheet duplicates removed"
+            )
+    
+    workbook_stats.total = _total_stats(
+        list(workbook_stats.sheets.values()),
+        list(frames.values()),
+        list(workbook_stats.cross_sheet_duplicates.values())
+    )
+    
+    return (frames, workbook_stats)
+
+
+def save_workbook_file(frames: dict[str, pd.DataFrame], output_path: str) -> None:
+    """
+    Save cleaned sheets.
+    
+    Excel output keeps one worksheet per input sheet (streamed in constant
+    memory). Other formats get a single table with a `sheet` column.
+    
+    Args:
+        frames: Cleaned DataFrames by sheet name
+        output_path: Path to output file
+    """
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    if path.suffix.lower() in [".xlsx", ".xls"]:
+        sheets = list(frames.items()) or [("Contacts", pd.DataFrame())]
+        with io_utils.ExcelStreamWriter(output_path, sheet_name=sheets[0][0]) as writer:
+            for i, (sheet_name, df) in enumerate(sheets):
+                if i > 0:
+                    writer.add_sheet(sheet_name)
+                writer.write(df)
+        return
+    
+    combined = pd.concat(
+        [df.assign(sheet=sheet_name) for sheet_name, df in frames.items()],
+        ignore_index=True
+    )
+    io_utils.save_contacts_file(combined, output_path)
@@ -0,0 +1,327 @@
+"""
+Multi-Format Output Writers for DataPurity Core
+===============================================
+
+Sinks that serialize cleaned contacts to several formats (CSV, Excel, Parquet,
+JSON Lines, vCard) in a single pass over the data.
+"""
+
+import json
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+import pandas as pd
+
+from datapurity_core.models import CleaningStats
+from datapurity_core import io_utils
+
+logger = logging.getLogger(__name__)
+
+
+# Per-sink file buffer; each sink flushes independently when its buffer fills
+SINK_BUFFER_BYTES = 1024 * 1024
+
+# Rows handed to every sink at a time when writing a whole DataFrame
+WRITE_CHUNK_ROWS = 50_000
+
+
+class ContactSink:
+    """
+    Base class for an output sink.
+    
+    Subclasses serialize each chunk as it arrives and finish the file on close.
+    """
+    
+    def __init__(self, output_path: str):
+        self.output_path = str(output_path)
+        self.rows_written = 0
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    
+    def write(self, chunk: pd.DataFrame) -> None:
+        self._write(chunk)
+        self.rows_written += len(chunk)
+    
+    def _write(self, chunk: pd.DataFrame) -> None:
+        raise NotImplementedError
+    
+    def close(self) -> None:
+        pass
+
+
+class _TextSink(ContactSink):
+    """Sink writing to a buffered text file."""
+    
+    encoding = "utf-8"
+    
+    def __init__(self, output_path: str):
+        super().__init__(output_path)
+        self._file = open(output_path, "w", encoding=self.encoding, newline="", buffering=SINK_BUFFER_BYTES)
+    
+    def close(self) -> None:
+        self._file.close()
+
+
+class CsvSink(_TextSink):
+    """CSV sink (UTF-8 with BOM, like save_contacts_file)."""
+    
+    encoding = "utf-8-sig"
+    
+    def __init__(self, output_path: str):
+        super().__init__(output_path)
+        self.header_written = False
+    
+    def _write(self, chunk: pd.DataFrame) -> None:
+        chunk.to_csv(self._file, index=False, header=not self.header_written)
+        self.header_written = True
+
+
+class JsonLinesSink(_TextSink):
+    """JSON Lines sink, one contact object per line."""
+    
+    def _write(self, chunk: pd.DataFrame) -> None:
+        if len(chunk):
+            # to_json(lines=True) already ends every record with a newline
+            lines = chunk.to_json(orient="records", lines=True, force_ascii=False)
+            self._file.write(lines if lines.endswith("\n") else lines + "\n")
+
+
+def _vcard_escape(value) -> str:
+    """Escape a value for a vCard property (RFC 6350 §3.4)."""
+    if value is None or pd.isna(value):
+        return ""
+    text = str(value)
+    for char, escaped in (("\\", "\\\\"), (",", "\\,"), (";", "\\;"), ("\n", "\\n")):
+        text = text.replace(char, escaped)
+    return text
+
+
+class VCardSink(_TextSink):
+    """vCard 3.0 sink, one card per contact."""
+    
+    def _write(self, chunk: pd.DataFrame) -> None:
+        columns = ["name", "phone", "email", "company", "job_title", "city", "notes"]
+        rows = chunk.reindex(columns=columns).itertuples(index=False, name=None)
+        
+        for name, phone, email, company, job_title, city, notes in rows:
+            lines = ["BEGIN:VCARD", "VERSION:3.0", f"FN:{_vcard_escape(name)}"]
+            if _vcard_escape(phone):
+                lines.append(f"TEL;TYPE=CELL:{_vcard_escape(phone)}")
+            if _vcard_escape(email):
+                lines.append(f"EMAIL;TYPE=INTERNET:{_vcard_escape(email)}")
+            if _vcard_escape(company):
+                lines.append(f"ORG:{_vcard_escape(company)}")
+            if _vcard_escape(job_title):
+                lines.append(f"TITLE:{_vcard_escape(job_title)}")
+            if _vcard_escape(city):
+                lines.append(f"ADR;TYPE=WORK:;;;{_vcard_escape(city)};;;")
+            if _vcard_escape(notes):
+                lines.append(f"NOTE:{_vcard_escape(notes)}")
+            lines.append("END:VCARD")
+            self._file.write("\r\n".join(lines) + "\r\n")
+
+
+class ExcelSink(ContactSink):
+    """Constant-memory Excel sink (see io_utils.ExcelStreamWriter)."""
+    
+    def __init__(self, output_path: str):
+        super().__init__(output_path)
+        self._writer = io_utils.ExcelStreamWriter(output_path)
+    
+    def _write(self, chunk: pd.DataFrame) -> None:
+        self._writer.write(chunk)
+    
+    def close(self) -> None:
+        self._writer.close()
+
+
+class ParquetSink(ContactSink):
+    """Parquet sink writing one row group per chunk."""
+    
+    def __init__(
+        self,
+        output_path: str,
+        compression: str = io_utils.DEFAULT_COMPRESSION,
+        row_group_size: int = io_utils.DEFAULT_ROW_GROUP_SIZE
+    ):
+        super().__init__(output_path)
+        self.compression = compression
+        self.row_group_size = row_group_size
+        self._pa = io_utils._require_pyarrow()
+        self._writer = None
+        self._schema = None
+    
+    def _stable_schema(self, table):
+        """Widen chunk-dependent types (all-null, categorical) so later chunks fit."""
+        pa = self._pa
+        fields = []
+        for field in table.schema:
+            field_type = field.type
+            if pa.types.is_null(field_type):
+                field_type = pa.string()
+            elif pa.types.is_dictionary(field_type):
+                field_type = pa.dictionary(pa.int32(), field_type.value_type)
+            fields.append(pa.field(field.name, field_type))
+        return pa.schema(fields, metadata=table.schema.metadata)
+    
+    def _write(self, chunk: pd.DataFrame) -> None:
+        import pyarrow.parquet as pq
+        
+        if self._writer is None:
+            self._schema = self._stable_schema(self._pa.Table.from_pandas(chunk.head(0), preserve_index=False))
+            self._writer = pq.ParquetWriter(self.output_path, self._schema, compression=self.compression)
+        
+        table = self._pa.Table.from_pandas(chunk, schema=self._schema, preserve_index=False)
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+    
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+# Output suffix → sink class
+SINK_TYPES = {
+    ".csv": CsvSink,
+    ".xlsx": ExcelSink,
+    ".parquet": ParquetSink,
+    ".jsonl": JsonLinesSink,
+    ".ndjson": JsonLinesSink,
+    ".vcf": VCardSink,
+}
+
+
+def create_sink(output_path: str) -> ContactSink:
+    """
+    Create the sink matching an output file's suffix.
+    
+    Args:
+        output_path: Path to output file
+        
+    Returns:
+        ContactSink instance
+        
+    Raises:
+        ValueError: If the suffix has no sink
+    """
+    suffix = Path(output_path).suffix.lower()
+    
+    if suffix not in SINK_TYPES:
+        raise ValueError(
+            f"Unsupported output format: {suffix}. "
+            f"Supported formats: {', '.join(SINK_TYPES)}"
+        )
+    
+    return SINK_TYPES[suffix](output_path)
+
+
+def write_stats_file(stats: CleaningStats, stats_path: str) -> None:
+    """
+    Write cleaning statistics as a JSON file.
+    
+    Args:
+        stats: Cleaning statistics
+        stats_path: Output .json file
+    """
+    Path(stats_path).parent.mkdir(parents=True, exist_ok=True)
+    Path(stats_path).write_text(
+        json.dumps(stats.model_dump(), ensure_ascii=False, indent=2),
+        encoding="utf-8"
+    )
+    logger.info(f"Wrote stats to {stats_path}")
+
+
+class MultiFormatWriter:
+    """
+    Fan cleaned contacts out to several output files in one pass.
+    
+    Each chunk is handed to every sink once; sinks buffer and flush on their
+    own. An optional JSON stats file is written on close.
+    
+    Example:
+        >>> with MultiFormatWriter(["out.csv", "out.xlsx", "out.vcf"], stats_path="stats.json") as writer:
+        ...     for chunk in chunks:
+        ...         writer.write(chunk)
+        ...     writer.stats = stats
+    """
+    
+    def __init__(self, output_paths: Iterable[str], stats_path: str | None = None):
+        """
+        Args:
+            output_paths: Output files; the format is taken from each suffix
+            stats_path: Optional JSON file for CleaningStats
+        """
+        self.sinks: list[ContactSink] = []
+        self.stats_path = stats_path
+        self.stats: CleaningStats | None = None
+        
+        try:
+            for output_path in output_paths:
+                self.sinks.append(create_sink(output_path))
+        except Exception:
+            self._close_sinks()
+            raise
+    
+    def __enter__(self) -> "MultiFormatWriter":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def write(self, chunk: pd.DataFrame) -> None:
+        """
+        Write a chunk to every sink.
+        
+        Args:
+            chunk: Cleaned contacts
+        """
+        for sink in self.sinks:
+            sink.write(chunk)
+    
+    def _close_sinks(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+    
+    def close(self) -> None:
+        """Finish every sink and write the stats file."""
+        self._close_sinks()
+        
+        for sink in self.sinks:
+            logger.info(f"Wrote {sink.rows_written} rows to {sink.output_path}")
+        
+        if self.stats_path and self.stats is not None:
+            write_stats_file(self.stats, self.stats_path)
+        
+        self.sinks = []
+
+
+def save_contacts_multi(
+    data: pd.DataFrame | Iterable[pd.DataFrame],
+    output_paths: Iterable[str],
+    stats: CleaningStats | None = None,
+    stats_path: str | None = None
+) -> None:
+    """
+    Save cleaned contacts to several formats in a single pass.
+    
+    Args:
+        data: Cleaned DataFrame, or an iterable of DataFrame chunks
+        output_paths: Output files (.csv, .xlsx, .parquet, .jsonl, .vcf)
+        stats: Cleaning statistics to write to `stats_path`
+        stats_path: Optional JSON stats file
+        
+    Example:
+        >>> save_contacts_multi(df_cleaned, ["crm.csv", "review.xlsx", "phone.vcf"],
+        ...                     stats=stats, stats_path="stats.json")
+    """
+    if isinstance(data, pd.DataFrame):
+        df = data
+        chunks = (
+            df.iloc[start:start + WRITE_CHUNK_ROWS]
+            for start in range(0, max(len(df), 1), WRITE_CHUNK_ROWS)
+        )
+    else:
+        chunks = data
+    
+    with MultiFormatWriter(output_paths, stats_path=stats_path) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+        writer.stats = stats
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+DataPurity Startup Benchmark
+============================
+
+Measures cold-start wall time of the package and CLI in fresh interpreters,
+which is what automation invoking the CLI many times a day pays per call.
+
+Usage:
+    python -m scripts.bench_startup
+    python -m scripts.bench_startup --repeat 20
+    python -m scripts.bench_startup --importtime   # slowest imports per case
+"""
+
+import argparse
+import csv
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def startup_cases(small_csv: str, output_csv: str) -> dict[str, list[str]]:
+    """Return benchmark name → interpreter arguments."""
+    return {
+        "import datapurity_core": ["-c", "import datapurity_core"],
+        "import clean_contacts_df": ["-c", "from datapurity_core import clean_contacts_df"],
+        "cli --help": ["-m", "scripts.datapurity_clean_cli", "--help"],
+        "cli small file": ["-m", "scripts.datapurity_clean_cli", small_csv, output_csv],
+    }
+
+
+def write_small_csv(path: str) -> None:
+    """Write a three-row contact file."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["الاسم", "الجوال", "email"])
+        writer.writerow(["أحمد علي", "0501234567", "ahmed@example.com"])
+        writer.writerow(["Sara Smith", "0551112222", "sara@example.com"])
+        writer.writerow(["احمد علي", "+966501234567", ""])
+
+
+def time_case(args: list[str], repeat: int) -> list[float]:
+    """Run `python <args>` `repeat` times and return wall times in seconds."""
+    env = dict(os.environ, PYTHONPATH=str(BACKEND_DIR))
+    timings = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *args],
+            cwd=BACKEND_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True
+        )
+        timings.append(time.perf_counter() - started)
+
+    return timings
+
+
+def top_imports(args: list[str], limit: int = 10) -> list[tuple[int, str]]:
+    """Return the slowest (cumulative µs, module) imports of one run via -X importtime."""
+    env = dict(os.environ, PYTHONPATH=str(BACKEND_DIR))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        rows.append((int(cumulative), module.strip()))
+
+    rows.sort(reverse=True)
+    return rows[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DataPurity import and CLI startup time")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per case (default: 10)")
+    parser.add_argument("--importtime", action="store_true", help="Also list the slowest imports per case")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        small_csv = str(Path(tmp) / "small.csv")
+        write_small_csv(small_csv)
+        cases = startup_cases(small_csv, str(Path(tmp) / "small_cleaned.csv"))
+
+        print(f"{'case':<28}{'min ms':>10}{'median ms':>12}{'max ms':>10}")
+        print("-" * 60)
+
+        for name, case_args in cases.items():
+            timings = [t * 1000 for t in time_case(case_args, args.repeat)]
+            print(f"{name:<28}{min(timings):>10.1f}{statistics.median(timings):>12.1f}{max(timings):>10.1f}")
+
+        if args.importtime:
+            for name, case_args in cases.items():
+                print(f"\nSlowest imports: {name}")
+                for cumulative, module in top_imports(case_args):
+                    print(f"  {cumulative / 1000:>8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,18 +9,24 @@ Usage:
     python -m scripts.datapurity_clean_cli input.xlsx output.xlsx
     python -m scripts.datapurity_clean_cli data.csv cleaned.csv --country SA
     python -m scripts.datapurity_clean_cli contacts.xlsx clean.xlsx --no-fuzzy
+    python -m scripts.datapurity_clean_cli incoming/ cleaned/ --workers 8
+    python -m scripts.datapurity_clean_cli watch incoming/ cleaned/ --workers 4
 """
 
 import argparse
 import logging
 import sys
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import pandas as pd
+# Only stdlib-backed modules are imported here. pandas, pydantic and the
+# cleaning modules load inside the functions that need them, so `--help` and
+# argument errors return without paying for them.
+from datapurity_core.profiling import PROFILE_FORMATS
 
-from datapurity_core.config import get_settings, Settings
-from datapurity_core.cleaning import clean_contacts_df
-from datapurity_core.io_utils import load_contacts_file, save_contacts_file
+if TYPE_CHECKING:
+    from datapurity_core.config import Settings
 
 
 # Setup logging
@@ -31,8 +37,115 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def parse_args():
+def add_settings_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the cleaning-settings options shared by all modes."""
+    parser.add_argument(
+        "--country",
+        type=str,
+        default="SA",
+        help="Default country code for phone numbers (default: SA)"
+    )
+    
+    parser.add_argument(
+        "--no-fuzzy",
+        action="store_true",
+        help="Disable fuzzy name deduplication"
+    )
+    
+    parser.add_argument(
+        "--fuzzy-threshold",
+        type=int,
+        default=90,
+        help="Fuzzy name matching threshold 0-100 (default: 90)"
+    )
+    
+    parser.add_argument(
+        "--min-name-len",
+        type=int,
+        default=3,
+        help="Minimum valid name length (default: 3)"
+    )
+
+
+def parse_watch_args(argv: list[str]):
+    """Parse arguments of the `watch` subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="datapurity_clean_cli watch",
+        description="Clean contact files continuously as they arrive in a directory",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Clean files dropped into incoming/ with 4 warm workers (Ctrl-C/SIGTERM to stop)
+  python -m scripts.datapurity_clean_cli watch incoming/ cleaned/ --workers 4
+  
+  # Convert every arrival to Parquet, polling instead of inotify
+  python -m scripts.datapurity_clean_cli watch incoming/ cleaned/ --output-format parquet --no-inotify
+        """
+    )
+    
+    parser.add_argument("input_dir", type=str, help="Directory to watch")
+    parser.add_argument("output_dir", type=str, help="Directory for cleaned files")
+    
+    add_settings_arguments(parser)
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Warm worker processes (default: CPU count)"
+    )
+    
+    parser.add_argument(
+        "--max-pending",
+        type=int,
+        default=None,
+        help="Files in flight at once; later arrivals are queued (default: 2 per worker)"
+    )
+    
+    parser.add_argument(
+        "--output-format",
+        type=str,
+        default=None,
+        help="Output format for every file, e.g. csv, xlsx, parquet (default: same as input)"
+    )
+    
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between directory scans or event reads (default: 1.0)"
+    )
+    
+    parser.add_argument(
+        "--no-inotify",
+        action="store_true",
+        help="Always poll the directory, even if inotify is available"
+    )
+    
+    parser.add_argument(
+        "--summary",
+        type=str,
+        default=None,
+        help="CSV to append one row per file to (default: <output_dir>/watch_summary.csv)"
+    )
+    
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Enable verbose logging"
+    )
+    
+    args = parser.parse_args(argv)
+    args.command = "watch"
+    return args
+
+
+def parse_args(argv: list[str] | None = None):
     """Parse command-line arguments."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "watch":
+        return parse_watch_args(argv[1:])
+    
     parser = argparse.ArgumentParser(
         description="DataPurity Contact Cleaning Tool",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -49,46 +162,272 @@ Examples:
   
   # Use custom thresholds
   python -m scripts.datapurity_clean_cli data.xlsx out.xlsx --fuzzy-threshold 95
+  
+  # Write CSV, Excel and vCard plus a JSON stats file in one pass
+  python -m scripts.datapurity_clean_cli data.csv out.csv --also out.xlsx --also out.vcf --stats-file stats.json
+  
+  # Clean every sheet of a workbook in parallel, deduplicating across sheets
+  python -m scripts.datapurity_clean_cli branches.xlsx clean.xlsx --all-sheets --workers 4
+  
+  # Batch mode: clean a directory (or quoted glob) into an output directory
+  python -m scripts.datapurity_clean_cli incoming/ cleaned/ --workers 8
+  python -m scripts.datapurity_clean_cli "incoming/**/*.csv.gz" cleaned/ --output-format parquet
+  
+  # Checkpointed run of a very large file; rerun with --resume after a crash
+  python -m scripts.datapurity_clean_cli huge.csv clean.csv --checkpoint-dir huge.ckpt
+  python -m scripts.datapurity_clean_cli huge.csv clean.csv --checkpoint-dir huge.ckpt --resume
+  
+  # Enforce a plan's records-per-file limit: reject larger files, or clean only their first rows
+  python -m scripts.datapurity_clean_cli upload.csv out.csv --max-rows 500
+  python -m scripts.datapurity_clean_cli upload.csv out.csv --max-rows 500 --on-row-limit truncate
+  
+  # Preview: clean 1000 rows spread over the file and estimate the full run
+  python -m scripts.datapurity_clean_cli huge.csv preview.csv --preview --preview-sample stratified
+  
+  # Reuse earlier results for re-uploaded files (content-addressed cache)
+  python -m scripts.datapurity_clean_cli data.csv out.csv --cache-dir ~/.cache/datapurity
+  
+  # Re-run with another fuzzy threshold, reusing normalized fields and fuzzy pair scores
+  python -m scripts.datapurity_clean_cli data.csv out.csv --step-cache .steps
+  python -m scripts.datapurity_clean_cli data.csv out.csv --step-cache .steps --fuzzy-threshold 85
+  
+  # Let a 2 GB memory budget pick in-memory, chunked or out-of-core cleaning
+  python -m scripts.datapurity_clean_cli huge.csv.gz clean.parquet --max-memory-mb 2048
+  
+  # Dedup an input whose phone/email index exceeds RAM, spilling keys to 256 partitions
+  python -m scripts.datapurity_clean_cli huge.csv.gz clean.parquet --external-dedup --partitions 256
+  
+  # Explain where every input row went: source_row column plus a lineage sidecar
+  python -m scripts.datapurity_clean_cli data.csv out.csv --source-row-column --provenance lineage.csv
+  
+  # Also write a dataset profile for the dashboard
+  python -m scripts.datapurity_clean_cli data.csv out.csv --dataset-profile profile.json
+  
+  # Watch a directory and clean files as they arrive (see: watch --help)
+  python -m scripts.datapurity_clean_cli watch incoming/ cleaned/ --workers 4
+  
+  # Profile a run: per-step time/memory plus function hotspots (open .speedscope.json in speedscope.app)
+  python -m scripts.datapurity_clean_cli data.csv out.csv --profile
+  python -m scripts.datapurity_clean_cli data.csv out.csv --profile run.speedscope.json --profile-format speedscope
         """
     )
     
     parser.add_argument(
         "input_file",
         type=str,
-        help="Input file path (Excel or CSV)"
+        help="Input file path (Excel or CSV), or a directory/glob for batch mode"
     )
     
     parser.add_argument(
         "output_file",
         type=str,
-        help="Output file path (Excel or CSV)"
+        help="Output file path (Excel or CSV), or an output directory in batch mode"
     )
     
     parser.add_argument(
-        "--country",
+        "--also",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help="Additional output file (.csv, .xlsx, .parquet, .jsonl, .vcf); repeatable"
+    )
+    
+    parser.add_argument(
+        "--stats-file",
         type=str,
-        default="SA",
-        help="Default country code for phone numbers (default: SA)"
+        default=None,
+        help="Write cleaning statistics to this JSON file"
+    )
+    
+    add_settings_arguments(parser)
+    
+    parser.add_argument(
+        "--provenance",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Write each source row's fate (kept, duplicate or empty), the row it duplicated "
+             "and its output row to this sidecar file (.npz, .csv or .parquet)"
     )
     
     parser.add_argument(
-        "--no-fuzzy",
+        "--source-row-column",
         action="store_true",
-        help="Disable fuzzy name deduplication"
+        help="Add a source_row column (0-based input row) to the output"
     )
     
     parser.add_argument(
-        "--fuzzy-threshold",
+        "--dataset-profile",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Write a dataset profile (distinct counts, top values, score histogram, "
+             "phone countries, email domains) to this JSON file"
+    )
+    
+    parser.add_argument(
+        "--csv-engine",
+        choices=["pandas", "pyarrow"],
+        default="pandas",
+        help="CSV parser: pandas, or multi-threaded memory-mapped pyarrow (default: pandas)"
+    )
+    
+    parser.add_argument(
+        "--sheet",
+        type=str,
+        default=None,
+        help="Excel sheet to clean (default: first sheet)"
+    )
+    
+    parser.add_argument(
+        "--all-sheets",
+        action="store_true",
+        help="Clean every sheet of the workbook in parallel, deduplicating across sheets"
+    )
+    
+    parser.add_argument(
+        "--workers",
         type=int,
-        default=90,
-        help="Fuzzy name matching threshold 0-100 (default: 90)"
+        default=None,
+        help="Worker processes for parallel modes (default: CPU count)"
     )
     
     parser.add_argument(
-        "--min-name-len",
+        "--output-format",
+        type=str,
+        default=None,
+        help="Batch mode: output format for every file, e.g. csv, xlsx, parquet (default: same as input)"
+    )
+    
+    parser.add_argument(
+        "--summary",
+        type=str,
+        default=None,
+        help="Batch mode: per-file summary CSV (default: <output_dir>/batch_summary.csv)"
+    )
+    
+    parser.add_argument(
+        "--checkpoint-dir",
+        type=str,
+        default=None,
+        help="Clean in row ranges, checkpointing each range to this work directory"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue a checkpointed run from its last completed range "
+             "(default work directory: <output_file>.checkpoint)"
+    )
+    
+    parser.add_argument(
+        "--chunk-size",
         type=int,
-        default=3,
-        help="Minimum valid name length (default: 3)"
+        default=None,
+        help="Rows per range in checkpointed and external-dedup modes (default: 50000)"
+    )
+    
+    parser.add_argument(
+        "--external-dedup",
+        action="store_true",
+        help="Stream the input and dedup phones/emails through on-disk key partitions "
+             "(for inputs whose dedup index does not fit in memory; no fuzzy dedup). "
+             "The memory planner only chooses this mode itself when fuzzy dedup is disabled"
+    )
+    
+    parser.add_argument(
+        "--partitions",
+        type=int,
+        default=64,
+        help="Key partitions for --external-dedup (default: 64)"
+    )
+    
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Result cache directory: a file already cleaned with the same settings "
+             "is restored from here instead of re-cleaned"
+    )
+    
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=1024,
+        help="Result cache size bound; least recently used results are evicted (default: 1024)"
+    )
+    
+    parser.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="Discard the cached result for this input and settings and clean again"
+    )
+    
+    parser.add_argument(
+        "--max-rows",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Row limit per file (e.g. the plan's records per file); reading stops at the limit"
+    )
+    
+    parser.add_argument(
+        "--on-row-limit",
+        choices=["error", "truncate"],
+        default="error",
+        help="Reject files over --max-rows, or clean only their first rows (default: error)"
+    )
+    
+    parser.add_argument(
+        "--preview",
+        nargs="?",
+        type=int,
+        const=1000,
+        default=None,
+        metavar="N",
+        help="Clean only a sample of N rows (default: 1000) into output_file and estimate "
+             "the full file's stats and runtime"
+    )
+    
+    parser.add_argument(
+        "--preview-sample",
+        choices=["head", "stratified"],
+        default="head",
+        help="Preview the first rows, or rows spread over the whole file (default: head)"
+    )
+    
+    parser.add_argument(
+        "--step-cache",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Cache step outputs (normalized fields, fuzzy pair scores) here, so re-runs "
+             "with changed settings only redo the affected steps. Entries are pickles: "
+             "use a directory only you can write to"
+    )
+    
+    parser.add_argument(
+        "--max-memory-mb",
+        type=int,
+        default=None,
+        help="Memory budget in MB; chooses in-memory, chunked or out-of-core cleaning "
+             "and the worker count automatically (default: DATAPURITY_MAX_MEMORY_MB or none)"
+    )
+    
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="Profile the run and write a report (default: <output_file>.profile.<ext>)"
+    )
+    
+    parser.add_argument(
+        "--profile-format",
+        choices=PROFILE_FORMATS,
+        default="text",
+        help="Profile report format: text, json or speedscope (default: text)"
     )
     
     parser.add_argument(
@@ -97,7 +436,362 @@ Examples:
         help="Enable verbose logging"
     )
     
-    return parser.parse_args()
+    args = parser.parse_args(argv)
+    args.command = "clean"
+    return args
+
+
+def apply_settings_overrides(args, settings: "Settings") -> None:
+    """Apply the shared cleaning-settings options to `settings`."""
+    settings.DEFAULT_COUNTRY_CODE = args.country
+    settings.ENABLE_FUZZY_DEDUP = not args.no_fuzzy
+    settings.FUZZY_NAME_THRESHOLD = args.fuzzy_threshold
+    settings.MIN_VALID_NAME_LEN = args.min_name_len
+
+
+def run_watch_mode(args, settings: "Settings") -> None:
+    """Clean files arriving in the watched directory until SIGINT/SIGTERM."""
+    import signal
+    import threading
+    from datapurity_core.watch import watch_folder
+    
+    if not Path(args.input_dir).is_dir():
+        logger.error(f"Input directory not found: {args.input_dir}")
+        sys.exit(1)
+    
+    stop_event = threading.Event()
+    
+    def request_stop(signum, frame):
+        logger.info("Stopping after in-flight files finish...")
+        stop_event.set()
+    
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+    
+    try:
+        watch_folder(
+            args.input_dir,
+            args.output_dir,
+            settings,
+            max_workers=args.workers,
+            output_format=args.output_format,
+            max_pending=args.max_pending,
+            poll_interval=args.poll_interval,
+            summary_path=args.summary,
+            stop_event=stop_event,
+            use_inotify=not args.no_inotify
+        )
+    except ValueError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+
+def is_batch_input(input_file: str) -> bool:
+    """Return True if the input argument is a directory or glob pattern."""
+    return Path(input_file).is_dir() or any(ch in input_file for ch in "*?[")
+
+
+def run_batch_mode(args, settings: "Settings") -> None:
+    """Clean every file matched by the input directory/glob."""
+    from datapurity_core.batch import discover_inputs, run_batch, write_batch_summary
+    
+    inputs = discover_inputs(args.input_file)
+    
+    if not inputs:
+        logger.error(f"No supported input files found in: {args.input_file}")
+        sys.exit(1)
+    
+    workers = args.workers
+    if workers is None and settings.MAX_MEMORY_MB > 0:
+        from datapurity_core.planner import plan_batch_workers
+        workers = plan_batch_workers(inputs, settings)
+    
+    started = time.perf_counter()
+    results = run_batch(
+        inputs,
+        args.output_file,
+        settings,
+        max_workers=workers,
+        output_format=args.output_format,
+        cache_dir=args.cache_dir,
+        cache_max_mb=args.cache_max_mb,
+        max_rows=args.max_rows,
+        on_row_limit=args.on_row_limit
+    )
+    
+    summary_path = args.summary or str(Path(args.output_file) / "batch_summary.csv")
+    write_batch_summary(results, summary_path)
+    
+    failed = [r for r in results if r.status != "ok"]
+    
+    logger.info("=" * 70)
+    logger.info("BATCH SUMMARY")
+    logger.info("=" * 70)
+    logger.info(f"Files processed:      {len(results)}")
+    logger.info(f"Failed:               {len(failed)}")
+    logger.info(f"Rows (orig → final):  {sum(r.stats.rows_original for r in results if r.stats)} → "
+                f"{sum(r.stats.rows_final for r in results if r.stats)}")
+    logger.info(f"Wall time:            {time.perf_counter() - started:.1f}s")
+    logger.info(f"Summary:              {summary_path}")
+    logger.info("=" * 70)
+    
+    if failed:
+        sys.exit(1)
+
+
+def profile_report_path(args) -> str:
+    """Return the --profile report path, defaulting to one next to the output file."""
+    if args.profile:
+        return args.profile
+    suffix = {"text": ".profile.txt", "json": ".profile.json", "speedscope": ".speedscope.json"}
+    return args.output_file + suffix[args.profile_format]
+
+
+def write_dataset_profile(frames, output_path: str) -> None:
+    """Profile cleaned frames and write the JSON profile."""
+    from datapurity_core.dataset_profile import build_dataset_profile, save_dataset_profile
+    
+    save_dataset_profile(build_dataset_profile(frames), output_path)
+
+
+def run_out_of_core(args, settings: "Settings", chunk_size: int, profiler=None, partitions: int | None = None):
+    """
+    Stream-clean an input that does not fit in memory and return the stats.
+    
+    With `partitions`, the dedup index is partitioned on disk as well
+    (external dedup, phone/email only).
+    """
+    if args.dataset_profile:
+        logger.warning("--dataset-profile is not supported for out-of-core runs; skipping it")
+    if args.provenance or args.source_row_column:
+        logger.warning("Row provenance is only tracked by the in-memory pipeline; skipping it")
+    
+    options = dict(
+        chunk_size=chunk_size,
+        sheet_name=args.sheet,
+        stats_path=args.stats_file,
+        work_dir=str(Path(args.output_file).resolve().parent),
+        profiler=profiler
+    )
+    output_files = [args.output_file] + args.also
+    
+    if partitions:
+        from datapurity_core.external_dedup import clean_file_external
+        
+        logger.info(f"Streaming input in ranges of {chunk_size} rows with {partitions} key partitions...")
+        return clean_file_external(args.input_file, output_files, settings, partitions=partitions, **options)
+    
+    from datapurity_core.checkpoint import clean_file_streaming
+    
+    logger.info(f"Streaming input in ranges of {chunk_size} rows...")
+    return clean_file_streaming(args.input_file, output_files, settings, **options)
+
+
+def run_preview(args, settings: "Settings") -> None:
+    """Clean a sample of the input into the output file and log the full-file estimates."""
+    from datapurity_core.io_utils import save_contacts_file
+    from datapurity_core.preview import preview_contacts_file
+    
+    df_preview, estimate = preview_contacts_file(
+        args.input_file, settings,
+        n_rows=args.preview, sample=args.preview_sample, sheet_name=args.sheet
+    )
+    save_contacts_file(df_preview, args.output_file)
+    if args.stats_file:
+        Path(args.stats_file).write_text(estimate.model_dump_json(indent=2), encoding="utf-8")
+    
+    logger.info("=" * 70)
+    logger.info(f"PREVIEW ({estimate.sample_rows} {estimate.sample} rows, {estimate.preview_seconds:.2f}s)")
+    logger.info("=" * 70)
+    logger.info(f"Estimated rows:       {estimate.estimated_rows}{' (exact)' if estimate.exact else ''}")
+    logger.info(f"Est. final rows:      {estimate.estimated_rows_final}")
+    logger.info(f"Est. duplicates:      {estimate.estimated_duplicates_removed}")
+    logger.info(f"Est. invalid phones:  {estimate.estimated_invalid_phones}")
+    logger.info(f"Est. invalid emails:  {estimate.estimated_invalid_emails}")
+    logger.info(f"Est. cleaning time:   {estimate.estimated_seconds:.1f}s")
+    logger.info(f"Sample quality score: {estimate.stats.avg_quality_score:.1f}/100")
+    logger.info("=" * 70)
+
+
+def run_single(args, settings: "Settings", profiler=None):
+    """Clean one file (or every sheet of one workbook) and return the stats."""
+    if args.all_sheets:
+        from datapurity_core.workbook import clean_workbook, save_workbook_file
+        
+        logger.info("Cleaning all sheets in parallel...")
+        frames, workbook_stats = clean_workbook(args.input_file, settings, max_workers=args.workers)
+        
+        for sheet_name, sheet_stats in workbook_stats.sheets.items():
+            logger.info(
+                f"Sheet {sheet_name!r}: {sheet_stats.rows_original} → {len(frames[sheet_name])} rows "
+                f"({workbook_stats.cross_sheet_duplicates[sheet_name]} cross-sheet duplicates)"
+            )
+        
+        if profiler is not None:
+            profiler.step("save_output")
+        for output_file in [args.output_file] + args.also:
+            logger.info(f"Saving cleaned data to {output_file}...")
+            save_workbook_file(frames, output_file)
+        
+        if args.stats_file:
+            Path(args.stats_file).write_text(workbook_stats.model_dump_json(indent=2), encoding="utf-8")
+        if args.dataset_profile:
+            write_dataset_profile(frames.values(), args.dataset_profile)
+        return workbook_stats.total
+    
+    plan = plan_single_file(args, settings)
+    
+    cache = cache_key = None
+    if args.cache_dir and (args.dataset_profile or args.provenance):
+        logger.info("--dataset-profile and --provenance need a cleaning run; not using the result cache")
+    elif args.cache_dir:
+        from datapurity_core.cache import ResultCache
+        
+        cache = ResultCache(args.cache_dir, args.cache_max_mb)
+        cache_key = cache.key_for(
+            args.input_file, settings,
+            sheet=args.sheet, csv_engine=args.csv_engine, mode=execution_mode(args, plan),
+            max_rows=args.max_rows, on_row_limit=args.on_row_limit if args.max_rows else None,
+            source_row_column=args.source_row_column or None
+        )
+        if args.refresh_cache:
+            cache.invalidate(cache_key)
+        
+        stats = cache.restore(cache_key, [args.output_file] + args.also)
+        if stats is not None:
+            if args.stats_file:
+                Path(args.stats_file).write_text(stats.model_dump_json(indent=2), encoding="utf-8")
+            return stats
+    
+    stats = clean_single_file(args, settings, profiler, plan)
+    
+    if cache is not None:
+        cache.store(cache_key, [args.output_file] + args.also, stats, input_path=args.input_file)
+    
+    return stats
+
+
+def plan_single_file(args, settings: "Settings"):
+    """Return the memory planner's ExecutionPlan for a single-file run, or None if it is not used."""
+    # Explicit external dedup and checkpoint options take precedence over the
+    # memory planner; a row-limited input is at most max_rows rows, so it is always loaded
+    planned = (
+        settings.MAX_MEMORY_MB > 0 and args.max_rows is None and not args.external_dedup
+        and not (args.checkpoint_dir or args.resume or args.chunk_size)
+    )
+    if not planned:
+        return None
+    
+    from datapurity_core.planner import plan_execution
+    return plan_execution(args.input_file, settings, sheet_name=args.sheet)
+
+
+def execution_mode(args, plan=None) -> str:
+    """Return how clean_single_file will run: external, out_of_core, chunked or in_memory."""
+    if args.external_dedup and args.max_rows is None:
+        return "external"
+    if plan is not None:
+        return plan.mode
+    if args.checkpoint_dir or args.resume or args.chunk_size:
+        return "chunked"
+    return "in_memory"
+
+
+def clean_single_file(args, settings: "Settings", profiler=None, plan=None):
+    """
+    Load, clean and save one file (in memory, checkpointed or streamed) and return the stats.
+    
+    `plan` is the memory planner's plan for the file (see plan_single_file).
+    """
+    from datapurity_core.cleaning import clean_contacts_df
+    from datapurity_core.io_utils import DEFAULT_CHUNK_SIZE, load_contacts_file, save_contacts_file
+    
+    if args.max_rows is not None and args.external_dedup:
+        logger.info("--max-rows loads at most that many rows; not using external dedup")
+    
+    mode = execution_mode(args, plan)
+    if mode == "external" and plan is None:
+        return run_out_of_core(
+            args, settings, args.chunk_size or DEFAULT_CHUNK_SIZE, profiler,
+            partitions=args.partitions
+        )
+    if mode in ("out_of_core", "external"):
+        return run_out_of_core(args, settings, plan.chunk_size, profiler, partitions=plan.partitions)
+    
+    # Load input file
+    if profiler is not None:
+        profiler.step("load_input")
+    logger.info("Loading input file...")
+    df = load_contacts_file(
+        args.input_file, sheet_name=args.sheet, csv_engine=args.csv_engine,
+        max_rows=args.max_rows, on_row_limit=args.on_row_limit
+    )
+    logger.info(f"Loaded {len(df)} rows")
+    
+    # Clean contacts
+    checkpoint_dir = args.checkpoint_dir
+    if checkpoint_dir is None and args.resume:
+        checkpoint_dir = args.output_file + ".checkpoint"
+    
+    provenance = None
+    if args.provenance or args.source_row_column:
+        from datapurity_core.provenance import RowProvenance
+        provenance = RowProvenance()
+    
+    step_cache = None
+    if args.step_cache:
+        from datapurity_core.step_cache import StepCache
+        step_cache = StepCache(args.step_cache)
+    
+    logger.info("Starting cleaning pipeline...")
+    df_cleaned, stats = clean_contacts_df(
+        df, settings,
+        profiler=profiler,
+        checkpoint_dir=checkpoint_dir,
+        chunk_size=args.chunk_size or DEFAULT_CHUNK_SIZE,
+        resume=args.resume,
+        step_cache=step_cache,
+        provenance=provenance
+    )
+    
+    # Checkpointed and planner-chunked runs do not track provenance
+    tracked = provenance is not None and len(provenance.source_row) == len(df_cleaned)
+    if (args.source_row_column or args.provenance) and not tracked:
+        logger.warning(
+            "This run was cleaned in row ranges, which do not track row provenance; "
+            "--source-row-column and --provenance were not written"
+        )
+    if args.source_row_column and tracked:
+        df_cleaned["source_row"] = provenance.source_row
+    if args.provenance and tracked:
+        provenance.save(args.provenance)
+    
+    # Save output file(s)
+    if profiler is not None:
+        profiler.step("save_output")
+    if args.also:
+        from datapurity_core.writers import save_contacts_multi
+        
+        output_files = [args.output_file] + args.also
+        logger.info(f"Saving cleaned data to {', '.join(output_files)}...")
+        save_contacts_multi(df_cleaned, output_files)
+    else:
+        logger.info(f"Saving cleaned data to {args.output_file}...")
+        save_contacts_file(df_cleaned, args.output_file)
+    
+    if args.stats_file:
+        from datapurity_core.writers import write_stats_file
+        write_stats_file(stats, args.stats_file)
+    
+    if args.dataset_profile:
+        write_dataset_profile([df_cleaned], args.dataset_profile)
+    
+    # The output is complete, so the checkpoint is no longer needed
+    if checkpoint_dir is not None:
+        from datapurity_core.checkpoint import clear_checkpoint
+        clear_checkpoint(checkpoint_dir)
+    
+    return stats
 
 
 def main():
@@ -108,20 +802,39 @@ def main():
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    from datapurity_core.config import get_settings
+    
+    if args.command == "watch":
+        settings = get_settings()
+        apply_settings_overrides(args, settings)
+        run_watch_mode(args, settings)
+        return
+    
+    batch_mode = is_batch_input(args.input_file)
+    
     # Validate input file
     input_path = Path(args.input_file)
-    if not input_path.exists():
+    if not batch_mode and not input_path.exists():
         logger.error(f"Input file not found: {args.input_file}")
         sys.exit(1)
     
-    # Get settings with overrides
+    # Get settings with overrides from CLI args
     settings = get_settings()
+    apply_settings_overrides(args, settings)
+    if args.max_memory_mb is not None:
+        settings.MAX_MEMORY_MB = args.max_memory_mb
     
-    # Override settings from CLI args
-    settings.DEFAULT_COUNTRY_CODE = args.country
-    settings.ENABLE_FUZZY_DEDUP = not args.no_fuzzy
-    settings.FUZZY_NAME_THRESHOLD = args.fuzzy_threshold
-    settings.MIN_VALID_NAME_LEN = args.min_name_len
+    if args.preview is not None and not batch_mode:
+        run_preview(args, settings)
+        return
+    
+    if batch_mode:
+        if args.profile is not None:
+            logger.warning("--profile is not supported in batch mode; ignoring it")
+        if args.preview is not None:
+            logger.warning("--preview is not supported in batch mode; ignoring it")
+        run_batch_mode(args, settings)
+        return
     
     logger.info("=" * 70)
     logger.info("DataPurity Contact Cleaning Tool")
@@ -132,21 +845,21 @@ def main():
     logger.info(f"Fuzzy dedup:      {'Enabled' if settings.ENABLE_FUZZY_DEDUP else 'Disabled'}")
     logger.info(f"Fuzzy threshold:  {settings.FUZZY_NAME_THRESHOLD}")
     logger.info(f"Min name length:  {settings.MIN_VALID_NAME_LEN}")
+    logger.info(f"Memory budget:    {f'{settings.MAX_MEMORY_MB} MB' if settings.MAX_MEMORY_MB > 0 else 'None'}")
     logger.info("=" * 70)
     
     try:
-        # Load input file
-        logger.info("Loading input file...")
-        df = load_contacts_file(args.input_file)
-        logger.info(f"Loaded {len(df)} rows")
-        
-        # Clean contacts
-        logger.info("Starting cleaning pipeline...")
-        df_cleaned, stats = clean_contacts_df(df, settings)
-        
-        # Save output file
-        logger.info(f"Saving cleaned data to {args.output_file}...")
-        save_contacts_file(df_cleaned, args.output_file)
+        if args.profile is not None:
+            from datapurity_core.profiling import ProfileSession
+            
+            with ProfileSession(args.profile_format) as session:
+                stats = run_single(args, settings, profiler=session.pipeline)
+            session.write_report(profile_report_path(args))
+            
+            for entry in session.pipeline.steps:
+                logger.info(f"  {entry['step']:<24} {entry['seconds']:8.3f}s")
+        else:
+            stats = run_single(args, settings)
         
         # Print summary
         logger.info("=" * 70)
@@ -159,6 +872,8 @@ def main():
         logger.info(f"Invalid phones:       {stats.invalid_phones}")
         logger.info(f"Invalid emails:       {stats.invalid_emails}")
         logger.info(f"Avg quality score:    {stats.avg_quality_score:.1f}/100")
+        if stats.row_limit is not None:
+            logger.info(f"Truncated to:         {stats.row_limit} rows ({stats.rows_over_limit if stats.rows_over_limit is not None else '?'} left out)")
         logger.info("=" * 70)
         logger.info("✓ Cleaning completed successfully!")
         logger.info("=" * 70)